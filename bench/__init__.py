@@ -0,0 +1,13 @@
+"""
+Benchmarks of pytourney.
+
+The benchmarks are runnable modules:
+
+  $ python -m bench.suite run       # both tie-breakers, per phase
+  $ python -m bench.import_time     # cold import times
+  $ python -m bench.incremental     # IncrementalHTH
+  $ python -m bench.parallel        # process-pool driver
+  $ python -m bench.memory          # match representations
+
+Synthetic tournaments come from bench.generators.
+"""
@@ -0,0 +1,126 @@
+"""
+Seeded synthetic tournament generators.
+
+Every generator yields result dictionaries of names/players as
+keys and scores as values. Players have hidden strengths and the
+stronger player is more likely to win, so the head-to-head
+graphs have the mostly transitive structure of real events.
+The same arguments always yield the same results.
+"""
+
+import math
+import random
+
+
+def names(n):
+  """
+  Return a list of n player names.
+  """
+  return [f'P{i:0>5}' for i in range(n)]
+
+
+def _match(rnd, strength, name1, name2, draw_rate):
+  if rnd.random() < draw_rate:
+    score = rnd.randint(0, 3)
+    return {name1: score, name2: score}
+  p = 1 / (1 + math.exp(strength[name2] - strength[name1]))
+  winner, loser = (name1, name2) if rnd.random() < p else (name2, name1)
+  loser_score = rnd.randint(0, 2)
+  return {winner: loser_score + rnd.randint(1, 3), loser: loser_score}
+
+
+def _strengths(rnd, players):
+  return {name: rnd.gauss(0, 1) for name in players}
+
+
+def round_robin(n, seed=0, draw_rate=0.2, double=False):
+  """
+  Yield the results of a complete (or double) round robin.
+  """
+  rnd = random.Random(seed)
+  players = names(n)
+  strength = _strengths(rnd, players)
+  for k, name1 in enumerate(players):
+    for name2 in players[k + 1:]:
+      yield _match(rnd, strength, name1, name2, draw_rate)
+      if double:
+        yield _match(rnd, strength, name2, name1, draw_rate)
+
+
+def sparse(n, degree=6, seed=0, draw_rate=0.2):
+  """
+  Yield the results of a league where every player meets about
+  degree random opponents.
+  """
+  rnd = random.Random(seed)
+  players = names(n)
+  strength = _strengths(rnd, players)
+  for _ in range(n * degree // 2):
+    name1, name2 = rnd.sample(players, 2)
+    yield _match(rnd, strength, name1, name2, draw_rate)
+
+
+def draw_heavy(n, degree=20, seed=0):
+  """
+  Yield the results of a sparse league where most games are
+  drawn, like in top level chess.
+  """
+  return sparse(n, degree=degree, seed=seed, draw_rate=0.6)
+
+
+def swiss(n, rounds=9, seed=0, draw_rate=0.2):
+  """
+  Yield the results of a Swiss-style event.
+
+  Every round the players are sorted by their score and paired
+  with their neighbours; a player of an odd field gets a bye
+  which is yielded as a single entry result.
+  """
+  rnd = random.Random(seed)
+  players = names(n)
+  strength = _strengths(rnd, players)
+  points = dict.fromkeys(players, 0)
+  for _ in range(rounds):
+    order = sorted(players, key=lambda name: (-points[name], rnd.random()))
+    if len(order) % 2:
+      bye = order.pop()
+      points[bye] += 1
+      yield {bye: 1}
+    for k in range(0, len(order), 2):
+      name1, name2 = order[k], order[k + 1]
+      result = _match(rnd, strength, name1, name2, draw_rate)
+      score1, score2 = result[name1], result[name2]
+      points[name1] += (score2 < score1) + (score1 == score2) / 2
+      points[name2] += (score1 < score2) + (score1 == score2) / 2
+      yield result
+
+
+def multi_player(n, field=8, events=None, seed=0):
+  """
+  Yield the results of free-for-all events like races.
+
+  Every event has field random participants with scores of their
+  points; equal points are possible. Defaults to as many events
+  as needed for every player to take part in about ten.
+  """
+  rnd = random.Random(seed)
+  players = names(n)
+  strength = _strengths(rnd, players)
+  field = min(field, n)
+  if events is None:
+    events = max(1, 10 * n // field)
+  for _ in range(events):
+    participants = rnd.sample(players, field)
+    yield {
+        name: round(strength[name] + rnd.gauss(0, 1), 1)
+        for name in participants
+    }
+
+
+GENERATORS = {
+    'round_robin': round_robin,
+    'sparse': sparse,
+    'draw_heavy': draw_heavy,
+    'swiss': swiss,
+    'multi_player': multi_player,
+}
@@ -0,0 +1,69 @@
+"""
+Import time benchmark.
+
+Measures the cold import time of pytourney modules in fresh
+interpreters with the -X importtime option and reports the
+median cumulative microseconds of every statement and whether
+networkx got imported. With --max-ms the run fails if any median
+exceeds the given limit, so it can guard against regressions.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+STATEMENTS = (
+    'import pytourney',
+    'import pytourney.tie.hth_sweep',
+    'import pytourney.tie.hth_quilici',
+)
+
+
+def import_time(statement):
+  """
+  Return the cumulative import time of the statement.
+
+  Return a pair of the microseconds spent on the imports of the
+  statement and the set of all imported module names.
+  """
+  proc = subprocess.run(
+      [sys.executable, '-X', 'importtime', '-c', statement],
+      stderr=subprocess.PIPE,
+      universal_newlines=True,
+      check=True,
+  )
+  modules = set()
+  cumulative = 0
+  for line in proc.stderr.splitlines():
+    if not line.startswith('import time:') or 'cumulative' in line:
+      continue
+    _, cumul, name = line[len('import time:'):].split('|')
+    modules.add(name.strip())
+    if not name[1:].startswith(' '):  # top level import
+      cumulative += int(cumul)
+  return cumulative, modules
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--repeat', type=int, default=7)
+  parser.add_argument('--max-ms', type=float, default=None)
+  args = parser.parse_args(argv)
+  failed = False
+  for statement in STATEMENTS:
+    times = []
+    for _ in range(args.repeat):
+      us, modules = import_time(statement)
+      times.append(us)
+    ms = statistics.median(times) / 1000
+    networkx = ('networkx' in modules)
+    print(f'{statement:<36} {ms:8.2f} ms  networkx={networkx}')
+    if args.max_ms is not None and args.max_ms < ms:
+      failed = True
+  return (1 if failed else 0)
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Incremental HTH benchmark.
+
+Plays a seeded double round robin season result by result and
+compares the time of keeping an IncrementalHTH up to date with
+recalculating hth_quilici.calculate() from scratch after every
+result.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from pytourney.tie import hth_quilici
+
+from . import generators
+
+
+def season(teams, seed=0):
+  """
+  Return a shuffled list of double round robin results.
+  """
+  results = list(generators.round_robin(teams, seed=seed, double=True))
+  random.Random(seed).shuffle(results)
+  return results
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--teams', type=int, default=30)
+  parser.add_argument('--seed', type=int, default=0)
+  args = parser.parse_args(argv)
+  results = season(args.teams, args.seed)
+  t0 = time.perf_counter()
+  I = hth_quilici.IncrementalHTH()
+  incremental = []
+  for result in results:
+    I.add_result(result)
+    incremental.append(I.hth())
+  t1 = time.perf_counter()
+  full = [
+      hth_quilici.calculate(results[:k])
+      for k in range(1, len(results) + 1)
+  ]
+  t2 = time.perf_counter()
+  if incremental != full:
+    print('MISMATCH between incremental and full recalculation')
+    return 1
+  n = len(results)
+  print(f'{args.teams} teams, {n} results')
+  print(f'incremental    {t1 - t0:9.3f} s  {(t1 - t0) / n * 1e6:9.1f} us/result')
+  print(f'recalculation  {t2 - t1:9.3f} s  {(t2 - t1) / n * 1e6:9.1f} us/result')
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Match representation memory benchmark.
+
+Builds a seeded season (a million matches by default) as a list
+of dictionaries, as a list of Match records and as a MatchTable,
+and reports the traced memory of each together with the time the
+hth_quilici calculation takes on it.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from pytourney.match import Match, MatchTable, Registry
+from pytourney.tie import hth_quilici
+
+from . import generators
+
+
+def representations():
+  """
+  Return the (name, builder) pairs of the representations.
+  """
+  def matches(results):
+    registry = Registry()
+    return [Match.from_result(registry, result) for result in results]
+
+  return [
+      ('dicts', list),
+      ('Match records', matches),
+      ('MatchTable', MatchTable),
+  ]
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--matches', type=int, default=1000000)
+  parser.add_argument('--players', type=int, default=2000)
+  parser.add_argument('--seed', type=int, default=0)
+  args = parser.parse_args(argv)
+  degree = max(1, 2 * args.matches // args.players)
+  print(f'{args.players} players, {args.matches} matches')
+  expected = None
+  for name, build in representations():
+    tracemalloc.start()
+    season = build(generators.sparse(args.players, degree, seed=args.seed))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    hth = hth_quilici.calculate(season)
+    elapsed = time.perf_counter() - t0
+    if expected is None:
+      expected = hth
+    elif hth != expected:
+      print(f'MISMATCH of {name} with dicts')
+      return 1
+    print(
+        f'{name:<14} {size / 2 ** 20:9.1f} MiB'
+        f' {size / len(season):7.1f} B/match'
+        f'  calculate {elapsed:7.3f} s'
+    )
+    del season
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Parallel league ranking benchmark.
+
+Ranks many seeded random leagues with hth_quilici sequentially and
+with pytourney.tie.parallel.calculate_many() on an increasing
+number of processes and reports the speedups.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from pytourney.tie import hth_quilici
+from pytourney.tie import parallel
+
+from . import generators
+
+
+def leagues(n, teams, seed=0):
+  """
+  Return a list of (league_id, results) of single round robins.
+  """
+  return [
+      (league_id, list(generators.round_robin(teams, seed=seed + league_id)))
+      for league_id in range(n)
+  ]
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--leagues', type=int, default=2000)
+  parser.add_argument('--teams', type=int, default=16)
+  parser.add_argument('--chunksize', type=int, default=32)
+  parser.add_argument('--seed', type=int, default=0)
+  args = parser.parse_args(argv)
+  jobs = leagues(args.leagues, args.teams, args.seed)
+  t0 = time.perf_counter()
+  expected = {i: hth_quilici.calculate(results) for i, results in jobs}
+  sequential = time.perf_counter() - t0
+  print(f'sequential    {sequential:8.3f} s')
+  processes = 1
+  while processes <= (os.cpu_count() or 1):
+    t0 = time.perf_counter()
+    got = dict(parallel.calculate_many(
+        jobs, processes=processes, chunksize=args.chunksize
+    ))
+    elapsed = time.perf_counter() - t0
+    if got != expected:
+      print('MISMATCH with sequential calculation')
+      return 1
+    print(
+        f'{processes:>3} processes {elapsed:8.3f} s'
+        f'  speedup {sequential / elapsed:5.2f}'
+    )
+    processes *= 2
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+Tie-breaker benchmark suite.
+
+Runs both tie-breakers on the seeded synthetic tournaments of
+bench.generators and reports the wall time of every phase as
+recorded by their pytourney.tie.stats instrumentation with the
+peak traced memory of every phase, and the same for the whole
+call. Runs are stored as JSON files so they can be compared
+across versions:
+
+  $ python -m bench.suite run --max-players 1000
+  $ python -m bench.suite compare OLD.json NEW.json
+"""
+
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pytourney
+from pytourney.tie import hth_quilici
+from pytourney.tie import hth_sweep
+from pytourney.tie.stats import Stats
+
+from . import generators
+
+
+SCENARIOS = (
+    ('round_robin', (10, 100, 1000)),
+    ('sparse', (100, 1000, 10000)),
+    ('draw_heavy', (100, 1000, 10000)),
+    ('swiss', (100, 1000, 10000)),
+    ('multi_player', (100, 1000, 10000)),
+)
+
+PATHS_MAX_PLAYERS = 100
+    # the paths engine is far too slow beyond this
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+METHODS = {
+    'quilici': hth_quilici.hth,
+    'quilici_paths': functools.partial(hth_quilici.hth, engine='paths'),
+    'sweep': hth_sweep.hth,
+}
+    # the hth() functions are timed as they are; their phases come
+    # from the Stats instrumentation
+
+
+class PeakStats(Stats):
+  """
+  Stats object which also records the peak of the bytes traced
+  by tracemalloc during each phase, which must be running.
+  """
+
+  def __init__(self):
+    super().__init__()
+    self.peaks = {}
+        # highest peak bytes by phase names
+    self.highest = 0
+        # highest traced bytes seen so far, in and out of phases
+
+  def phase(self, name):
+    return _PeakTimer(self, name)
+
+  def peak(self):
+    """
+    Return the highest traced bytes seen since the creation of
+    the object, including those seen between the phases.
+    """
+    return max(self.highest, tracemalloc.get_traced_memory()[1])
+
+
+class _PeakTimer:
+
+  __slots__ = ('stats', 'name', 'current')
+
+  def __init__(self, stats, name):
+    self.stats = stats
+    self.name = name
+
+  def __enter__(self):
+    # Technical note: the phases of the tie-breakers do not nest
+    # so I can reset the peak of tracemalloc at the start of each
+    # of them, after keeping the peak seen before it for the peak
+    # of the whole call.
+    self.stats.highest = self.stats.peak()
+    tracemalloc.reset_peak()
+    self.current = tracemalloc.get_traced_memory()[0]
+
+  def __exit__(self, *exc_info):
+    stats = self.stats
+    stats.highest = stats.peak()
+    peak = tracemalloc.get_traced_memory()[1] - self.current
+    stats.peaks[self.name] = max(stats.peaks.get(self.name, 0), peak)
+
+
+def measure(function, results, memory=True):
+  """
+  Runs the hth() function on the results.
+
+  Return a pair of a list of (phase, seconds, peak bytes) tuples
+  and the dictionary of the counts of the Stats object. The
+  phases are those recorded by the function followed by "total"
+  which is the wall time of the whole call. Time is measured
+  without tracing; if memory is True then the function is run
+  once more under tracemalloc for the peak of the bytes
+  allocated during every phase and during the whole call,
+  otherwise the peaks are None.
+  """
+  stats = Stats()
+  t0 = time.perf_counter()
+  function(results, stats=stats)
+  total = time.perf_counter() - t0
+  traced = PeakStats()
+  peak = None
+  if memory and hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+    tracemalloc.start()
+    try:
+      current = tracemalloc.get_traced_memory()[0]
+      tracemalloc.reset_peak()
+      function(results, stats=traced)
+      peak = traced.peak() - current
+    finally:
+      tracemalloc.stop()
+  timings = [
+      (phase, seconds, traced.peaks.get(phase))
+      for phase, seconds in stats.phases.items()
+  ]
+  timings.append(('total', total, peak))
+  return timings, stats.counts
+
+
+def git_revision():
+  try:
+    proc = subprocess.run(
+        ['git', 'rev-parse', '--short', 'HEAD'],
+        cwd=os.path.dirname(__file__),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+  except (OSError, subprocess.CalledProcessError):
+    return None
+  return proc.stdout.strip()
+
+
+def run(args):
+  rows = []
+  for scenario, sizes in SCENARIOS:
+    if args.scenario and scenario not in args.scenario:
+      continue
+    for players in sizes:
+      if args.max_players < players:
+        continue
+      results = list(generators.GENERATORS[scenario](players, seed=args.seed))
+      for method, function in METHODS.items():
+        if method == 'quilici_paths' and PATHS_MAX_PLAYERS < players:
+          continue
+        measured, counts = measure(
+            function, results, memory=not args.no_memory
+        )
+        for phase, seconds, peak in measured:
+          row = {
+              'scenario': scenario,
+              'players': players,
+              'matches': len(results),
+              'method': method,
+              'phase': phase,
+              'seconds': seconds,
+              'peak_bytes': peak,
+          }
+          if phase == 'total':
+            row['counts'] = counts
+          rows.append(row)
+          print(format_row(row), flush=True)
+  document = {
+      'version': pytourney.__version__,
+      'revision': git_revision(),
+      'python': platform.python_version(),
+      'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+      'seed': args.seed,
+      'rows': rows,
+  }
+  os.makedirs(args.output, exist_ok=True)
+  path = os.path.join(
+      args.output,
+      '{version}-{revision}-{timestamp}.json'.format(**{
+          **document, 'timestamp': document['timestamp'].replace(':', ''),
+      }),
+  )
+  with open(path, 'w', encoding='utf-8') as f:
+    json.dump(document, f, indent=1)
+  print(f'saved to {path}')
+  return 0
+
+
+def format_row(row):
+  peak = row['peak_bytes']
+  peak = ('' if peak is None else f'{peak / 2 ** 20:9.2f} MiB')
+  return (
+      f"{row['scenario']:<13} {row['players']:>6} {row['matches']:>8}"
+      f" {row['method']:<14} {row['phase']:<13}"
+      f" {row['seconds'] * 1000:10.2f} ms {peak}"
+  )
+
+
+def compare(args):
+  documents = []
+  for path in (args.old, args.new):
+    with open(path, encoding='utf-8') as f:
+      documents.append(json.load(f))
+  old, new = (
+      {
+          (r['scenario'], r['players'], r['method'], r['phase']): r
+          for r in document['rows']
+      }
+      for document in documents
+  )
+  print(
+      f"old: {documents[0]['version']} {documents[0]['revision']}"
+      f"  new: {documents[1]['version']} {documents[1]['revision']}"
+  )
+  for key, row in new.items():
+    if key not in old:
+      continue
+    ratio = row['seconds'] / max(old[key]['seconds'], 1e-9)
+    print(f'{format_row(row)}  x{ratio:5.2f} time')
+  return 0
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+  commands = parser.add_subparsers(dest='command')
+  parser_run = commands.add_parser('run')
+  parser_run.add_argument('--max-players', type=int, default=1000)
+  parser_run.add_argument('--scenario', action='append')
+  parser_run.add_argument('--seed', type=int, default=0)
+  parser_run.add_argument('--no-memory', action='store_true')
+  parser_run.add_argument('--output', default=RESULTS_DIR)
+  parser_compare = commands.add_parser('compare')
+  parser_compare.add_argument('old')
+  parser_compare.add_argument('new')
+  args = parser.parse_args(argv)
+  if args.command == 'run':
+    return run(args)
+  elif args.command == 'compare':
+    return compare(args)
+  parser.print_help()
+  return 2
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -1,3 +1,27 @@
 __version__ = '0.0.2'
 
-from . import tie
+import importlib
+import sys
+
+_submodules = ('archive', 'match', 'results', 'schedule', 'tie')
+    # loaded on first attribute access; see __getattr__()
+
+
+def __getattr__(name):
+  if name in _submodules:
+    return importlib.import_module(f'.{name}', __name__)
+        # the import binds the submodule as an attribute of this
+        # package so this function gets called once per name
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_submodules))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+  from . import archive
+  from . import match
+  from . import results
+  from . import schedule
+  from . import tie
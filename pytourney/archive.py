@@ -0,0 +1,423 @@
+"""
+Memory-mapped columnar archive of results of many seasons.
+
+The matches of all seasons are stored in flat columns of a
+single file: the player ids and the scores of all entries, and
+the entry offsets of the matches, with the matches of a season
+being consecutive. A postings index stores the sorted match
+indices of every player, so the matches among a set of players
+are found without touching any other rows.
+
+  with archive.write(path) as writer:
+    writer.add_season('2017', results_2017)
+    writer.add_season('2018', results_2018)
+  with archive.Archive(path) as a:
+    hth = a.hth({'A', 'B', 'C'}, seasons=['2018'])
+
+Layout (all integers little-endian): the header of MAGIC, the
+format version, the number of players, seasons, matches and
+entries and the (offset, length) pairs of the sections, then the
+8 byte aligned sections: name offsets (uint64), names (UTF-8),
+season label offsets (uint64), season labels (UTF-8), first
+match index of every season (uint64), entry offsets of the
+matches (uint64), player ids (uint32), scores (float64), postings
+offsets (uint64) and postings (uint32 match indices).
+"""
+
+import array
+import bisect
+import importlib
+import mmap
+import struct
+import sys
+
+
+MAGIC = b'PYTARCH\x00'
+VERSION = 1
+
+_SECTIONS = (
+    ('name_offsets', 'Q'),
+    ('names', 'B'),
+    ('label_offsets', 'Q'),
+    ('labels', 'B'),
+    ('season_offsets', 'Q'),
+    ('match_offsets', 'Q'),
+    ('ids', 'I'),
+    ('scores', 'd'),
+    ('posting_offsets', 'Q'),
+    ('postings', 'I'),
+)
+
+_HEADER = struct.Struct(f'<8sHHIIQQ{2 * len(_SECTIONS)}Q')
+
+
+def _little(a):
+  if sys.byteorder != 'little':
+    a = array.array(a.typecode, a)
+    a.byteswap()
+  return a.tobytes()
+
+
+def _strings(strings):
+  offsets = array.array('Q', [0])
+  data = []
+  for string in strings:
+    data.append(string.encode('utf-8'))
+    offsets.append(offsets[-1] + len(data[-1]))
+  return _little(offsets), b''.join(data)
+
+
+class Writer:
+  """
+  Writer of an archive file.
+
+  path attribute should be the path of the file to write. The
+  file is written when the writer gets closed.
+
+  The seasons are kept in compact arrays until then.
+  """
+
+  def __init__(self, path):
+    self.path = path
+    self.names = []
+        # player names by their integer ids
+    self.index = {}
+        # integer ids by player names
+    self.labels = []
+    self.season_offsets = array.array('Q', [0])
+    self.match_offsets = array.array('Q', [0])
+    self.ids = array.array('I')
+    self.scores = array.array('d')
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, *exc_info):
+    if exc_type is None:
+      self.close()
+
+  def add_season(self, label, results):
+    """
+    Appends a season.
+
+    label attribute should be a unique string of the season.
+
+    results attribute should be an iterable of dictionaries of
+    names/players as keys and scores as values. Names should be
+    strings and scores should be numbers.
+    """
+    if label in self.labels:
+      raise ValueError(f'duplicate season: {label!r}')
+    index, names = self.index, self.names
+    ids, scores = self.ids, self.scores
+    match_offsets = self.match_offsets
+    for result in results:
+      for name, score in result.items():
+        i = index.get(name)
+        if i is None:
+          if not isinstance(name, str):
+            raise TypeError(f'archive names should be strings: {name!r}')
+          i = index[name] = len(names)
+          names.append(name)
+        ids.append(i)
+        scores.append(score)
+      match_offsets.append(len(ids))
+    self.labels.append(label)
+    self.season_offsets.append(len(match_offsets) - 1)
+
+  def postings(self):
+    """
+    Return the postings offsets and the postings arrays.
+
+    The postings of player i are the sorted match indices at
+    positions offsets[i]:offsets[i+1].
+    """
+    # Technical note: I build the postings by a counting sort so
+    # no per player lists are needed. A player is posted once
+    # per match even if the match had it twice.
+    counts = array.array('Q', bytes(8 * (len(self.names) + 1)))
+    match_offsets, ids = self.match_offsets, self.ids
+    for k in range(len(match_offsets) - 1):
+      for i in set(ids[match_offsets[k]:match_offsets[k + 1]]):
+        counts[i + 1] += 1
+    for i in range(len(self.names)):
+      counts[i + 1] += counts[i]
+    offsets = array.array('Q', counts)
+    postings = array.array('I', bytes(4 * counts[-1]))
+    for k in range(len(match_offsets) - 1):
+      for i in set(ids[match_offsets[k]:match_offsets[k + 1]]):
+        postings[counts[i]] = k
+        counts[i] += 1
+    return offsets, postings
+
+  def close(self):
+    """
+    Writes the archive file.
+    """
+    posting_offsets, postings = self.postings()
+    name_offsets, names = _strings(self.names)
+    label_offsets, labels = _strings(self.labels)
+    sections = [
+        name_offsets,
+        names,
+        label_offsets,
+        labels,
+        _little(self.season_offsets),
+        _little(self.match_offsets),
+        _little(self.ids),
+        _little(self.scores),
+        _little(posting_offsets),
+        _little(postings),
+    ]
+    table = []
+    pos = _HEADER.size
+    for data in sections:
+      pos += -pos % 8
+      table.extend((pos, len(data)))
+      pos += len(data)
+    with open(self.path, 'wb') as f:
+      f.write(_HEADER.pack(
+          MAGIC,
+          VERSION,
+          0,
+          len(self.names),
+          len(self.labels),
+          len(self.match_offsets) - 1,
+          len(self.ids),
+          *table,
+      ))
+      pos = _HEADER.size
+      for offset, data in zip(table[::2], sections):
+        f.write(b'\x00' * (offset - pos))
+        f.write(data)
+        pos = offset + len(data)
+
+
+def write(path, seasons=()):
+  """
+  Creates an archive file.
+
+  seasons attribute is optional and should be an iterable of
+  (label, results) pairs in the same format as for
+  Writer.add_season().
+
+  Return a Writer object; use it as a context manager to add
+  further seasons before the file is written, or close it.
+  """
+  writer = Writer(path)
+  for label, results in seasons:
+    writer.add_season(label, results)
+  return writer
+
+
+class Archive:
+  """
+  Read-only memory-mapped archive.
+
+  path attribute should be the path of an archive file.
+
+  Only the header is read initially. The names and the season
+  labels are decoded on first use; the matches are read from
+  the memory map on demand so only the pages of the queried
+  rows and postings are loaded.
+  """
+
+  def __init__(self, path):
+    with open(path, 'rb') as f:
+      self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    self._view = memoryview(self._mmap)
+    self._views = {}
+        # section views by section names
+    try:
+      self._read_header()
+    except Exception:
+      self.close()
+      raise
+    self._names = None
+    self._index = None
+    self._labels = None
+
+  def _read_header(self):
+    if len(self._view) < _HEADER.size:
+      raise ValueError('not an archive')
+    magic, version, _, *counts_table = _HEADER.unpack_from(self._view)
+    if magic != MAGIC:
+      raise ValueError('not an archive')
+    if version != VERSION:
+      raise ValueError(f'unsupported archive version: {version}')
+    self.players, self.seasons, self.matches, self.entries = (
+        counts_table[:4]
+    )
+    table = counts_table[4:]
+    self._sections = {}
+    for k, (name, typecode) in enumerate(_SECTIONS):
+      offset, length = table[2 * k], table[2 * k + 1]
+      if len(self._view) < offset + length:
+        raise ValueError('truncated archive')
+      self._sections[name] = (offset, length, typecode)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+  def close(self):
+    """
+    Releases the memory map.
+    """
+    for view in self._views.values():
+      if isinstance(view, memoryview):
+        view.release()
+    self._views = {}
+    self._view.release()
+    self._mmap.close()
+
+  def _section(self, name):
+    view = self._views.get(name)
+    if view is not None:
+      return view
+    offset, length, typecode = self._sections[name]
+    view = self._view[offset:offset + length]
+    if typecode != 'B':
+      if sys.byteorder == 'little':
+        view = view.cast(typecode)
+      else:
+        a = array.array(typecode, view.tobytes())
+        a.byteswap()
+        view.release()
+        view = a
+    self._views[name] = view
+    return view
+
+  def _strings(self, offsets, data, count):
+    offsets, data = self._section(offsets), self._section(data)
+    return [
+        str(data[offsets[i]:offsets[i + 1]], 'utf-8')
+        for i in range(count)
+    ]
+
+  @property
+  def names(self):
+    """
+    Return the list of the player names by their integer ids.
+    """
+    if self._names is None:
+      self._names = self._strings('name_offsets', 'names', self.players)
+      self._index = {name: i for i, name in enumerate(self._names)}
+    return self._names
+
+  @property
+  def labels(self):
+    """
+    Return the list of the season labels in order.
+    """
+    if self._labels is None:
+      self._labels = self._strings('label_offsets', 'labels', self.seasons)
+    return self._labels
+
+  def _match_ranges(self, seasons):
+    season_offsets = self._section('season_offsets')
+    if seasons is None:
+      return [(0, self.matches)]
+    labels = self.labels
+    ranges = []
+    for label in seasons:
+      try:
+        s = labels.index(label)
+      except ValueError:
+        raise KeyError(label) from None
+      ranges.append((season_offsets[s], season_offsets[s + 1]))
+    return sorted(ranges)
+
+  def _result(self, k, ids=None):
+    match_offsets = self._section('match_offsets')
+    start, end = match_offsets[k], match_offsets[k + 1]
+    players, scores = self._section('ids'), self._section('scores')
+    names = self.names
+    return {
+        names[players[e]]: scores[e]
+        for e in range(start, end)
+        if ids is None or players[e] in ids
+    }
+
+  def match_indices(self, players, seasons=None):
+    """
+    Finds the matches of the players.
+
+    players attribute should be an iterable of names/players and
+    seasons attribute is optional and should be an iterable of
+    season labels; defaults to all seasons.
+
+    Only the postings of the given players are read.
+
+    Return a pair of the sorted list of the indices of the
+    matches played by at least two of the players, and the set
+    of the players who played any of the matches.
+    """
+    self.names  # builds the index
+    ids = {self._index[name] for name in players if name in self._index}
+    ranges = self._match_ranges(seasons)
+    offsets = self._section('posting_offsets')
+    postings = self._section('postings')
+    counts = {}
+    present = set()
+    for i in ids:
+      lo, hi = offsets[i], offsets[i + 1]
+      for start, end in ranges:
+        a = bisect.bisect_left(postings, start, lo, hi)
+        b = bisect.bisect_left(postings, end, a, hi)
+        if a < b:
+          present.add(self._names[i])
+        for k in postings[a:b]:
+          counts[k] = counts.get(k, 0) + 1
+    indices = sorted(k for k, count in counts.items() if 1 < count)
+    return indices, present
+
+  def results(self, players=None, seasons=None):
+    """
+    Yield the result dictionaries of the given seasons restricted
+    to the given players.
+
+    Attributes are the same as for match_indices(); if players
+    is None then all matches are yielded in full. Scores are
+    floats.
+
+    The results are the same for the tie-breakers as the
+    results filtered to the players and to the seasons, with the
+    results left without any player dropped: the players who
+    played with none of the others get a single entry result.
+    """
+    if players is None:
+      for start, end in self._match_ranges(seasons):
+        for k in range(start, end):
+          yield self._result(k)
+      return
+    indices, present = self.match_indices(players, seasons)
+    ids = {self._index[name] for name in present}
+    seen = set()
+    for k in indices:
+      result = self._result(k, ids)
+      seen.update(result)
+      yield result
+    for name in sorted(present - seen):
+      yield {name: 0.0}
+
+  def hth(self, players, seasons=None, method='quilici', **kwargs):
+    """
+    Does the head-to-head ordering of the players.
+
+    players and seasons attributes are the same as for
+    results().
+
+    method attribute is optional and should be either "quilici"
+    or "sweep" to select the tie-breaker module. Other keyword
+    attributes are passed to its calculate() function.
+
+    Return a dictionary with names/players as keys, and HTH
+    scores as values.
+    """
+    if method not in ('quilici', 'sweep'):
+      raise ValueError(f'unknown method: {method!r}')
+    module = importlib.import_module(f'.tie.hth_{method}', __package__)
+    return module.calculate(self.results(players, seasons), **kwargs)
@@ -0,0 +1,147 @@
+"""
+Command line interface.
+
+  $ pytourney rank results.csv --method sweep
+  $ pytourney worker < jobs.jsonl > rankings.jsonl
+
+The worker reads ranking jobs as JSON objects, one per line:
+
+  {"id": 1, "method": "quilici", "results": [{"A": 1, "B": 0}]}
+
+id is optional and echoed back, method is optional and defaults
+to "quilici", options is an optional object of keyword
+attributes for the calculate() function of the tie-breaker and
+stats may be set to true to get the statistics of the
+calculation. Every job is answered by a line as soon as it is
+done:
+
+  {"id": 1, "hth": {"A": 1, "B": 2}}
+
+or by an error line which does not stop the worker:
+
+  {"id": 1, "error": "..."}
+
+The worker exits with status 1 at the end of its input if any job
+failed, and 0 otherwise.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+
+from . import results as _results
+
+
+METHODS = ('quilici', 'sweep')
+
+
+def _module(method):
+  if method not in METHODS:
+    raise ValueError(f'unknown method: {method!r}')
+  return importlib.import_module(f'.tie.hth_{method}', __package__)
+
+
+def _read(path):
+  if path == '-':
+    return _results.read_jsonl(sys.stdin)
+  elif os.fspath(path).lower().endswith('.csv'):
+    return _results.read_csv(path)
+  return _results.read_jsonl(path)
+
+
+def answer(job):
+  """
+  Does a single ranking job of the worker.
+
+  job attribute should be a dictionary decoded from a job line.
+
+  Return the dictionary of the answer line.
+  """
+  from .tie import stats as _stats
+  response = {}
+  if 'id' in job:
+    response['id'] = job['id']
+  try:
+    module = _module(job.get('method', 'quilici'))
+    options = dict(job.get('options') or {})
+    stats = None
+    if job.get('stats'):
+      stats = options['stats'] = _stats.Stats()
+    response['hth'] = module.calculate(job['results'], **options)
+    if stats is not None:
+      response['stats'] = stats.as_dict()
+  except Exception as exc:
+    response['error'] = f'{exc.__class__.__name__}: {exc}'
+  return response
+
+
+def worker(infile, outfile):
+  """
+  Answers the jobs of infile line by line to outfile.
+
+  Return the number of failed jobs.
+  """
+  failed = 0
+  for lineno, line in enumerate(infile, 1):
+    if not line.strip():
+      continue
+    try:
+      job = json.loads(line)
+      if not isinstance(job, dict):
+        raise ValueError('a JSON object expected')
+    except ValueError as exc:
+      response = {'line': lineno, 'error': f'ValueError: {exc}'}
+    else:
+      response = answer(job)
+    if 'error' in response:
+      failed += 1
+    outfile.write(json.dumps(response, separators=(',', ':')) + '\n')
+    outfile.flush()  # the caller may wait for this very answer
+  return failed
+
+
+def rank(args):
+  module = _module(args.method)
+  hth = module.calculate(_read(args.file))
+  json.dump(hth, sys.stdout, indent=args.indent)
+  sys.stdout.write('\n')
+  return 0
+
+
+def work(args):
+  for method in METHODS:
+    _module(method)  # warm up before the first job arrives
+  try:
+    import numpy  # optional; used by hth_sweep for heats
+  except ImportError:
+    pass
+  failed = worker(sys.stdin, sys.stdout)
+  return 1 if failed else 0
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(
+      prog='pytourney',
+      description=__doc__.split('\n\n')[0].strip(),
+  )
+  commands = parser.add_subparsers(dest='command')
+  parser_rank = commands.add_parser(
+      'rank', help='rank the players of a result file'
+  )
+  parser_rank.add_argument(
+      'file', help='CSV (.csv suffix) or JSON Lines file; - for stdin'
+  )
+  parser_rank.add_argument('--method', choices=METHODS, default='quilici')
+  parser_rank.add_argument('--indent', type=int)
+  commands.add_parser(
+      'worker', help='answer JSON Lines ranking jobs of stdin'
+  )
+  args = parser.parse_args(argv)
+  if args.command == 'rank':
+    return rank(args)
+  elif args.command == 'worker':
+    return work(args)
+  parser.print_help()
+  return 2
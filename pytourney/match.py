@@ -0,0 +1,275 @@
+"""
+Compact match records.
+
+A result is usually a dictionary of names/players as keys and
+scores as values. The types of this module are accepted by the
+tie-breakers wherever such dictionaries are, but they store the
+players as integer ids of a shared Registry, which saves memory
+and spares the hashing of the names in the inner loops.
+"""
+
+import array
+import bisect
+import collections.abc
+import itertools
+
+
+class Registry:
+  """
+  Interning registry of names/players.
+
+  Names get integer ids in the order of their registration.
+  """
+
+  def __init__(self, names=()):
+    self.names = []
+        # names by their integer ids
+    self.index = {}
+        # integer ids by names
+    for name in names:
+      self.intern(name)
+
+  def __len__(self):
+    return len(self.names)
+
+  def __contains__(self, name):
+    return name in self.index
+
+  def intern(self, name):
+    """
+    Return the integer id of the name, registering it if new.
+    """
+    i = self.index.get(name)
+    if i is None:
+      i = self.index[name] = len(self.names)
+      self.names.append(name)
+    return i
+
+
+class Match(collections.abc.Mapping):
+  """
+  Compact record of a single match.
+
+  registry attribute should be a Registry object and entries
+  attribute should be a flat tuple of player id and score pairs:
+  (id1, score1, id2, score2, ...).
+
+  It is a read-only mapping of names to scores so it can be used
+  in place of a result dictionary.
+  """
+
+  __slots__ = ('registry', 'entries')
+
+  def __init__(self, registry, entries):
+    self.registry = registry
+    self.entries = entries
+
+  @classmethod
+  def from_result(cls, registry, result):
+    """
+    Creates a match record from a result dictionary.
+    """
+    intern = registry.intern
+    entries = []
+    for name, score in result.items():
+      entries.append(intern(name))
+      entries.append(score)
+    return cls(registry, tuple(entries))
+
+  def __len__(self):
+    return len(self.entries) // 2
+
+  def __iter__(self):
+    names = self.registry.names
+    return (names[i] for i in self.entries[::2])
+
+  def __getitem__(self, name):
+    i = self.registry.index.get(name)
+    entries = self.entries
+    for k in range(0, len(entries), 2):
+      if entries[k] == i:
+        return entries[k + 1]
+    raise KeyError(name)
+
+  def __repr__(self):
+    return f'{self.__class__.__name__}({dict(self.items())!r})'
+
+  def items(self):
+    names = self.registry.names
+    entries = self.entries
+    return [
+        (names[entries[k]], entries[k + 1])
+        for k in range(0, len(entries), 2)
+    ]
+
+  def values(self):
+    return list(self.entries[1::2])
+
+
+class MatchTable(collections.abc.Sequence):
+  """
+  Array-backed sequence of matches.
+
+  results attribute is optional and should be an iterable of
+  result dictionaries to append.
+
+  registry attribute is optional and should be the Registry
+  object of the player ids; a new one is created by default.
+
+  The player ids and the scores of all matches are stored in
+  flat arrays, so a two player match takes about 32 bytes.
+  Scores are stored as floats. The items are Match records
+  created on access.
+  """
+
+  def __init__(self, results=(), registry=None):
+    self.registry = (Registry() if registry is None else registry)
+    self.offsets = array.array('L', [0])
+        # the entries of match k are at positions
+        # offsets[k]:offsets[k+1] of ids and scores
+    self.ids = array.array('I')
+    self.scores = array.array('d')
+    self.extend(results)
+
+  def __len__(self):
+    return len(self.offsets) - 1
+
+  def __getitem__(self, k):
+    if isinstance(k, slice):
+      return [self[j] for j in range(*k.indices(len(self)))]
+    if k < 0:
+      k += len(self)
+    if not 0 <= k < len(self):
+      raise IndexError('match index out of range')
+    start, end = self.offsets[k], self.offsets[k + 1]
+    entries = []
+    for i, score in zip(self.ids[start:end], self.scores[start:end]):
+      entries.append(i)
+      entries.append(score)
+    return Match(self.registry, tuple(entries))
+
+  def append(self, result):
+    """
+    Appends a result dictionary or a Match record.
+    """
+    if isinstance(result, Match) and result.registry is self.registry:
+      entries = result.entries
+      self.ids.extend(entries[::2])
+      self.scores.extend(entries[1::2])
+    else:
+      intern = self.registry.intern
+      for name, score in result.items():
+        self.ids.append(intern(name))
+        self.scores.append(score)
+    self.offsets.append(len(self.ids))
+
+  def extend(self, results):
+    """
+    Appends the results of an iterable.
+    """
+    for result in results:
+      self.append(result)
+
+
+class MatchIndex(MatchTable):
+  """
+  MatchTable indexed by the players.
+
+  Attributes are the same as for MatchTable.
+
+  The match positions of every player are kept in a postings
+  index while the matches are appended, so the results induced
+  by any set of players are extracted in time proportional to
+  the number of matches of those players instead of scanning
+  all matches. A sorted index of the player pairs is built on
+  demand to answer the matches of a pair.
+  """
+
+  def __init__(self, results=(), registry=None):
+    self.postings = []
+        # array of match positions by player ids
+    self._pair_keys = None
+    self._pair_matches = None
+        # sorted pair index: (id1 << 32 | id2) keys where
+        # id1 < id2 and the match positions aligned to them
+    super().__init__(results, registry)
+
+  def append(self, result):
+    """
+    Appends a result dictionary or a Match record.
+    """
+    super().append(result)
+    k = len(self.offsets) - 2
+    postings = self.postings
+    for i in set(self.ids[self.offsets[k]:]):
+      while len(postings) <= i:
+        postings.append(array.array('L'))
+      postings[i].append(k)
+    self._pair_keys = self._pair_matches = None
+
+  def matches(self, name):
+    """
+    Return the array of the positions of the matches of the
+    name/player in order.
+    """
+    i = self.registry.index.get(name)
+    if i is None or len(self.postings) <= i:
+      return array.array('L')
+    return self.postings[i]
+
+  def pair_matches(self, name1, name2):
+    """
+    Return the array of the positions of the matches in which
+    both names/players took part in order.
+    """
+    index = self.registry.index
+    if name1 not in index or name2 not in index:
+      return array.array('L')
+    i, j = sorted((index[name1], index[name2]))
+    if self._pair_keys is None:
+      self._build_pairs()
+    key = i << 32 | j
+    lo = bisect.bisect_left(self._pair_keys, key)
+    hi = bisect.bisect_right(self._pair_keys, key, lo)
+    return self._pair_matches[lo:hi]
+
+  def _build_pairs(self):
+    pairs = []
+    offsets, ids = self.offsets, self.ids
+    for k in range(len(offsets) - 1):
+      players = sorted(set(ids[offsets[k]:offsets[k + 1]]))
+      for i, j in itertools.combinations(players, 2):
+        pairs.append((i << 32 | j, k))
+    pairs.sort()
+    self._pair_keys = array.array('Q', (key for key, _ in pairs))
+    self._pair_matches = array.array('L', (k for _, k in pairs))
+
+  def induced(self, players):
+    """
+    Extracts the results induced by the players.
+
+    players attribute should be an iterable of names/players.
+
+    Return a MatchTable of the same registry which holds the
+    matches of the given players restricted to them. It is the
+    same as the results filtered to the players with the results
+    left without any player dropped, hence it can be passed
+    directly to the tie-breakers as the results of a tie group.
+    """
+    index = self.registry.index
+    ids = {index[name] for name in players if name in index}
+    postings = self.postings
+    positions = set()
+    for i in ids:
+      if i < len(postings):
+        positions.update(postings[i])
+    table = MatchTable(registry=self.registry)
+    offsets, all_ids, all_scores = self.offsets, self.ids, self.scores
+    t_offsets, t_ids, t_scores = table.offsets, table.ids, table.scores
+    for k in sorted(positions):
+      for e in range(offsets[k], offsets[k + 1]):
+        if all_ids[e] in ids:
+          t_ids.append(all_ids[e])
+          t_scores.append(all_scores[e])
+      t_offsets.append(len(t_ids))
+    return table
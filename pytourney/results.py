@@ -0,0 +1,91 @@
+"""
+Streaming readers of result files.
+
+The readers are generators which yield result dictionaries of
+names/players as keys and scores as values one by one, so a
+whole season file is never held in memory. They can be passed
+directly to the tie-breakers which consume the results in a
+single pass.
+"""
+
+import contextlib
+import csv
+import json
+import os
+
+
+@contextlib.contextmanager
+def _opened(file, **kwargs):
+  if isinstance(file, (str, bytes, os.PathLike)):
+    with open(file, encoding='utf-8', **kwargs) as f:
+      yield f
+  else:  # file object; the caller is responsible for closing it
+    yield file
+
+
+def score(text):
+  """
+  Parses a score of a text file.
+
+  Return an integer if possible and a float otherwise.
+  """
+  try:
+    return int(text)
+  except ValueError:
+    return float(text)
+
+
+def read_jsonl(file):
+  """
+  Reads the results of a JSON Lines file.
+
+  file attribute should be a path or a text file object. Every
+  non-empty line of the file should be a JSON object of names
+  as keys and scores as values.
+
+  Yield the result dictionaries.
+  """
+  with _opened(file) as f:
+    for lineno, line in enumerate(f, 1):
+      if not line.strip():
+        continue
+      result = json.loads(line)
+      if not isinstance(result, dict):
+        raise ValueError(f'line {lineno}: a JSON object expected')
+      yield result
+
+
+def read_csv(file, header=False, **fmtparams):
+  """
+  Reads the results of a CSV file.
+
+  file attribute should be a path or a text file object. Every
+  non-empty row of the file should contain name and score cell
+  pairs of a single match: name1, score1, name2, score2, and so
+  on. Empty trailing cells are ignored so rows of matches with
+  different number of players can be mixed.
+
+  header attribute is optional and should be True if the first
+  row of the file should be skipped.
+
+  Other keyword attributes are passed to csv.reader().
+
+  Yield the result dictionaries.
+  """
+  with _opened(file, newline='') as f:
+    rows = csv.reader(f, **fmtparams)
+    if header:
+      next(rows, None)
+    for row in rows:
+      while row and not row[-1].strip():
+        row.pop()
+      if not row:
+        continue
+      if len(row) % 2:
+        raise ValueError(
+            f'line {rows.line_num}: name and score pairs expected'
+        )
+      yield {
+          row[k].strip(): score(row[k + 1].strip())
+          for k in range(0, len(row), 2)
+      }
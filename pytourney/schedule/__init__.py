@@ -0,0 +1,22 @@
+import importlib
+import sys
+
+_submodules = ('roundrobin', 'swiss')
+    # loaded on first attribute access; see __getattr__()
+
+
+def __getattr__(name):
+  if name in _submodules:
+    return importlib.import_module(f'.{name}', __name__)
+        # the import binds the submodule as an attribute of this
+        # package so this function gets called once per name
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_submodules))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+  from . import roundrobin
+  from . import swiss
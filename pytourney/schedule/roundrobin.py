@@ -0,0 +1,149 @@
+"""
+Round-robin schedules by the circle method.
+
+  schedule = roundrobin.RoundRobin(teams, legs=2)
+  for fixture in schedule[k]:  # the round k, zero based
+    ...
+
+The rounds are generated on demand from the seed positions of
+the players, so any round or the fixture of any player in any
+round is available without generating the previous rounds and a
+schedule takes memory for its players only.
+
+A fixture is a dictionary of the home player and the away player
+as keys, in this order, and None scores as values. Once its
+scores are filled in it is a result in the same format as for
+the tie-breakers.
+
+Player n-1 (the last seed) is fixed and the others rotate around
+the circle. In round r the player at seed r plays with the fixed
+one, and the players at seeds r+k and r-k (modulo n-1) play with
+each other. The home players alternate so the single round robin
+has n-2 breaks (two home or two away fixtures in a row), the
+least possible. Later legs repeat the first one with the home
+and away players swapped in every second leg. With an odd number
+of players a dummy is added as the last seed and its opponent
+has a bye, which yields no fixture.
+"""
+
+
+class RoundRobin:
+  """
+  Round-robin schedule.
+
+  players attribute should be an iterable of the names/players
+  in seed order.
+
+  legs attribute is optional and should be the number of times
+  every two players meet; 2 is a double round robin.
+
+  Rounds are indexed from zero; negative indices count from the
+  end.
+  """
+
+  def __init__(self, players, legs=1):
+    self.players = list(players)
+    self.index = {name: i for i, name in enumerate(self.players)}
+    if len(self.index) != len(self.players):
+      raise ValueError('players should be unique')
+    if legs < 1:
+      raise ValueError(f'legs should be positive: {legs!r}')
+    self.legs = legs
+    self.size = len(self.players) + len(self.players) % 2
+        # number of the seeds with the dummy
+
+  @property
+  def rounds_per_leg(self):
+    return max(0, self.size - 1)
+
+  def __len__(self):
+    return self.legs * self.rounds_per_leg
+
+  def _round(self, k):
+    n = len(self)
+    if k < 0:
+      k += n
+    if not 0 <= k < n:
+      raise IndexError('round index out of range')
+    leg, r = divmod(k, self.rounds_per_leg)
+    return r, leg % 2
+
+  def pairs(self, k):
+    """
+    Yield the (home, away) pairs of the seed positions of round k
+    in board order.
+    """
+    r, swap = self._round(k)
+    M = self.size - 1
+    fixed = (r, M)
+    if r % 2:
+      fixed = (M, r)
+    for board in range(self.size // 2):
+      if board == 0:
+        pair = fixed
+      else:
+        x, y = (r + board) % M, (r - board) % M
+        pair = ((x, y) if board % 2 else (y, x))
+      if len(self.players) in pair:  # the dummy
+        continue
+      yield (pair[::-1] if swap else pair)
+
+  def __getitem__(self, k):
+    """
+    Return the list of the fixtures of round k.
+    """
+    players = self.players
+    return [
+        {players[home]: None, players[away]: None}
+        for home, away in self.pairs(k)
+    ]
+
+  def __iter__(self):
+    """
+    Yield the lists of the fixtures of the rounds in order.
+    """
+    for k in range(len(self)):
+      yield self[k]
+
+  def fixtures(self):
+    """
+    Yield the fixtures of all rounds in order.
+    """
+    for k in range(len(self)):
+      yield from self[k]
+
+  def fixture(self, k, name):
+    """
+    Return the fixture of the player in round k, or None if the
+    player has a bye.
+    """
+    r, swap = self._round(k)
+    M = self.size - 1
+    i = self.index[name]
+    if i == M:
+      j = r
+      home = bool(r % 2)
+    elif i == r:
+      j = M
+      home = not r % 2
+    else:
+      j = (2 * r - i) % M
+      board = (i - r) % M
+      if board < self.size // 2:  # i is at r+board
+        home = bool(board % 2)
+      else:  # i is at r-(M-board)
+        home = not (M - board) % 2
+    if j == len(self.players):  # the dummy
+      return None
+    if home == bool(swap):
+      i, j = j, i
+    return {self.players[i]: None, self.players[j]: None}
+
+
+def fixtures(players, legs=1):
+  """
+  Yield the fixtures of a round-robin schedule in order.
+
+  Attributes are the same as for RoundRobin.
+  """
+  return RoundRobin(players, legs=legs).fixtures()
@@ -0,0 +1,435 @@
+"""
+Swiss-system pairing.
+
+  S = swiss.Swiss(players_by_rating, results)
+  for white, black in S.pair():
+    ...
+  S.update(results_of_the_round)
+
+The results are in the same format as for the tie-breakers: a
+dictionary of names/players as keys and scores as values per
+game. The first player of a two player result is the one who had
+white (played at home) and a single player result is a bye.
+
+The pairing follows the Dutch system in its main lines: the
+players are ranked by their points and seeds, the score groups
+are paired top-down, every score group is split into halves and
+the upper half is paired with the lower half, and the players
+left over float down to the next score group. Players never meet
+twice and two players who both must get the same colour are
+never paired together; the colours are allocated by the colour
+preferences of the players.
+"""
+
+import itertools
+
+
+def _sign(x):
+  return (0 < x) - (x < 0)
+
+
+class Swiss:
+  """
+  State of a Swiss-system tournament.
+
+  players attribute is optional and should be an iterable of the
+  names/players in seed order, strongest first, like ordered by
+  their ratings. Players of the results who are not given are
+  appended to the seeds as they appear.
+
+  results attribute is optional and should be an iterable of
+  dictionaries of names/players as keys and scores as values of
+  the rounds played so far.
+
+  points attribute is optional and should be the points for a
+  win, a draw and a loss; bye_points attribute is optional and
+  should be the points for a bye.
+
+  The score groups are kept up to date as the results arrive so
+  pairing a round needs no scan of the results.
+  """
+
+  repair_limit = 128
+      # maximum number of players in a weighted matching repair
+
+  def __init__(self, players=(), results=(), points=(1, 0.5, 0),
+      bye_points=1):
+    self.points = points
+    self.bye_points = bye_points
+    self.seed = {}
+        # seed positions by names
+    self.score = {}
+        # points by names
+    self.opponents = {}
+        # sets of the opponents by names
+    self.colours = {}
+        # colour histories by names; 1 is white and -1 is black
+    self.byes = set()
+    self.withdrawn = set()
+    self.groups = {}
+        # sets of the active names by points
+    for name in players:
+      self.add_player(name)
+    self.update(results)
+
+  def add_player(self, name):
+    """
+    Registers a player as the last seed.
+
+    A late entry starts with zero points.
+    """
+    if name in self.seed:
+      return
+    self.seed[name] = len(self.seed)
+    self.score[name] = 0
+    self.opponents[name] = set()
+    self.colours[name] = []
+    self.groups.setdefault(0, set()).add(name)
+
+  def withdraw(self, name):
+    """
+    Excludes a player from the pairing of the further rounds.
+    """
+    self.withdrawn.add(name)
+    self._regroup(name, self.score[name], None)
+
+  def _regroup(self, name, old, new):
+    group = self.groups.get(old)
+    if group is not None:
+      group.discard(name)
+      if not group:
+        del self.groups[old]
+    if new is not None and name not in self.withdrawn:
+      self.groups.setdefault(new, set()).add(name)
+
+  def _add_points(self, name, points):
+    old = self.score[name]
+    self.score[name] = new = old + points
+    self._regroup(name, old, new)
+
+  def add(self, result):
+    """
+    Adds a single result.
+    """
+    if len(result) == 1:
+      name, = result
+      self.add_player(name)
+      self.byes.add(name)
+      self._add_points(name, self.bye_points)
+      return
+    if len(result) != 2:
+      raise ValueError(
+          f'a Swiss result should have one or two players: {result!r}'
+      )
+    (white, white_score), (black, black_score) = result.items()
+    self.add_player(white)
+    self.add_player(black)
+    self.opponents[white].add(black)
+    self.opponents[black].add(white)
+    self.colours[white].append(1)
+    self.colours[black].append(-1)
+    win, draw, loss = self.points
+    if white_score > black_score:
+      self._add_points(white, win)
+      self._add_points(black, loss)
+    elif white_score < black_score:
+      self._add_points(white, loss)
+      self._add_points(black, win)
+    else:
+      self._add_points(white, draw)
+      self._add_points(black, draw)
+
+  def update(self, results):
+    """
+    Adds the results.
+    """
+    for result in results:
+      self.add(result)
+
+  def standings(self):
+    """
+    Return the list of the active names ordered by their points
+    and seeds.
+    """
+    seed = self.seed
+    return [
+        name
+        for points in sorted(self.groups, reverse=True)
+        for name in sorted(self.groups[points], key=seed.__getitem__)
+    ]
+
+  def preference(self, name):
+    """
+    Return the colour preference of the player.
+
+    The sign tells the colour (positive is white) and the value
+    tells the strength: 3 is absolute (the colour difference is
+    more than one or the last two colours were the same), 2 is
+    strong (the colour difference is one), 1 is mild (alternation
+    of the last colour) and 0 is none.
+    """
+    colours = self.colours[name]
+    if not colours:
+      return 0
+    difference = sum(colours)
+    if 1 < abs(difference):
+      return -3 * _sign(difference)
+    if 2 <= len(colours) and colours[-1] == colours[-2]:
+      return -3 * colours[-1]
+    if difference:
+      return -2 * difference
+    return -colours[-1]
+
+  def compatible(self, name1, name2, preferences=None):
+    """
+    Return True if the two players may be paired.
+    """
+    if name2 in self.opponents[name1]:
+      return False
+    if preferences is None:
+      a, b = self.preference(name1), self.preference(name2)
+    else:
+      a, b = preferences[name1], preferences[name2]
+    return not (a == b and abs(a) == 3)
+
+  def _bye(self, standings):
+    for name in reversed(standings):
+      if name not in self.byes:
+        return name
+    return standings[-1]
+
+  def allocate(self, name1, name2, board=0, preferences=None):
+    """
+    Allocates the colours of a pair.
+
+    name1 attribute should be the higher ranked player and board
+    attribute is optional and should be the zero based board
+    number; it alternates the colours of players without
+    preferences.
+
+    Return a (white, black) pair.
+    """
+    if preferences is None:
+      a, b = self.preference(name1), self.preference(name2)
+    else:
+      a, b = preferences[name1], preferences[name2]
+    if a == b:
+      if a == 0:
+        return ((name1, name2) if board % 2 == 0 else (name2, name1))
+      # Technical note: I alternate the colours to the most recent
+      # round in which the two had different colours.
+      for c1, c2 in zip(
+          reversed(self.colours[name1]), reversed(self.colours[name2])
+      ):
+        if c1 != c2:
+          return ((name2, name1) if 0 < c1 else (name1, name2))
+    if abs(b) <= abs(a):
+      return ((name1, name2) if 0 < a else (name2, name1))
+    return ((name2, name1) if 0 < b else (name1, name2))
+
+  def _weight(self, name1, name2, preferences, level):
+    a, b = preferences[name1], preferences[name2]
+    colour = (0 if (0 < a * b) else 1)
+    return 2 * (len(level) - abs(level[name1] - level[name2])) + colour
+
+  def _repair(self, pool, preferences, level, forced=False):
+    """
+    Return the maximum weight maximum cardinality matching of
+    the pool as a list of pairs.
+
+    Only compatible players are paired unless forced is True;
+    then every player gets paired and the incompatible pairs get
+    the least weight.
+    """
+    import networkx as nx
+    G = nx.Graph()
+    G.add_nodes_from(pool)
+    for name1, name2 in itertools.combinations(pool, 2):
+      if self.compatible(name1, name2, preferences):
+        G.add_edge(
+            name1, name2,
+            weight=self._weight(name1, name2, preferences, level) + 1,
+        )
+      elif forced:
+        G.add_edge(name1, name2, weight=1)
+    rank = {name: k for k, name in enumerate(pool)}
+    pairs = []
+    for name1, name2 in nx.max_weight_matching(G, maxcardinality=True):
+      if rank[name2] < rank[name1]:
+        name1, name2 = name2, name1
+      pairs.append((name1, name2))
+    return pairs
+
+  def _pair_bracket(self, bracket, pairs, preferences, level, last):
+    """
+    Pairs a score group with the players floating down to it and
+    extends pairs with the new pairs.
+
+    Return the list of the players floating down further.
+    """
+    half = len(bracket) // 2
+    rest = bracket[half:]
+    unpaired = []
+    compatible = self.compatible
+    for name1 in bracket[:half]:
+      # the first opponent of the lower half whose colour
+      # preference fits, or the first compatible one
+      a = preferences[name1]
+      found = None
+      for k, name2 in enumerate(rest):
+        if compatible(name1, name2, preferences):
+          if found is None:
+            found = k
+          if a * preferences[name2] <= 0:
+            found = k
+            break
+      if found is None:
+        unpaired.append(name1)
+      else:
+        pairs.append((name1, rest.pop(found)))
+    left = unpaired + rest
+    if 1 < len(left):
+      left = self._exchange(left, pairs, preferences)
+    if 1 < len(left):
+      left = self._weighted(left, pairs, preferences, level)
+    if last and 1 < len(left):
+      # nowhere to float to: rematches and colour conflicts are
+      # allowed now, as few as possible
+      width = max(0, min(len(pairs), (self.repair_limit - len(left)) // 2))
+      pool = left + [
+          name for pair in pairs[len(pairs) - width:] for name in pair
+      ]
+      pool.sort(key=self._rank)
+      del pairs[len(pairs) - width:]
+      pairs.extend(self._repair(pool, preferences, level, forced=True))
+      left = []
+    return left
+
+  def _exchange(self, left, pairs, preferences):
+    """
+    Pairs the players left over two by two by taking over the
+    opponents of a pair made already, the lowest pairs first; the
+    pair may belong to a score group above.
+
+    Return the list of the players still left over.
+    """
+    compatible = self.compatible
+    left = list(left)
+    changed = True
+    while changed and 1 < len(left):
+      changed = False
+      for u, v in itertools.combinations(left, 2):
+        for k in range(len(pairs) - 1, -1, -1):
+          x, y = pairs[k]
+          if compatible(u, x, preferences) and compatible(v, y, preferences):
+            pass
+          elif compatible(u, y, preferences) and compatible(v, x, preferences):
+            x, y = y, x
+          else:
+            continue
+          pairs[k] = self._ordered(u, x)
+          pairs.append(self._ordered(v, y))
+          left.remove(u)
+          left.remove(v)
+          changed = True
+          break
+        if changed:
+          break
+    return left
+
+  def _weighted(self, left, pairs, preferences, level):
+    """
+    Pairs the players left over by a weighted matching together
+    with the players of the lowest pairs made so far.
+
+    Return the list of the players still left over.
+    """
+    # Technical note: I double the number of the broken pairs as
+    # long as it helps and the limit is not reached. The broken
+    # pairs may belong to the score groups above.
+    width = len(left)
+    best = None
+    while True:
+      width = min(2 * width, len(pairs), self.repair_limit // 2)
+      pool = left + [
+          name for pair in pairs[len(pairs) - width:] for name in pair
+      ]
+      pool.sort(key=self._rank)
+      matched = self._repair(pool, preferences, level)
+      unpaired = len(pool) - 2 * len(matched)
+      if best is None or unpaired < best[0]:
+        best = (unpaired, width, pool, matched)
+      else:
+        break
+      if unpaired <= 1 or width == len(pairs) or (
+          self.repair_limit // 2 <= width
+      ):
+        break
+    unpaired, width, pool, matched = best
+    del pairs[len(pairs) - width:]
+    pairs.extend(matched)
+    paired = {name for pair in matched for name in pair}
+    return [name for name in pool if name not in paired]
+
+  def _rank(self, name):
+    return (-self.score[name], self.seed[name])
+
+  def _ordered(self, name1, name2):
+    if self._rank(name2) < self._rank(name1):
+      return (name2, name1)
+    return (name1, name2)
+
+  def pair(self):
+    """
+    Pairs the next round.
+
+    Return the list of (white, black) pairs in board order; a bye
+    is a (name, None) pair at the end.
+    """
+    standings = self.standings()
+    bye = None
+    if len(standings) % 2:
+      bye = self._bye(standings)
+    preferences = {name: self.preference(name) for name in standings}
+    level = {
+        name: k
+        for k, points in enumerate(sorted(self.groups, reverse=True))
+        for name in self.groups[points]
+    }
+    seed = self.seed
+    pairs = []
+    floaters = []
+    scores = sorted(self.groups, reverse=True)
+    for k, points in enumerate(scores):
+      bracket = floaters + sorted(
+          (name for name in self.groups[points] if name != bye),
+          key=seed.__getitem__,
+      )
+      floaters = self._pair_bracket(
+          bracket, pairs, preferences, level, k == len(scores) - 1
+      )
+    score = self.score
+    pairs.sort(key=lambda pair: (
+        -max(score[pair[0]], score[pair[1]]),
+        -score[pair[0]] - score[pair[1]],
+        min(seed[pair[0]], seed[pair[1]]),
+    ))
+    allocated = [
+        self.allocate(name1, name2, board, preferences)
+        for board, (name1, name2) in enumerate(pairs)
+    ]
+    if bye is not None:
+      allocated.append((bye, None))
+    return allocated
+
+
+def pair(players, results=(), **kwargs):
+  """
+  Pairs the next round of a Swiss-system tournament.
+
+  Attributes are the same as for Swiss.
+
+  Return the list of (white, black) pairs in board order; a bye
+  is a (name, None) pair at the end.
+  """
+  return Swiss(players, results, **kwargs).pair()
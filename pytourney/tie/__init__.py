@@ -1,2 +1,34 @@
-from . import hth_quilici
-from . import hth_sweep
+import importlib
+import sys
+
+_submodules = (
+    'aio', 'buchholz', 'cache', 'chain', 'hth_quilici', 'hth_sweep',
+    'nfl', 'parallel', 'snapshot', 'standings', 'stats',
+)
+    # loaded on first attribute access; see __getattr__()
+
+
+def __getattr__(name):
+  if name in _submodules:
+    return importlib.import_module(f'.{name}', __name__)
+        # the import binds the submodule as an attribute of this
+        # package so this function gets called once per name
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_submodules))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+  from . import aio
+  from . import buchholz
+  from . import cache
+  from . import chain
+  from . import hth_quilici
+  from . import hth_sweep
+  from . import nfl
+  from . import parallel
+  from . import snapshot
+  from . import standings
+  from . import stats
@@ -0,0 +1,190 @@
+import asyncio
+import importlib
+import weakref
+
+from .cache import METHODS, normalize
+
+
+def _calculate_batch(jobs):
+  """
+  Does the head-to-head ordering of a batch of requests.
+
+  Runs in the executor. An exception of a request is returned
+  instead of raised so it does not affect the others.
+
+  Return a list of (ok, hth or exception) pairs.
+  """
+  answers = []
+  for method, kwargs, results in jobs:
+    module = importlib.import_module(f'.hth_{method}', __package__)
+    try:
+      answers.append((True, module.calculate(results, **kwargs)))
+    except Exception as exc:
+      answers.append((False, exc))
+  return answers
+
+
+class AsyncHTH:
+  """
+  Awaitable head-to-head ordering.
+
+  executor attribute is optional and should be a
+  concurrent.futures executor to run the calculations on;
+  defaults to the default executor of the event loop. A process
+  pool keeps the calculations off the interpreter lock too.
+
+  batch_size attribute is optional and sets the maximum number
+  of small requests sent to the executor at once.
+
+  batch_delay attribute is optional and sets the seconds a small
+  request may wait for others to join its batch.
+
+  small attribute is optional and sets the maximum number of
+  results of a small request. Larger requests are sent to the
+  executor alone right away.
+
+  Concurrent requests of identical method, keyword attributes
+  and results are coalesced: only the first is calculated and
+  all of them get its result. Small requests are compared by
+  their contents (see pytourney.tie.cache.results_key()) and are
+  collected into micro-batches which share a single executor
+  job. Large requests are compared by the identity of their
+  results object as reading them on the event loop would take
+  about as long as their calculation. An object should be used
+  from a single event loop.
+  """
+
+  def __init__(self, executor=None, batch_size=32, batch_delay=0.001,
+      small=64):
+    self.executor = executor
+    self.batch_size = batch_size
+    self.batch_delay = batch_delay
+    self.small = small
+    self.requests = 0
+    self.coalesced = 0
+    self.batches = 0
+    self._pending = {}
+        # futures of the requests in flight by their keys
+    self._batch = []
+        # small requests waiting for their batch
+    self._flush_handle = None
+
+  async def calculate(self, results, method='quilici', **kwargs):
+    """
+    Does the head-to-head ordering in the executor.
+
+    results attribute should be an iterable of dictionaries in the
+    same format as for the calculate() function of the
+    tie-breaker module. An iterator is read into a list on the
+    calling thread, other results are read by the executor only
+    unless they are small.
+
+    method attribute is optional and should be either "quilici"
+    or "sweep" to select the tie-breaker module. Other keyword
+    attributes are passed to its calculate() function.
+
+    Return a dictionary with names/players as keys, and HTH
+    scores as values.
+    """
+    if method not in METHODS:
+      raise ValueError(f'unknown method: {method!r}')
+    if not hasattr(results, '__len__'):
+      results = list(results)  # an iterator can be read only once
+    small = (len(results) <= self.small)
+    if small:
+      key, results, kwargs = normalize(results, method, kwargs)
+    else:
+      kwargs = dict(kwargs)
+      if kwargs.get('players') is not None:
+        kwargs['players'] = frozenset(kwargs['players'])
+      key = (method, tuple(sorted(kwargs.items())), id(results))
+          # the job keeps the results alive while the key is
+          # pending so the identity is not reused
+    self.requests += 1
+    future = self._pending.get(key)
+    if future is not None:
+      self.coalesced += 1
+    else:
+      loop = asyncio.get_running_loop()
+      future = self._pending[key] = loop.create_future()
+      job = (key, method, kwargs, results)
+      if not small:
+        self._submit(loop, [job])
+      else:
+        self._batch.append(job)
+        if self.batch_size <= len(self._batch):
+          self._flush(loop)
+        elif self._flush_handle is None:
+          self._flush_handle = loop.call_later(
+              self.batch_delay, self._flush, loop
+          )
+    hth = await asyncio.shield(future)
+        # a cancelled waiter must not cancel the others
+    return dict(hth)
+
+  def _flush(self, loop):
+    if self._flush_handle is not None:
+      self._flush_handle.cancel()
+      self._flush_handle = None
+    batch, self._batch = self._batch, []
+    if batch:
+      self._submit(loop, batch)
+
+  def _submit(self, loop, batch):
+    self.batches += 1
+    task = loop.run_in_executor(
+        self.executor,
+        _calculate_batch,
+        [(method, kwargs, results) for _, method, kwargs, results in batch],
+    )
+    task.add_done_callback(lambda task: self._done(batch, task))
+
+  def _done(self, batch, task):
+    futures = [self._pending.pop(key) for key, *_ in batch]
+    if task.cancelled():  # no answers will ever come
+      for future in futures:
+        future.cancel()
+      return
+    exc = task.exception()
+    if exc is not None:  # the batch failed as a whole
+      for future in futures:
+        future.set_exception(exc)
+      return
+    for future, (ok, value) in zip(futures, task.result()):
+      if ok:
+        future.set_result(value)
+      else:
+        future.set_exception(value)
+
+  def stats(self):
+    """
+    Return a dictionary of the request statistics.
+    """
+    return {
+        'requests': self.requests,
+        'coalesced': self.coalesced,
+        'batches': self.batches,
+        'pending': len(self._pending),
+    }
+
+
+_instances = weakref.WeakKeyDictionary()
+    # the AsyncHTH objects of calculate() by event loops
+
+
+async def calculate(results, method='quilici', **kwargs):
+  """
+  Does the head-to-head ordering in the default executor.
+
+  Attributes are the same as for AsyncHTH.calculate(). Requests
+  of the same event loop share an AsyncHTH object with the
+  default settings so they are coalesced and batched together.
+
+  Return a dictionary with names/players as keys, and HTH
+  scores as values.
+  """
+  loop = asyncio.get_running_loop()
+  instance = _instances.get(loop)
+  if instance is None:
+    instance = _instances[loop] = AsyncHTH()
+  return await instance.calculate(results, method, **kwargs)
@@ -0,0 +1,243 @@
+"""
+Opponent-strength tie-breakers of Swiss-system events.
+
+  scores = buchholz.calculate(results)
+  scores['A'].buchholz
+
+The results are in the same format as for pytourney.schedule.swiss:
+a dictionary of two names/players as keys and scores as values
+per game in chronological order, and a single player result is a
+bye. The scores of every player are:
+
+  points            the tournament points
+  buchholz          the sum of the points of the opponents
+  cut1              Buchholz without the weakest opponent
+  median            Buchholz without the weakest and the strongest
+                    opponents
+  sonneborn_berger  the sum of the points of the beaten opponents
+                    and half of the points of the drawn ones (with
+                    the default points)
+  progressive       the sum of the running points after every
+                    round
+
+A bye counts for the points and the progressive score but it has
+no opponent for the others.
+"""
+
+import array
+import collections
+
+from ..match import MatchTable
+
+
+Scores = collections.namedtuple(
+    'Scores',
+    'points buchholz cut1 median sonneborn_berger progressive',
+)
+
+
+DEFAULT_CRITERIA = ('points', 'buchholz', 'sonneborn_berger')
+
+
+def _columns(results, points, bye_points):
+  """
+  Return the names and the player, opponent and points columns of
+  the results with a row per player per game; the opponent of a
+  bye is -1.
+  """
+  index = {}
+  intern = index.setdefault
+  player = []
+  opponent = []
+  gained = []
+  win, draw, loss = points
+  for result in results:
+    if len(result) != 2:
+      if len(result) != 1:
+        raise ValueError(
+            f'a Swiss result should have one or two players: {result!r}'
+        )
+      name, = result
+      player.append(intern(name, len(index)))
+      opponent.append(-1)
+      gained.append(bye_points)
+      continue
+    (name1, score1), (name2, score2) = result.items()
+    i = intern(name1, len(index))
+    j = intern(name2, len(index))
+    if score1 > score2:
+      gained += (win, loss)
+    elif score1 < score2:
+      gained += (loss, win)
+    else:
+      gained += (draw, draw)
+    player += (i, j)
+    opponent += (j, i)
+  names = list(index)
+  player = array.array('q', player)
+  opponent = array.array('q', opponent)
+  gained = array.array('d', gained)
+  return names, player, opponent, gained
+
+
+def _table_columns(np, table, points, bye_points):
+  """
+  Return the same as _columns() for a MatchTable object as numpy
+  arrays; the entries of the table are the rows already.
+  """
+  offsets = np.frombuffer(table.offsets, dtype=table.offsets.typecode)
+  offsets = offsets.astype(np.int64)
+  player = np.frombuffer(table.ids, dtype=table.ids.typecode)
+  player = player.astype(np.int64)
+  score = np.frombuffer(table.scores, dtype=np.float64)
+  lengths = np.diff(offsets)
+  if ((lengths < 1) | (2 < lengths)).any():
+    raise ValueError('a Swiss result should have one or two players')
+  row = np.arange(len(player))
+  match = np.repeat(np.arange(len(lengths)), lengths)
+  paired = (lengths[match] == 2)
+  partner = np.where(offsets[match] == row, row + 1, row - 1)
+  partner = np.where(paired, partner, row)
+  opponent = np.where(paired, player[partner], -1)
+  win, draw, loss = points
+  gained = np.select(
+      [~paired, score[partner] < score, score < score[partner]],
+      [bye_points, win, loss],
+      draw,
+  ).astype(np.float64)
+  return table.registry.names, player, opponent, gained
+
+
+def _numpy_scores(np, size, player, opponent, gained):
+  total = np.bincount(player, weights=gained, minlength=size)
+  played = (0 <= opponent)
+  p, o = player[played], opponent[played]
+  strength = total[o]
+      # points of the opponent of every game
+  buchholz = np.bincount(p, weights=strength, minlength=size)
+  sonneborn_berger = np.bincount(
+      p, weights=gained[played] * strength, minlength=size
+  )
+  lowest = np.full(size, np.inf)
+  np.minimum.at(lowest, p, strength)
+  highest = np.full(size, -np.inf)
+  np.maximum.at(highest, p, strength)
+  counts = np.bincount(p, minlength=size)
+  cut1 = buchholz - np.where(0 < counts, lowest, 0)
+  median = cut1 - np.where(1 < counts, highest, 0)
+  # the points of the k-th of the n rounds of a player count n-k
+  # times in its running points; the keys of the sort are unique
+  # so it needs not be stable
+  rounds = np.bincount(player, minlength=size)
+  row = np.arange(len(player))
+  order = np.argsort(player * len(player) + row)
+  position = np.empty(len(player), dtype=np.int64)
+  position[order] = row - np.repeat(np.cumsum(rounds) - rounds, rounds)
+  progressive = np.bincount(
+      player, weights=(rounds[player] - position) * gained, minlength=size
+  )
+  return zip(*(
+      a.tolist()
+      for a in (total, buchholz, cut1, median, sonneborn_berger, progressive)
+  ))
+
+
+def _python_scores(size, player, opponent, gained):
+  total = [0.0] * size
+  for i, g in zip(player, gained):
+    total[i] += g
+  buchholz = [0.0] * size
+  sonneborn_berger = [0.0] * size
+  progressive = [0.0] * size
+  running = [0.0] * size
+  strengths = [[] for _ in range(size)]
+  for i, j, g in zip(player, opponent, gained):
+    running[i] += g
+    progressive[i] += running[i]
+    if j < 0:
+      continue
+    buchholz[i] += total[j]
+    sonneborn_berger[i] += g * total[j]
+    strengths[i].append(total[j])
+  for i in range(size):
+    s = strengths[i]
+    cut1 = buchholz[i] - (min(s) if s else 0)
+    median = cut1 - (max(s) if 1 < len(s) else 0)
+    yield (
+        total[i], buchholz[i], cut1, median, sonneborn_berger[i],
+        progressive[i],
+    )
+
+
+def scores(results, points=(1, 0.5, 0), bye_points=1):
+  """
+  Calculates the Swiss tie-breaker scores.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores as values in chronological
+  order.
+
+  points attribute is optional and should be the points for a
+  win, a draw and a loss; bye_points attribute is optional and
+  should be the points for a bye.
+
+  Return a dictionary with names/players as keys, and Scores
+  named tuples of floats as values.
+
+  A MatchTable object is read directly from its arrays if numpy
+  is available.
+  """
+  try:
+    import numpy as np  # optional dependency
+  except ImportError:
+    np = None
+  if np is not None and isinstance(results, MatchTable):
+    names, player, opponent, gained = _table_columns(
+        np, results, points, bye_points
+    )
+    present = set(np.flatnonzero(
+        np.bincount(player, minlength=len(names))
+    ).tolist())
+        # the registry may be shared with other tables
+  else:
+    names, player, opponent, gained = _columns(results, points, bye_points)
+    present = None
+  if np is None:
+    rows = _python_scores(len(names), player, opponent, gained)
+  else:
+    rows = _numpy_scores(
+        np,
+        len(names),
+        np.frombuffer(player, dtype=np.int64),
+        np.frombuffer(opponent, dtype=np.int64),
+        np.frombuffer(gained, dtype=np.float64),
+    )
+  rows = map(Scores._make, rows)
+  if present is None or len(present) == len(names):
+    return dict(zip(names, rows))
+  return {
+      name: row
+      for i, (name, row) in enumerate(zip(names, rows))
+      if i in present
+  }
+
+
+def order(scores, criteria=DEFAULT_CRITERIA):
+  """
+  Return the list of the names ordered by the criteria.
+
+  scores attribute should be the dictionary returned by
+  calculate() and criteria attribute is optional and should be a
+  sequence of Scores field names, the most significant first.
+  Higher values are better; ties keep the order of scores.
+  """
+  for criterion in criteria:
+    if criterion not in Scores._fields:
+      raise ValueError(f'unknown criterion: {criterion!r}')
+  return sorted(
+      scores,
+      key=lambda name: tuple(-getattr(scores[name], c) for c in criteria),
+  )
+
+
+calculate = scores
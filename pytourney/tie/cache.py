@@ -0,0 +1,211 @@
+import collections
+import hashlib
+import importlib
+import threading
+
+from ..match import MatchIndex, MatchTable
+from .dominance import Dominance
+
+
+METHODS = ('quilici', 'sweep')
+
+_MODULUS = 2 ** 128
+
+
+def fingerprint(results):
+  """
+  Creates an order-insensitive fingerprint of results.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores as values.
+
+  Every result is canonicalized by sorting its (name, score)
+  pairs by their representations and hashed. The hashes are
+  summed so neither the order of the results nor the order of
+  the players in a result matters while the multiplicity of
+  equal results does.
+
+  Return a hexadecimal string.
+  """
+  total = 0
+  count = 0
+  for result in results:
+    canonical = sorted(
+        (repr(name), repr(score)) for name, score in result.items()
+    )
+    digest = hashlib.blake2b(
+        repr(canonical).encode('utf-8'), digest_size=16
+    ).digest()
+    total = (total + int.from_bytes(digest, 'big')) % _MODULUS
+    count += 1
+  return f'{count:x}-{total:032x}'
+
+
+def results_key(results):
+  """
+  Return an order-insensitive key of results for the lookups of
+  the running process.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores as values, or a Dominance
+  object.
+
+  The key is the multiset of the results as a frozenset of
+  (frozenset of the items of a result, count) pairs, so it is
+  built from the hashes of the names and scores only and it is
+  exact: equal keys mean equal results. The key of a MatchTable
+  object is made of its registry and its arrays, and the key of
+  a Dominance object of its names and pair arrays; these are
+  exact too but depend on the order of the results. Unlike
+  fingerprint(), the key depends on the hash seed of the process
+  so it should not be stored.
+  """
+  if isinstance(results, MatchTable):
+    return (
+        results.registry,  # its ids never change
+        results.offsets.tobytes(),
+        results.ids.tobytes(),
+        results.scores.tobytes(),
+    )
+  elif isinstance(results, Dominance):
+    return (
+        tuple(results.names),
+        results.first.tobytes(),
+        results.second.tobytes(),
+        results.net.tobytes(),
+    )
+  return frozenset(collections.Counter(
+      frozenset(result.items()) for result in results
+  ).items())
+
+
+def normalize(results, method, kwargs):
+  """
+  Prepares a request of a tie-breaker calculation.
+
+  results, method and kwargs attributes are the results, the
+  method and the dictionary of the other keyword attributes of
+  the request.
+
+  Return a triple of the key of the request, the results and the
+  keyword attributes to calculate it with. The players keyword
+  attribute is turned into a frozenset. A MatchIndex with players
+  is keyed by the index itself, its length and the players; as
+  matches are only ever appended to an index, that is exact and
+  it takes no time proportional to the matches. A Dominance
+  object with players is replaced by its subset of the players.
+  Other results are read into a list only if they are an
+  iterator which could not be read twice.
+  """
+  if method not in METHODS:
+    raise ValueError(f'unknown method: {method!r}')
+  kwargs = dict(kwargs)
+  players = kwargs.pop('players', None)
+  if players is None:
+    if iter(results) is results:
+      results = list(results)
+    key = results_key(results)
+  elif isinstance(results, MatchIndex):
+    players = kwargs['players'] = frozenset(players)
+    key = (results, len(results), players)
+  elif isinstance(results, Dominance):
+    results = results.subset(players)
+    key = results_key(results)
+  else:
+    raise TypeError('players requires a MatchIndex or a Dominance object')
+  options = tuple(sorted(
+      (name, value) for name, value in kwargs.items() if name != 'players'
+  ))
+  return (method, options, key), results, kwargs
+
+
+class HTHCache:
+  """
+  Memoization of the tie-breaker calculations.
+
+  maxsize attribute is optional and sets the number of rankings
+  kept; the least recently used ranking gets evicted first.
+
+  The rankings are keyed by the method, the keyword attributes
+  and the results_key() of the results. Thread safe.
+  """
+
+  def __init__(self, maxsize=128):
+    self.maxsize = maxsize
+    self.hits = 0
+    self.misses = 0
+    self._data = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def __len__(self):
+    return len(self._data)
+
+  def calculate(self, results, method='quilici', **kwargs):
+    """
+    Does the head-to-head ordering or returns it from the cache.
+
+    results attribute should be an iterable of dictionaries in the
+    same format as for the calculate() function of the
+    tie-breaker module.
+
+    method attribute is optional and should be either "quilici"
+    or "sweep" to select the tie-breaker module. Other keyword
+    attributes are passed to its calculate() function.
+
+    Return a dictionary with names/players as keys, and HTH
+    scores as values.
+    """
+    key, results, kwargs = normalize(results, method, kwargs)
+        # the results are read twice on a miss
+    with self._lock:
+      hth = self._data.get(key)
+      if hth is not None:
+        self._data.move_to_end(key)
+        self.hits += 1
+        return dict(hth)
+      self.misses += 1
+    module = importlib.import_module(f'.hth_{method}', __package__)
+    hth = module.calculate(results, **kwargs)
+    with self._lock:
+      self._data[key] = hth
+      self._data.move_to_end(key)
+      while self.maxsize < len(self._data):
+        self._data.popitem(last=False)
+    return dict(hth)
+
+  def invalidate(self, results=None):
+    """
+    Removes cached rankings.
+
+    results attribute is optional; if given then only the
+    rankings of these results are removed, otherwise all.
+
+    Return the number of removed rankings.
+    """
+    with self._lock:
+      if results is None:
+        count = len(self._data)
+        self._data.clear()
+        return count
+      wanted = results_key(results)
+      keys = [
+          key for key in self._data
+          if key[2] == wanted
+          or isinstance(key[2], tuple) and key[2][0] is results
+              # the tie groups of a MatchIndex
+      ]
+      for key in keys:
+        del self._data[key]
+      return len(keys)
+
+  def stats(self):
+    """
+    Return a dictionary of the hit/miss statistics.
+    """
+    with self._lock:
+      return {
+          'hits': self.hits,
+          'misses': self.misses,
+          'size': len(self._data),
+          'maxsize': self.maxsize,
+      }
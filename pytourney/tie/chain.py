@@ -0,0 +1,319 @@
+import array
+import collections
+import importlib
+import itertools
+
+from .dominance import Dominance
+
+
+Totals = collections.namedtuple(
+    'Totals',
+    'games wins draws losses goals_for goals_against points',
+)
+    # head-to-head totals of a player against a group of players
+
+
+DEFAULT_CRITERIA = ('points', 'goal_difference', 'goals_for')
+
+
+def _total(field):
+  def criterion(aggregates, ids):
+    totals = aggregates.totals(ids)
+    return {i: getattr(totals[i], field) for i in ids}
+  criterion.__name__ = field
+  return criterion
+
+
+def _goal_difference(aggregates, ids):
+  totals = aggregates.totals(ids)
+  return {i: totals[i].goals_for - totals[i].goals_against for i in ids}
+
+
+def _hth(method):
+  def criterion(aggregates, ids):
+    module = importlib.import_module(f'.hth_{method}', __package__)
+    hth = module.hth(aggregates.dominance(ids))
+    names = aggregates.names
+    return {i: -hth[names[i]] for i in ids}  # lower HTH is better
+  criterion.__name__ = method
+  return criterion
+
+
+CRITERIA = {
+    'points': _total('points'),
+    'goal_difference': _goal_difference,
+    'goals_for': _total('goals_for'),
+    'wins': _total('wins'),
+    'quilici': _hth('quilici'),
+    'sweep': _hth('sweep'),
+}
+
+
+class Aggregates(Dominance):
+  """
+  Head-to-head aggregates of the pairs of players.
+
+  results attribute is optional and should be an iterable of
+  dictionaries of names/players as keys and scores (goals) as
+  values. A dictionary should contain the scores of the players
+  in a given match. Results of more than two players count as a
+  match between every pair of them.
+
+  points attribute is optional and should be the number of
+  points for a win, a draw and a loss.
+
+  The players and the pair slots are those of Dominance; the
+  games, wins and goals of every pair are accumulated along with
+  the net wins in a single pass over the results. The totals of
+  a group are computed from the pairs of its players only and are
+  cached by the group.
+  """
+
+  def __init__(self, results=(), points=(3, 1, 0)):
+    self.points = tuple(points)
+    self.games = array.array('l')
+    self.wins1 = array.array('l')
+    self.wins2 = array.array('l')
+    self.goals1 = array.array('d')
+    self.goals2 = array.array('d')
+        # wins and goals of first and second by pair slots
+    self._totals = {}
+        # totals by frozensets of player ids
+    super().__init__(results)
+
+  def update(self, results):
+    """
+    Adds the results of an iterable of dictionaries.
+    """
+    # every pair should be read with its scores so the two player
+    # fast path of Dominance.update_table() is not taken
+    for result in results:
+      self.add(result)
+
+  def add_entries(self, entries):
+    """
+    Adds a single result given as a list of (id, score) tuples.
+    """
+    for (i, score1), (j, score2) in itertools.combinations(entries, 2):
+      if j < i:
+        i, j, score1, score2 = j, i, score2, score1
+      delta = (score2 < score1) - (score1 < score2)
+      if self.add_pair(i, j, delta) is None:  # new pair
+        for values in (self.games, self.wins1, self.wins2):
+          values.append(0)
+        for values in (self.goals1, self.goals2):
+          values.append(0.0)
+      slot = self.pairs[(i, j)]
+      self.games[slot] += 1
+      self.wins1[slot] += (score2 < score1)
+      self.wins2[slot] += (score1 < score2)
+      self.goals1[slot] += score1
+      self.goals2[slot] += score2
+    self._totals.clear()
+
+  def group_slots(self, ids):
+    """
+    Return the pair slots of the pairs within the player ids.
+    """
+    ids = set(ids)
+    first, second = self.first, self.second
+    return [
+        slot
+        for i in ids
+        for slot in self.slots[i]
+        if first[slot] == i and second[slot] in ids
+            # each pair is visited from its first player only
+    ]
+
+  def totals(self, ids):
+    """
+    Return a dictionary of player ids as keys and their Totals
+    against the other players of ids as values.
+    """
+    key = frozenset(ids)
+    totals = self._totals.get(key)
+    if totals is not None:
+      return totals
+    columns = {i: [0, 0, 0, 0, 0.0, 0.0] for i in key}
+        # games, wins, draws, losses, goals for, goals against
+    for slot in self.group_slots(key):
+      games = self.games[slot]
+      wins1, wins2 = self.wins1[slot], self.wins2[slot]
+      draws = games - wins1 - wins2
+      goals1, goals2 = self.goals1[slot], self.goals2[slot]
+      for i, w, l, gf, ga in (
+          (self.first[slot], wins1, wins2, goals1, goals2),
+          (self.second[slot], wins2, wins1, goals2, goals1),
+      ):
+        c = columns[i]
+        c[0] += games
+        c[1] += w
+        c[2] += draws
+        c[3] += l
+        c[4] += gf
+        c[5] += ga
+    win, draw, loss = self.points
+    totals = self._totals[key] = {
+        i: Totals(*c, win * c[1] + draw * c[2] + loss * c[3])
+        for i, c in columns.items()
+    }
+    return totals
+
+  def dominance(self, ids):
+    """
+    Return the Dominance object of the matches within the player
+    ids.
+    """
+    D = Dominance()
+    ids = sorted(ids)  # keep the order so the pair keys stay ordered
+    new_ids = {i: D.intern(self.names[i]) for i in ids}
+    first, second, net = self.first, self.second, self.net
+    for slot in sorted(self.group_slots(ids)):
+      D.add_pair(new_ids[first[slot]], new_ids[second[slot]], net[slot])
+    return D
+
+
+class Chain:
+  """
+  Recursive mini-league tie-breaker.
+
+  results attribute is optional and should be an iterable of
+  dictionaries in the same format as for Aggregates. They are
+  aggregated only once so the object can rank any number of
+  tie groups of the same tournament.
+
+  criteria attribute is optional and should be a sequence of
+  criteria applied in order. A criterion is either a key of
+  CRITERIA or a callable which gets the Aggregates object and a
+  tuple of tied player ids, and returns a dictionary of player
+  ids as keys and values as values where the higher value is
+  better.
+
+  points attribute is optional and is passed to Aggregates.
+
+  The first criterion which separates the tied players splits
+  them into subgroups and the whole chain is applied again to
+  every subgroup of multiple players, considering the matches
+  among its players only, just like the UEFA tie-breaking rules
+  do. The orderings of the subgroups are cached.
+  """
+
+  def __init__(self, results=(), criteria=DEFAULT_CRITERIA,
+      points=(3, 1, 0)):
+    self.criteria = []
+    for criterion in criteria:
+      if not callable(criterion):
+        if criterion not in CRITERIA:
+          raise ValueError(f'unknown criterion: {criterion!r}')
+        criterion = CRITERIA[criterion]
+      self.criteria.append(criterion)
+    self.aggregates = Aggregates(results, points=points)
+    self._groups = {}
+        # ordered subgroups by frozensets of player ids
+
+  def add(self, result):
+    """
+    Adds a single result dictionary.
+    """
+    self.aggregates.add(result)
+    self._groups.clear()
+
+  def groups(self, ids):
+    """
+    Orders the tied players.
+
+    ids attribute should be a tuple of player ids.
+
+    Return a list of tuples of player ids from the best to the
+    worst where the players of a tuple remained tied.
+    """
+    key = frozenset(ids)
+    groups = self._groups.get(key)
+    if groups is not None:
+      return groups
+    groups = [tuple(ids)]
+    for criterion in self.criteria:
+      values = criterion(self.aggregates, ids)
+      levels = sorted(set(values.values()), reverse=True)
+      if len(levels) == 1:
+        continue
+      groups = []
+      for level in levels:
+        subgroup = tuple(i for i in ids if values[i] == level)
+        if len(subgroup) == 1:
+          groups.append(subgroup)
+        else:
+          groups.extend(self.groups(subgroup))
+      break
+    self._groups[key] = groups
+    return groups
+
+  def hth(self, players=None):
+    """
+    Does the head-to-head ordering of the tied players.
+
+    players attribute is optional and should be an iterable of
+    the tied names/players; defaults to all players of the
+    results. Players not in the results are left unplaced with
+    None values; the others are ordered among themselves.
+
+    Return a dictionary with names/players as keys, and HTH
+    scores as values.
+    """
+    aggregates = self.aggregates
+    names = aggregates.names
+    unplaced = {}
+    if players is None:
+      ids = tuple(range(len(names)))
+    else:
+      index = aggregates.index
+      known = set()
+      for name in players:
+        i = index.get(name)
+        if i is None:
+          unplaced[name] = None
+        else:
+          known.add(i)
+      ids = tuple(sorted(known))
+    if not ids:
+      return unplaced
+    elif len(ids) == 1:
+      d = {names[ids[0]]: -1}
+    else:
+      groups = self.groups(ids)
+      if len(groups) == 1:
+        d = {names[i]: 0 for i in ids}
+      else:
+        d = {
+            names[i]: value
+            for value, group in enumerate(groups, 1)
+            for i in group
+        }
+    d.update(unplaced)
+    return d
+
+  calculate = hth
+
+
+def hth(results, criteria=DEFAULT_CRITERIA, points=(3, 1, 0)):
+  """
+  Does the head-to-head ordering by a chain of criteria.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores (goals) as values. A
+  dictionary should contain the scores of the *tied* players in
+  a given match.
+
+  criteria and points attributes are optional and are the same
+  as for Chain. The default criteria are the head-to-head
+  points, goal difference and goals scored.
+
+  Return a dictionary with names/players as keys, and HTH
+  scores as values. Players which remained tied share their
+  value; if no criterion separated any player then all values
+  are 0.
+  """
+  return Chain(results, criteria=criteria, points=points).hth()
+
+
+calculate = hth
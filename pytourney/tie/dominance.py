@@ -0,0 +1,253 @@
+import array
+import itertools
+
+from ..match import Match, MatchTable
+
+
+class Dominance:
+  """
+  Pairwise dominance of players.
+
+  results attribute is optional and should be an iterable of
+  dictionaries of names/players as keys and scores as values. A
+  dictionary should contain the scores of the players in a given
+  match. Match records and MatchTable objects are accepted
+  natively: their player ids are mapped to the ids of this object
+  without hashing any names.
+
+  Players are interned to integers in the order of their first
+  appearance. The net wins of every pair which has played each
+  other are accumulated in flat integer arrays in a single pass
+  over the results. A draw changes nothing but marks the pair as
+  played.
+
+  The dominance relation is the same as the one of the
+  simplified head-to-head graph: a player dominates an opponent
+  if it has at least as many wins against it as losses, so pairs
+  with zero net wins dominate each other.
+  """
+
+  def __init__(self, results=()):
+    self.names = []
+        # player names by their integer ids
+    self.index = {}
+        # integer ids by player names
+    self.pairs = {}
+        # pair slots by (id1, id2) keys where id1 < id2
+    self.first = array.array('l')
+    self.second = array.array('l')
+    self.net = array.array('l')
+        # net wins of first over second by pair slots
+    self.slots = []
+        # pair slots by player ids
+    self.registry_ids = {}
+        # our player ids by registry ids by Registry objects
+    self.update(results)
+
+  def __len__(self):
+    return len(self.names)
+
+  def __iter__(self):
+    return iter(self.names)
+
+  def intern(self, name):
+    """
+    Return the integer id of the name, registering it if new.
+    """
+    i = self.index.get(name)
+    if i is None:
+      i = self.index[name] = len(self.names)
+      self.names.append(name)
+      self.slots.append([])
+    return i
+
+  def intern_ids(self, registry, ids):
+    """
+    Return the integer ids of registry ids, registering new ones.
+    """
+    registry_ids = self.registry_ids.get(registry)
+    if registry_ids is None:
+      registry_ids = self.registry_ids[registry] = {}
+    result = []
+    for rid in ids:
+      i = registry_ids.get(rid)
+      if i is None:
+        i = registry_ids[rid] = self.intern(registry.names[rid])
+      result.append(i)
+    return result
+
+  def entries(self, result):
+    """
+    Interns the players of a single result dictionary.
+
+    Return a list of (id, score) tuples.
+    """
+    if isinstance(result, Match):
+      ids = self.intern_ids(result.registry, result.entries[::2])
+      return list(zip(ids, result.entries[1::2]))
+    intern = self.intern
+    return [(intern(name), score) for name, score in result.items()]
+
+  def deltas(self, result):
+    """
+    Interns the players of a single result dictionary.
+
+    Return a list of (id1, id2, delta) tuples for all player
+    pairs of the result where id1 < id2 and delta is 1, 0 or -1
+    for a win, draw or loss of id1, respectively.
+    """
+    return entry_deltas(self.entries(result))
+
+  def add(self, result):
+    """
+    Adds a single result dictionary.
+    """
+    self.add_entries(self.entries(result))
+
+  def add_entries(self, entries):
+    """
+    Adds a single result given as a list of (id, score) tuples.
+    """
+    add_pair = self.add_pair
+    for i, j, delta in entry_deltas(entries):
+      add_pair(i, j, delta)
+
+  def add_pair(self, i, j, delta):
+    """
+    Adds delta net wins of player id i over player id j.
+
+    i should be less than j.
+
+    Return the previous net wins or None if the pair is new.
+    """
+    slot = self.pairs.get((i, j))
+    if slot is None:
+      slot = self.pairs[(i, j)] = len(self.net)
+      self.first.append(i)
+      self.second.append(j)
+      self.net.append(delta)
+      self.slots[i].append(slot)
+      self.slots[j].append(slot)
+      return None
+    previous = self.net[slot]
+    self.net[slot] = previous + delta
+    return previous
+
+  def update(self, results, heats=None):
+    """
+    Adds the results of an iterable of dictionaries.
+
+    heats attribute is optional and should be a list. If given
+    then results of more than two players are not added but only
+    their players are interned and their lists of (id, score)
+    tuples are appended to the list, so the caller can process
+    them in bulk.
+    """
+    if isinstance(results, MatchTable):
+      self.update_table(results, heats)
+      return
+    add = self.add
+    for result in results:
+      if heats is not None and 2 < len(result):
+        heats.append(self.entries(result))
+      else:
+        add(result)
+
+  def update_table(self, table, heats=None):
+    """
+    Adds the matches of a MatchTable object.
+
+    Two player matches are read directly from the arrays. heats
+    attribute is the same as for update().
+    """
+    offsets, scores = table.offsets, table.scores
+    ids = self.intern_ids(table.registry, table.ids)
+    add, add_pair = self.add, self.add_pair
+    for k in range(len(offsets) - 1):
+      start, end = offsets[k], offsets[k + 1]
+      if end - start == 2:
+        i, j = ids[start], ids[start + 1]
+        score1, score2 = scores[start], scores[start + 1]
+        delta = (score2 < score1) - (score1 < score2)
+        if j < i:
+          i, j, delta = j, i, -delta
+        add_pair(i, j, delta)
+      elif end - start == 1:
+        pass  # already interned
+      elif heats is not None:
+        heats.append(list(zip(ids[start:end], scores[start:end])))
+      else:
+        add(table[k])
+
+  def subset(self, players):
+    """
+    Return the dominance among the given players.
+
+    The result is the same as if only the results restricted to
+    the given players were added. Players who are not known are
+    ignored. The cost is proportional to the number of pairs
+    the given players are involved in.
+    """
+    D = self.__class__()
+    index = self.index
+    ids = sorted(index[name] for name in players if name in index)
+        # keep the original order so the pair keys stay ordered
+    new_ids = {i: D.intern(self.names[i]) for i in ids}
+    first, second, net = self.first, self.second, self.net
+    for i in ids:
+      for slot in self.slots[i]:
+        j = second[slot]
+        if first[slot] == i and j in new_ids:
+            # each pair is visited from its first player only
+          D.add_pair(new_ids[i], new_ids[j], net[slot])
+    return D
+
+  def successors(self):
+    """
+    Return the dominance adjacency.
+
+    The item at position i of the returned list is the list of
+    player ids dominated by player id i.
+    """
+    succ = [[] for _ in self.names]
+    for i, j, v in zip(self.first, self.second, self.net):
+      if 0 <= v:
+        succ[i].append(j)
+      if v <= 0:
+        succ[j].append(i)
+    return succ
+
+  def to_networkx(self):
+    """
+    Return the dominance relation as a networkx directed graph.
+
+    It has the same nodes and edges as the simplified
+    head-to-head graph of the same results.
+    """
+    import networkx as nx
+    names = self.names
+    H = nx.DiGraph()
+    H.add_nodes_from(names)
+    for i, succ in enumerate(self.successors()):
+      H.add_edges_from((names[i], names[j]) for j in succ)
+    return H
+
+
+def entry_deltas(entries):
+  """
+  Return a list of (id1, id2, delta) tuples for all pairs of a
+  list of (id, score) tuples where id1 < id2 and delta is 1, 0
+  or -1 for a win, draw or loss of id1, respectively.
+  """
+  deltas = []
+  for (i, score1), (j, score2) in itertools.combinations(entries, 2):
+    if score2 < score1:
+      delta = 1
+    elif score1 < score2:
+      delta = -1
+    else:
+      delta = 0
+    if j < i:
+      i, j, delta = j, i, -delta
+    deltas.append((i, j, delta))
+  return deltas
@@ -1,7 +1,11 @@
 import collections
 import itertools
+import operator
 
-import networkx as nx
+from ..match import MatchIndex
+from . import stats as _stats
+from .dominance import Dominance
+from .reachability import Reachability
 
 
 def hth_graph(results):
@@ -19,6 +23,7 @@ def hth_graph(results):
   library yet which supports mixed multigraphs so this is the
   best I can do here.
   """
+  import networkx as nx  # imported lazily as it is heavy
   G = nx.MultiDiGraph()
   for result in results:
     names = tuple(result.keys())
@@ -40,6 +45,141 @@ def hth_graph(results):
   return G
 
 
+def rank_chain(result):
+  """
+  Return the finishing order of a result dictionary as a list of
+  blocks (lists of names/players) from the best to the worst;
+  players of equal scores share a block.
+  """
+  return _blocks(result.items())
+
+
+def _blocks(entries):
+  ordered = sorted(entries, key=operator.itemgetter(1), reverse=True)
+  return [
+      [name for name, _ in block]
+      for _, block in itertools.groupby(ordered, key=operator.itemgetter(1))
+  ]
+
+
+class _Hub:
+  """
+  Virtual node of a block of a rank chain.
+  """
+  __slots__ = ()
+
+
+class RankChains:
+  """
+  Head-to-head relation with the results of more than two players
+  kept as rank chains.
+
+  results attribute is optional and should be an iterable of
+  dictionaries in the same format as for hth(). It is read in a
+  single pass.
+
+  A result of more than two players is stored as its finishing
+  order (see rank_chain()) in O(k log k) time instead of its
+  k(k-1)/2 pairs. The pairwise expansion makes every player reach
+  the players of its own block and all worse blocks, which is
+  exactly what a chain of virtual hub nodes gives with O(k)
+  edges: every player has an edge to the hub of its block, and
+  the hub has edges to the players of the block and to the hub
+  of the next block.
+
+  The chain stands for a pair only if no other result decides
+  the pair as well, as the net wins of a pair are not known from
+  its results one by one. So the players of a result who share
+  it with another player in another result are left out of the
+  chain and their pairs of the result are added to the dominance
+  one by one, like the results of two players. That costs O(k)
+  per such player.
+  """
+
+  def __init__(self, results=()):
+    self.dominance = D = Dominance()
+    heats = []
+    D.update(results, heats=heats)
+    self.chains = []
+        # lists of blocks of player ids, best block first
+    add_pair = D.add_pair
+    for entries, shared in zip(heats, _shared(D, heats)):
+      if not shared:
+        self.chains.append(_blocks(entries))
+        continue
+      chained = [e for e in entries if e[0] not in shared]
+      expanded = [e for e in entries if e[0] in shared]
+      D.add_entries(expanded)
+      for i, score1 in expanded:
+        for j, score2 in chained:
+          delta = (score2 < score1) - (score1 < score2)
+          if i < j:
+            add_pair(i, j, delta)
+          else:
+            add_pair(j, i, -delta)
+      if 1 < len(chained):
+        self.chains.append(_blocks(chained))
+
+  def nodes(self):
+    """
+    Return the list of the players followed by the hubs.
+    """
+    hubs = sum(map(len, self.chains))
+    return self.dominance.names + [_Hub() for _ in range(hubs)]
+
+  def successors(self):
+    """
+    Return the adjacency of the nodes in the order of nodes().
+    """
+    succ = self.dominance.successors()
+    for blocks in self.chains:
+      last = len(succ) + len(blocks) - 1
+      for block in blocks:
+        hub = len(succ)
+        for i in block:
+          succ[i].append(hub)
+        succ.append(block + ([hub + 1] if hub < last else []))
+    return succ
+
+  def reachability(self):
+    """
+    Return the Reachability object of the nodes.
+    """
+    return Reachability.from_adjacency(self.nodes(), self.successors())
+
+
+def _shared(D, heats):
+  """
+  Return a list of the sets of the player ids of the heats who
+  share their heat with another player in another heat or in a
+  pair of D.
+  """
+  # Technical note: two heats share a pair only if they share at
+  # least two players, so I count the common players of every
+  # heat with the earlier heats through the heats of its players
+  # and intersect only the heats which have at least two. That
+  # takes the sum of the squared heat counts of the players
+  # instead of the squared heat sizes.
+  members = [{i for i, _ in entries} for entries in heats]
+  shared = [set() for _ in heats]
+  heats_of = collections.defaultdict(list)
+  first, second, slots = D.first, D.second, D.slots
+  for h, ids in enumerate(members):
+    common = collections.Counter()
+    for i in ids:
+      for slot in slots[i]:
+        if first[slot] in ids and second[slot] in ids:
+          shared[h].add(i)
+      common.update(heats_of[i])
+      heats_of[i].append(h)
+    for g, count in common.items():
+      if 1 < count:
+        both = ids & members[g]
+        shared[h] |= both
+        shared[g] |= both
+  return shared
+
+
 def simplified_hth_graph(G):
   """
   Creates a simplified head-to-head graph.
@@ -57,25 +197,11 @@ def simplified_hth_graph(G):
   H.add_nodes_from(G)
   C = collections.Counter(e[:2] for e in G.edges)
       # edge key ignored hence e[:2]
-  while True:  # simplify multi edges
-    count = 0
-    for (name1, name2), count in C.most_common():
-      if count <= 1:
-        break
-      reverse_count = C[(name2, name1)]  # reverse_count < count
-      if reverse_count < count:
-        H.add_edge(name1, name2)
-      elif reverse_count == count:
-        H.add_edge(name1, name2)
-        H.add_edge(name2, name1)
-      else:  # should never reached because of C.most_common()
-        raise NotImplementedError("unexpected count relation")
-      del C[(name1, name2)]
-      del C[(name2, name1)]
-    if count <= 1:
-      break
-  for (name1, name2) in C:  # add the remaining single edges
-    H.add_edge(name1, name2)
+  for (name1, name2), count in C.items():
+      # the dominant node has at least as many edges towards the
+      # other as reverse; equal counts yield edges both ways
+    if C[(name2, name1)] <= count:
+      H.add_edge(name1, name2)
   return H
 
 
@@ -86,6 +212,7 @@ def paths(simplified_hth_graph, cutoff=None):
   cutoff attribute is optional and sets the depth to stop the
   search for paths.
   """
+  import networkx as nx
   H = simplified_hth_graph
   result = set()
   gen = nx.all_pairs_shortest_path(H, cutoff=cutoff)
@@ -98,50 +225,39 @@ def paths(simplified_hth_graph, cutoff=None):
   return result
 
 
-def hth(results, paths_cutoff=None):
+def reachability(simplified_hth_graph):
   """
-  Does the head-to-head ordering.
+  Creates the reachability of the graph.
 
-  It works identical to the QuickScores HTH algorithm which is
-  published by Tim Quilici and uses logical deduction to
-  determine the head-to-head order.
+  Return a Reachability object which answers the same
+  (name1, name2) membership queries as the set returned by
+  paths() without storing any paths.
+  """
+  return Reachability(simplified_hth_graph)
 
-  results attribute should be an iterable of dictionaries of
-  names/players as keys and scores as values. A dictionary
-  should contain the scores of the *tied* players in a given
-  match. Note that only the results of the tied members involved
-  should be passed to this function, not the whole tournament.
 
-  paths_cutoff attribute is optional and sets the depth to stop
-  the search for paths.
+def pairwise_nodegroups(nodes, paths_H, stats=None):
+  """
+  Groups the nodes by pairwise merges and transpositions.
 
-  Return a dictionary with names/players as keys, and HTH
-  scores as values.
+  nodes attribute should be an iterable of the nodes and
+  paths_H attribute should be a container of the (name1, name2)
+  pairs for which name2 is reachable from name1.
+
+  This works with any paths container including the non
+  transitive ones generated with a cutoff.
+
+  stats attribute is optional and should be a Stats object to
+  count the passes, merges and transpositions.
+
+  Return a pair of the list of nodegroups (dominant group first)
+  and a boolean which is True if all nodes reach each other.
   """
   # Technical note:
-  # First I generate a simplified graph from which I get all
-  # paths. Then I define all nodes as separate groups of nodes:
-  # initially every node has its own group and no ordering is
+  # Initially every node has its own group and no ordering is
   # made. These groups will be merged and transposed based on
-  # their relations. At the end, every node pairs in a given two
-  # groups should be connected in the same way: either all nodes
-  # of group-1 should dominate all nodes of group-2 or the other
-  # way around. The dominant group should be ahead of the other
-  # in the list of groups. If there is no path or path exists to
-  # both directions between two nodes then the respective groups
-  # should be merged. The groups should be also merged if their
-  # paths are inconsistent. At the end, the dictionary is made
-  # of the final list of groups.
-  Gr = hth_graph(results)
-  nodes = set(Gr.nodes())
-  if len(nodes) == 1:
-    return {next(iter(nodes)): -1}
-        # a single node will get reported specifically as -1
-        # to support text formatting like replacing it with
-        # empty string in reports;
-        # note that 0 replaces Quilici's "--" in the output
-  H = simplified_hth_graph(Gr)
-  paths_H = paths(H, cutoff=paths_cutoff)
+  # their relations until a full pass over the group pairs
+  # leaves them unchanged.
   nodegroups = [frozenset((node,)) for node in nodes]
       # initially each node has its own group; they may merge
       # later
@@ -159,7 +275,9 @@ def hth(results, paths_cutoff=None):
       # transposition is a major change in the nodegroups and
       # implies another group ordering pass; the transposed
       # groups can get skipped if unchanged though
+  passes = merges = transpositions = 0
   while (merge or transposed) and 1 < len(nodegroups):
+    passes += 1
     group_combinations = itertools.combinations(nodegroups, 2)
     for group_pair in group_combinations:
       if transposed == group_pair:
@@ -218,6 +336,7 @@ def hth(results, paths_cutoff=None):
           nodegroups.remove(group1)
           nodegroups.remove(group2)
           nodegroups.insert(group1index, group1 | group2)
+          merges += 1
           break
       else:
           # the two groups were checked; no merges were necessary
@@ -228,16 +347,82 @@ def hth(results, paths_cutoff=None):
           nodegroups.remove(group2)
           nodegroups.insert(group1index, group2)
           transposed = (group2, group1)
+          transpositions += 1
           break
         else:
           transposed = None
       if merge or transposed:
         break  # pass the break to the outer loop
-  # the nodegroups list is done at this point and I only have
-  # to transform it to a dictionary with names as keys and HTH
-  # values as values; I do that by allocating an increasing
-  # number (HTH value) to the groups (starting with 1) and all
-  # nodes in a group gets that number in the result dictionary;
+  if stats is not None:
+    stats.count('passes', passes)
+    stats.count('merges', merges)
+    stats.count('transpositions', transpositions)
+  return nodegroups, strongly_connected
+
+
+def condensation_nodegroups(reach, stats=None):
+  """
+  Groups the nodes in the order of the condensation.
+
+  reach attribute should be a Reachability object.
+
+  stats attribute is optional and should be a Stats object to
+  count the components and the set bits of their closures.
+
+  Return a pair of the list of nodegroups (dominant group first)
+  and a boolean which is True if all nodes reach each other.
+  """
+  # Technical note:
+  # The final groups of the pairwise merges and transpositions
+  # are unique: they form the finest ordered partition in which
+  # every node of a group reaches every node of all later groups
+  # but not vica versa. Mutually reachable nodes share a strongly
+  # connected component so components are never split. A cut
+  # between two groups is valid only if every component before
+  # it reaches every component after it, hence all components
+  # before a valid cut precede all components after it in any
+  # topological order. So a single pass over the components in
+  # topological order finds all valid cuts: the bitwise AND of
+  # the closures of the components passed so far should contain
+  # all the components not yet passed. Merged groups are always
+  # runs of consecutive components so no union-find is needed.
+  members = reach.members
+  nodes = reach.nodes
+  order = reach.topological_order()
+  nodegroups = []
+  remaining = 0  # the components not yet passed
+  for c in order:
+    remaining |= (1 << c)
+  common = -1  # AND of the closures of the passed components
+  group = []
+  for c in order:
+    remaining &= ~(1 << c)
+    common &= reach.reach[c]
+    group.extend(nodes[i] for i in members[c])
+    if common & remaining == remaining:
+      nodegroups.append(frozenset(group))
+      group = []
+  strongly_connected = (len(order) == 1)
+  if stats is not None:
+    stats.count('components', len(order))
+    stats.count(
+        'closure', sum(bin(reach.reach[c]).count('1') for c in order)
+    )
+  return nodegroups, strongly_connected
+
+
+def nodegroups_hth(nodegroups, strongly_connected):
+  """
+  Transforms the ordered nodegroups to HTH values.
+
+  Return a dictionary with names/players as keys, and HTH
+  scores as values.
+  """
+  # the nodegroups list is transformed to a dictionary with
+  # names as keys and HTH values as values; I do that by
+  # allocating an increasing number (HTH value) to the groups
+  # (starting with 1) and all nodes in a group gets that number
+  # in the result dictionary;
   # if there is however a single nodegroup then its nodes get
   # 0 or 1 for being disconnected or strongly connected,
   # respectively
@@ -253,4 +438,248 @@ def hth(results, paths_cutoff=None):
   return d
 
 
+def _induced(results, players):
+  if isinstance(results, MatchIndex):
+    return results.induced(players)
+  elif isinstance(results, Dominance):
+    return results.subset(players)
+  raise TypeError('players requires a MatchIndex or a Dominance object')
+
+
+def hth(results, paths_cutoff=None, engine=None, stats=None,
+    players=None, chains=False):
+  """
+  Does the head-to-head ordering.
+
+  It works identical to the QuickScores HTH algorithm which is
+  published by Tim Quilici and uses logical deduction to
+  determine the head-to-head order.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores as values. A dictionary
+  should contain the scores of the *tied* players in a given
+  match. Note that only the results of the tied members involved
+  should be passed to this function, not the whole tournament.
+  The results are read in a single pass so any iterator, like
+  the readers of pytourney.results, is fine. A Dominance object
+  of the tied players is also accepted.
+
+  players attribute is optional and should be an iterable of the
+  tied names/players. If given then results may be the
+  pytourney.match.MatchIndex or the Dominance object of the whole
+  tournament as only the results induced by the players are
+  used; they are extracted in time proportional to the matches
+  of the players.
+
+  paths_cutoff attribute is optional and sets the depth to stop
+  the search for paths.
+
+  engine attribute is optional and selects how the reachability
+  of the players is determined. "scc" uses the strongly
+  connected components of the graph and "paths" generates all
+  paths. Defaults to "paths" if paths_cutoff is set and to "scc"
+  otherwise.
+
+  stats attribute is optional and should be a
+  pytourney.tie.stats.Stats object to record the wall time of
+  the phases and the counts of nodes, edges, closure sizes and
+  grouping steps. Off by default.
+
+  chains attribute is optional and should be True to store the
+  results of more than two players as rank chains instead of
+  expanding them pairwise; see RankChains. It requires the scc
+  engine and gives the same HTH values.
+
+  Return a dictionary with names/players as keys, and HTH
+  scores as values.
+  """
+  # Technical note:
+  # First I generate a simplified graph from which I get the
+  # reachability of the nodes. Then the nodes get partitioned
+  # into an ordered list of groups. Every node pairs in a given
+  # two groups should be connected in the same way: either all
+  # nodes of group-1 should dominate all nodes of group-2 or the
+  # other way around. The dominant group should be ahead of the
+  # other in the list of groups. If there is no path or path
+  # exists to both directions between two nodes then they should
+  # be in the same group. The groups should be also merged if
+  # their paths are inconsistent. See condensation_nodegroups()
+  # and pairwise_nodegroups() for the two ways of getting the
+  # groups. At the end, the dictionary is made of the final list
+  # of groups.
+  if engine is None:
+    engine = ("scc" if paths_cutoff is None else "paths")
+  if engine not in ("scc", "paths"):
+    raise ValueError(f"unknown engine: {engine!r}")
+  if engine == "scc" and paths_cutoff is not None:
+    raise ValueError("paths_cutoff requires the paths engine")
+  if chains and engine != "scc":
+    raise ValueError("chains requires the scc engine")
+  if stats is None:
+    stats = _stats.NULL
+  stats.count('calls')
+  if players is not None:
+    results = _induced(results, players)
+  C = None
+  if isinstance(results, Dominance):
+    D = results
+  elif chains:
+    with stats.phase('dominance'):
+      C = RankChains(results)
+    D = C.dominance
+    stats.count('chains', len(C.chains))
+  elif engine == "scc":
+    with stats.phase('dominance'):
+      D = Dominance(results)
+          # the compact backend gives the simplified graph directly
+  else:
+    D = None
+  if D is None:
+    with stats.phase('graph'):
+      Gr = hth_graph(results)
+    nodes = set(Gr.nodes())
+  else:
+    nodes = D.names
+  if len(nodes) == 1:
+    stats.count('nodes', 1)
+    return {next(iter(nodes)): -1}
+        # a single node will get reported specifically as -1
+        # to support text formatting like replacing it with
+        # empty string in reports;
+        # note that 0 replaces Quilici's "--" in the output
+  if engine == "scc":
+    with stats.phase('reachability'):
+      if C is None:
+        successors = D.successors()
+        paths_H = Reachability.from_adjacency(nodes, successors)
+      else:
+        successors = C.successors()
+        paths_H = Reachability.from_adjacency(C.nodes(), successors)
+    if stats.enabled:
+      stats.count('nodes', len(nodes))
+      stats.count('edges', sum(map(len, successors)))
+    with stats.phase('grouping'):
+      nodegroups, strongly_connected = condensation_nodegroups(
+          paths_H, stats=(stats if stats.enabled else None)
+      )
+      if C is not None:
+        # every hub shares the component of the players of its
+        # block so no group consists of hubs only
+        nodegroups = [
+            frozenset(node for node in group if not isinstance(node, _Hub))
+            for group in nodegroups
+        ]
+  else:
+    with stats.phase('simplify'):
+      H = (simplified_hth_graph(Gr) if D is None else D.to_networkx())
+    with stats.phase('paths'):
+      paths_H = paths(H, cutoff=paths_cutoff)
+    if stats.enabled:
+      stats.count('nodes', H.number_of_nodes())
+      stats.count('edges', H.number_of_edges())
+      stats.count('paths', len(paths_H))
+    with stats.phase('grouping'):
+      nodegroups, strongly_connected = pairwise_nodegroups(
+          nodes, paths_H, stats=(stats if stats.enabled else None)
+      )
+  stats.count('groups', len(nodegroups))
+  return nodegroups_hth(nodegroups, strongly_connected)
+
+
 calculate = hth
+
+
+class IncrementalHTH:
+  """
+  Head-to-head ordering which is updated result by result.
+
+  results attribute is optional and should be an iterable of
+  dictionaries of the initial results in the same format as for
+  hth().
+
+  The dominance of the pairs and the reachability of the players
+  are kept between the results. A new result only changes the
+  dominance of its own pairs; if that adds an edge to the
+  simplified graph then the closure is updated for the affected
+  components only, and if that removes an edge then the closure
+  is rebuilt only if it really depended on that edge. The HTH
+  values are recalculated only if the closure has changed.
+  """
+
+  def __init__(self, results=()):
+    self.dominance = D = Dominance(results)
+    self.reachability = Reachability.from_adjacency(
+        D.names, D.successors()
+    )
+    self._hth = None
+
+  @classmethod
+  def from_state(cls, dominance, reachability, hth=None):
+    """
+    Creates an object from a Dominance and a matching
+    Reachability object, like the ones of a snapshot.
+
+    hth attribute is optional and should be the HTH dictionary of
+    the state if already known.
+    """
+    self = cls.__new__(cls)
+    self.dominance = dominance
+    self.reachability = reachability
+    self._hth = (None if hth is None else dict(hth))
+    return self
+
+  def add_result(self, result):
+    """
+    Adds a single result dictionary.
+    """
+    D, R = self.dominance, self.reachability
+    deltas = D.deltas(result)
+    names = D.names
+    for name in names[len(R.nodes):]:  # newly interned players
+      R.add_node(name)
+      self._hth = None
+    changed = False
+    for i, j, delta in deltas:
+      previous = D.add_pair(i, j, delta)
+      net = delta + (0 if previous is None else previous)
+      name1, name2 = names[i], names[j]
+      # the edge name1 -> name2 exists if net is not negative and
+      # the edge name2 -> name1 exists if net is not positive
+      had12 = (previous is not None and 0 <= previous)
+      had21 = (previous is not None and previous <= 0)
+      if not had12 and 0 <= net:
+        changed |= R.add_edge(name1, name2)
+      elif had12 and net < 0:
+        changed |= R.remove_edge(name1, name2)
+      if not had21 and net <= 0:
+        changed |= R.add_edge(name2, name1)
+      elif had21 and 0 < net:
+        changed |= R.remove_edge(name2, name1)
+    if changed:
+      self._hth = None
+
+  def update(self, results):
+    """
+    Adds the results of an iterable of dictionaries.
+    """
+    for result in results:
+      self.add_result(result)
+
+  def hth(self):
+    """
+    Return the current HTH dictionary.
+
+    It is the same as the one returned by hth() for all the
+    results added so far.
+    """
+    if self._hth is None:
+      nodes = self.reachability.nodes
+      if len(nodes) == 1:
+        self._hth = {nodes[0]: -1}
+      else:
+        self._hth = nodegroups_hth(
+            *condensation_nodegroups(self.reachability)
+        )
+    return dict(self._hth)
+
+  calculate = hth
@@ -1,7 +1,12 @@
 # Reference:
 # https://operations.nfl.com/the-rules/nfl-tiebreaking-procedures/
 
-def hth(results):
+from ..match import MatchIndex
+from . import stats as _stats
+from .dominance import Dominance
+
+
+def hth(results, stats=None, players=None):
   """
   Does the head-to-head ordering.
 
@@ -15,59 +20,75 @@ def hth(results):
   should contain the scores of the *tied* players in a given
   match. Note that only the results of the tied members involved
   should be passed to this function, not the whole tournament.
+  The results are read in a single pass so any iterator, like
+  the readers of pytourney.results, is fine. A Dominance object
+  of the tied players is also accepted.
+
+  players attribute is optional and should be an iterable of the
+  tied names/players. If given then results may be the
+  pytourney.match.MatchIndex or the Dominance object of the whole
+  tournament as only the results induced by the players are
+  used; they are extracted in time proportional to the matches
+  of the players.
+
+  A result of more than two players, like a heat of a race,
+  counts as a win of every player over those with lower scores.
+
+  stats attribute is optional and should be a
+  pytourney.tie.stats.Stats object to record the wall time of
+  the phases and the counts of players, pairs and heats. Off by
+  default.
 
   Return a dictionary with names/players as keys, and HTH
   scores as values.
   """
-  # first, collect the players
-  players = {player for result in results for player in result}
-  if not players:
+  if stats is None:
+    stats = _stats.NULL
+  stats.count('calls')
+  if players is not None:
+    results = _induced(results, players)
+  if isinstance(results, Dominance):
+    D, heats = results, []
+  else:
+    D, heats = Dominance(), []
+    with stats.phase('dominance'):
+      D.update(results, heats=heats)
+  stats.count('players', len(D.names))
+  stats.count('pairs', len(D.net))
+  if not D.names:
     return {}
-  elif len(players) == 1:
-    return {next(iter(players)): -1}
-  players = tuple(sorted(players))
-  # prepare the H2H value matrix
-  h2hval = {
-      player1: {
-          player2: 0
-          for player2 in players if player2 != player1
-      }
-      for player1 in players
-  }
-  for result in results:
-    if len(result) <= 1:  # no opponent
-      continue
-    elif 2 < len(result):
-      raise NotImplementedError()
-    ((p1, v1), (p2, v2)) = result.items()
-    if v1 == v2:
-      continue
-    elif v1 < v2:
-      p1, p2, v1, v2 = p2, p1, v2, v1  # switch sides so p1 wins
-    h2hval[p1][p2] += 1
-    h2hval[p2][p1] -= 1
+  elif len(D.names) == 1:
+    return {D.names[0]: -1}
+  players = tuple(sorted(D.names))
+  # count the opponents dominated by and dominating each player
+  # based on the net wins of the pairs; a club should have
+  # defeated (or lost to) each of the others to count
+  if heats:
+    stats.count('heats', len(heats))
+    with stats.phase('heats'):
+      beaten, beaten_by = _heat_counts(D, heats)
+  else:
+    with stats.phase('sweep'):
+      beaten, beaten_by = _pair_counts(D)
+  opponents = len(players) - 1
   superior, inferior = None, None
-  for p1, d in h2hval.items():
-    if superior and inferior:
-      break
-    values = set(d.values())
-    if not superior and all((0 < x) for x in values):
-      superior = p1
-      continue
-    if not inferior and all((x < 0) for x in values):
-      inferior = p1
-      continue
-  if superior and inferior:
+  for player in players:
+    i = D.index[player]
+    if superior is None and beaten[i] == opponents:
+      superior = player
+    elif inferior is None and beaten_by[i] == opponents:
+      inferior = player
+  if superior is not None and inferior is not None:
     result = {player: 2 for player in players}
     result[superior] = 1
     if 2 < len(result):
       result[inferior] = 3
     return result
-  elif superior:
+  elif superior is not None:
     result = {player: 2 for player in players}
     result[superior] = 1
     return result
-  elif inferior:
+  elif inferior is not None:
     result = {player: 1 for player in players}
     result[inferior] = 2
     return result
@@ -75,5 +96,236 @@ def hth(results):
     return {player: 0 for player in players}
 
 
+def _induced(results, players):
+  if isinstance(results, MatchIndex):
+    return results.induced(players)
+  elif isinstance(results, Dominance):
+    return results.subset(players)
+  raise TypeError('players requires a MatchIndex or a Dominance object')
+
+
+def _pair_counts(D):
+  """
+  Return the lists of the number of opponents beaten by and
+  beating each player id of D.
+  """
+  beaten = [0] * len(D.names)
+  beaten_by = [0] * len(D.names)
+  for p1, p2, v in zip(D.first, D.second, D.net):
+    if v < 0:
+      p1, p2 = p2, p1  # switch sides so p1 wins
+    elif v == 0:
+      continue
+    beaten[p1] += 1
+    beaten_by[p2] += 1
+  return beaten, beaten_by
+
+
+def _heat_counts(D, heats):
+  """
+  Return the same lists as _pair_counts() for the pairs of D
+  and the results of more than two players in heats given by
+  Dominance.update().
+  """
+  try:
+    import numpy as np  # optional dependency
+  except ImportError:
+    # Technical note: I fall back to adding every pair of the
+    # heats to the Dominance object which is quadratic in the
+    # size of the heats but gives the same counts.
+    for entries in heats:
+      D.add_entries(entries)
+    return _pair_counts(D)
+  size = len(D.names)
+  codes = [np.array(D.first, dtype=np.int64) * size + np.array(D.second)]
+  nets = [np.array(D.net, dtype=np.int64)]
+  codes, nets = _heat_pairs(np, heats, size, codes, nets)
+  played = (nets != 0)
+  first, second = np.divmod(codes[played], size)
+  won = (0 < nets[played])
+  winners = np.where(won, first, second)
+  losers = np.where(won, second, first)
+  return (
+      np.bincount(winners, minlength=size).tolist(),
+      np.bincount(losers, minlength=size).tolist(),
+  )
+
+
+def _merge_pairs(np, codes, nets):
+  codes, inverse = np.unique(np.concatenate(codes), return_inverse=True)
+  nets = np.bincount(
+      inverse.ravel(), weights=np.concatenate(nets), minlength=len(codes)
+  )
+  return codes, nets.astype(np.int64)
+
+
+def _heat_pairs(np, heats, size, codes, nets):
+  """
+  Return the distinct pair codes i * size + j (i < j) of the
+  heats and the net wins of i over j as numpy arrays.
+
+  heats should be a list of lists of (id, score) tuples. codes
+  and nets should be lists of arrays of the pairs known already
+  in the same form; they are merged into the returned arrays.
+  """
+  # Technical note: I group the heats by their number of players
+  # so each group is a rectangular array of ids and scores and I
+  # take the upper triangle of the pairs of every heat. Only the
+  # pairs which the heats touch are stored: every chunk of heats
+  # is reduced to its distinct pairs right away, so the memory is
+  # proportional to the number of distinct pairs and not to the
+  # square of the number of players.
+  groups = {}
+  for entries in heats:
+    groups.setdefault(len(entries), []).append(entries)
+  for k, group in groups.items():
+    a, b = np.triu_indices(k, 1)
+    step = max(1, _HEAT_CELLS // (k * k))
+    for start in range(0, len(group), step):
+      chunk = group[start:start + step]
+      ids = np.array(
+          [[i for i, _ in entries] for entries in chunk], dtype=np.int64
+      )
+      scores = np.array([[v for _, v in entries] for entries in chunk])
+      _, ranks = np.unique(scores, return_inverse=True)
+      ranks = ranks.reshape(ids.shape)
+      i, j = ids[:, a], ids[:, b]
+      signs = np.sign(ranks[:, a] - ranks[:, b])
+      swap = (j < i)
+      codes.append(
+          (np.where(swap, j, i) * size + np.where(swap, i, j)).ravel()
+      )
+      nets.append(np.where(swap, -signs, signs).ravel())
+      codes[:], nets[:] = (
+          [array] for array in _merge_pairs(np, codes, nets)
+      )
+  return _merge_pairs(np, codes, nets)
+
+
+_HEAT_CELLS = 2 ** 20
+    # maximum number of pair cells of the heats added at once
+
+
+def _add_heats(np, W, heats):
+  """
+  Adds the net wins of all pairs of the heats to W.
+
+  W should be a square net wins matrix, or a stack of them, and
+  heats should be a list of (g, entries) pairs where entries is
+  a list of (id, score) tuples of a heat to be added to W[g].
+  """
+  # Technical note: I group the heats by their number of players
+  # so each group is a rectangular array of ids and scores. The
+  # scores of a group are sorted only once to get their ranks,
+  # then the signs of the rank differences are the wins (1),
+  # draws (0) and losses (-1) of every pair of every heat. These
+  # are summed into the cells of W by a single bincount() call
+  # instead of pair by pair in Python.
+  size = W.shape[-1]
+  groups = {}
+  for g, entries in heats:
+    groups.setdefault(len(entries), []).append((g, entries))
+  for k, group in groups.items():
+    step = max(1, _HEAT_CELLS // (k * k))
+    for start in range(0, len(group), step):
+      chunk = group[start:start + step]
+      ids = np.array(
+          [[g * size + i for i, _ in entries] for g, entries in chunk],
+          dtype=np.intp,
+      )  # row ids within the stack
+      scores = np.array([[v for _, v in entries] for _, entries in chunk])
+      _, ranks = np.unique(scores, return_inverse=True)
+      ranks = ranks.reshape(ids.shape)
+      cells = ids[:, :, None] * size + (ids[:, None, :] % size)
+      signs = np.sign(ranks[:, :, None] - ranks[:, None, :])
+      W += np.bincount(
+          cells.ravel(), weights=signs.ravel(), minlength=W.size
+      ).astype(W.dtype).reshape(W.shape)
+
+
+def hth_many(groups):
+  """
+  Does the head-to-head ordering of many tie groups at once.
+
+  groups attribute should be an iterable of results, each of
+  them in the same format as for hth().
+
+  Requires numpy. The net wins of all groups are packed into a
+  single three dimensional array padded to the size of the
+  largest group and the superior and inferior clubs are found
+  with array reductions. Worth it for many small groups.
+
+  Return a list of HTH dictionaries in the order of the groups,
+  each identical to the one returned by hth() for the group.
+  """
+  import numpy as np  # optional dependency
+  players = []
+  g_idx, i_idx, j_idx, deltas = [], [], [], []
+  heats = []
+  for g, results in enumerate(groups):
+    results = list(results)
+    names = sorted({name for result in results for name in result})
+    index = {name: i for i, name in enumerate(names)}
+    players.append(names)
+    for result in results:
+      if len(result) <= 1:  # no opponent
+        continue
+      elif 2 < len(result):
+        heats.append((g, [(index[p], v) for p, v in result.items()]))
+        continue
+      ((p1, v1), (p2, v2)) = result.items()
+      if v1 == v2:
+        continue
+      g_idx.append(g)
+      i_idx.append(index[p1])
+      j_idx.append(index[p2])
+      deltas.append(1 if v2 < v1 else -1)
+  if not players:
+    return []
+  sizes = np.array([len(names) for names in players])
+  size = max(2, sizes.max())
+  W = np.zeros((len(players), size, size), dtype=np.int64)
+      # W[g, i, j] is the net wins of player i over player j in
+      # group g
+  if deltas:
+    g_idx = np.array(g_idx)
+    i_idx = np.array(i_idx)
+    j_idx = np.array(j_idx)
+    deltas = np.array(deltas)
+    np.add.at(W, (g_idx, i_idx, j_idx), deltas)
+    np.add.at(W, (g_idx, j_idx, i_idx), -deltas)
+  _add_heats(np, W, heats)
+  valid = (np.arange(size)[None, :] < sizes[:, None])
+  opponents = (
+      valid[:, :, None] & valid[:, None, :]
+      & ~np.eye(size, dtype=bool)[None, :, :]
+  )
+  superior = valid & np.all((0 < W) | ~opponents, axis=2)
+  inferior = valid & np.all((W < 0) | ~opponents, axis=2) & ~superior
+      # padding rows have no opponents and are excluded by valid
+  has_superior = superior.any(axis=1)
+  has_inferior = inferior.any(axis=1)
+  superior = superior.argmax(axis=1)
+  inferior = inferior.argmax(axis=1)
+  hths = []
+  for g, names in enumerate(players):
+    if not names:
+      hths.append({})
+    elif len(names) == 1:
+      hths.append({names[0]: -1})
+    elif has_superior[g]:
+      result = {player: 2 for player in names}
+      result[names[superior[g]]] = 1
+      if has_inferior[g] and 2 < len(names):
+        result[names[inferior[g]]] = 3
+      hths.append(result)
+    elif has_inferior[g]:
+      result = {player: 1 for player in names}
+      result[names[inferior[g]]] = 2
+      hths.append(result)
+    else:
+      hths.append({player: 0 for player in names})
+  return hths
+
 
 calculate = hth
@@ -0,0 +1,402 @@
+# Reference:
+# https://operations.nfl.com/the-rules/nfl-tiebreaking-procedures/
+
+import array
+import collections
+
+from . import hth_sweep
+from .dominance import Dominance
+
+
+Record = collections.namedtuple('Record', 'wins losses ties')
+
+
+DIVISION_STEPS = (
+    'head_to_head',
+    'division',
+    'common',
+    'conference',
+    'victory',
+    'schedule',
+    'conference_ranking',
+    'overall_ranking',
+    'common_net',
+    'net',
+)
+
+# the first wild card step of three or more clubs is the sweep
+# instead of the head-to-head
+WILD_CARD_STEPS = (
+    'head_to_head',
+    'conference',
+    'common4',
+    'victory',
+    'schedule',
+    'conference_ranking',
+    'overall_ranking',
+    'conference_net',
+    'net',
+)
+
+
+def _pct(games, wins, ties):
+  # twice the wins plus the ties over twice the games keeps both
+  # integers, so equal percentages are equal floats
+  return ((2 * wins + ties) / (2 * games) if games else 0.0)
+
+
+class Season:
+  """
+  Aggregate tables of an NFL season.
+
+  teams attribute should be a mapping of team names as keys and
+  (conference, division) pairs as values.
+
+  results attribute is optional and should be an iterable of
+  dictionaries of two team names as keys and points as values.
+
+  coin attribute is optional and should be a callable which gets
+  the list of the names of the clubs tied after every step and
+  returns the winner of the coin toss; defaults to the first of
+  them in the order of teams.
+
+  The games, wins, ties and points of every pair of teams are
+  accumulated in flat tables as the results arrive. The team
+  tables all steps need (records, strength of victory and of
+  schedule, points rankings) are derived from them once per
+  snapshot of the season, and the division rankings and the
+  winners of the ties are cached until the next result, so any
+  number of ties are broken without reading the results again.
+  Net touchdowns are not known from the results, so that step is
+  skipped.
+  """
+
+  def __init__(self, teams, results=(), coin=None):
+    self.names = list(teams)
+    self.index = {name: i for i, name in enumerate(self.names)}
+    self.conferences = [teams[name][0] for name in self.names]
+    self.divisions = [tuple(teams[name]) for name in self.names]
+    self.coin = coin
+    n = len(self.names)
+    self.games = array.array('l', [0]) * (n * n)
+    self.wins = array.array('l', [0]) * (n * n)
+    self.ties = array.array('l', [0]) * (n * n)
+    self.points = array.array('d', [0.0]) * (n * n)
+        # games[i * n + j] is the games of team i against team j;
+        # wins, ties and points scored of team i likewise
+    self._tables = None
+    self._winners = {}
+        # winners of the ties by (procedure, team ids) keys
+    self._rankings = {}
+        # division rankings (team ids) by division keys
+    self.update(results)
+
+  def add(self, result):
+    """
+    Adds a single result dictionary.
+    """
+    if len(result) != 2:
+      raise ValueError(f'an NFL result should have two teams: {result!r}')
+    (name1, points1), (name2, points2) = result.items()
+    i, j = self.index[name1], self.index[name2]
+    n = len(self.names)
+    for a, b, p, q in ((i, j, points1, points2), (j, i, points2, points1)):
+      k = a * n + b
+      self.games[k] += 1
+      self.wins[k] += (q < p)
+      self.ties[k] += (p == q)
+      self.points[k] += p
+    self._tables = None
+    self._winners.clear()
+    self._rankings.clear()
+
+  def update(self, results):
+    """
+    Adds the results of an iterable of dictionaries.
+    """
+    for result in results:
+      self.add(result)
+
+  def _record(self, i, opponents):
+    n = len(self.names)
+    games = wins = ties = 0
+    for j in opponents:
+      games += self.games[i * n + j]
+      wins += self.wins[i * n + j]
+      ties += self.ties[i * n + j]
+    return games, wins, ties
+
+  def _net(self, i, opponents):
+    n = len(self.names)
+    return sum(
+        self.points[i * n + j] - self.points[j * n + i] for j in opponents
+    )
+
+  def tables(self):
+    """
+    Return the dictionary of the team tables (lists by team ids)
+    derived from the pair tables.
+    """
+    if self._tables is not None:
+      return self._tables
+    n = len(self.names)
+    everyone = range(n)
+    conference = [
+        [j for j in everyone if self.conferences[j] == self.conferences[i]]
+        for i in everyone
+    ]
+    division = [
+        [j for j in everyone if self.divisions[j] == self.divisions[i]]
+        for i in everyone
+    ]
+    overall = [self._record(i, everyone) for i in everyone]
+    scored = [sum(self.points[i * n:(i + 1) * n]) for i in everyone]
+    allowed = [
+        sum(self.points[j * n + i] for j in everyone) for i in everyone
+    ]
+    # strength of victory and of schedule are the combined
+    # percentages of the beaten and of all opponents, per game
+    victory = []
+    schedule = []
+    for i in everyone:
+      v_num = v_den = s_num = s_den = 0
+      for j in everyone:
+        games = self.games[i * n + j]
+        if not games:
+          continue
+        g, w, t = overall[j]
+        s_num += games * (2 * w + t)
+        s_den += games * 2 * g
+        wins = self.wins[i * n + j]
+        v_num += wins * (2 * w + t)
+        v_den += wins * 2 * g
+      victory.append(v_num / v_den if v_den else 0.0)
+      schedule.append(s_num / s_den if s_den else 0.0)
+
+    def ranking(i, group):
+      # the rank in points scored plus the rank in points allowed
+      return (
+          sum(1 for j in group if scored[i] < scored[j])
+          + sum(1 for j in group if allowed[j] < allowed[i])
+          + 2
+      )
+
+    self._tables = {
+        'record': [
+            Record(wins, games - wins - ties, ties)
+            for games, wins, ties in overall
+        ],
+        'pct': [_pct(*record) for record in overall],
+        'division': [
+            _pct(*self._record(i, division[i])) for i in everyone
+        ],
+        'conference': [
+            _pct(*self._record(i, conference[i])) for i in everyone
+        ],
+        'victory': victory,
+        'schedule': schedule,
+        'conference_ranking': [
+            ranking(i, conference[i]) for i in everyone
+        ],
+        'overall_ranking': [ranking(i, everyone) for i in everyone],
+        'conference_net': [self._net(i, conference[i]) for i in everyone],
+        'net': [scored[i] - allowed[i] for i in everyone],
+    }
+    return self._tables
+
+  def _common(self, ids):
+    n = len(self.names)
+    common = None
+    for i in ids:
+      opponents = {j for j in range(n) if self.games[i * n + j]}
+      common = (opponents if common is None else common & opponents)
+    return common - set(ids)
+
+  # The steps get a tuple of the tied team ids and return a
+  # dictionary of the team ids and their values, the higher the
+  # better, or None if the step is not applicable.
+
+  def _step_head_to_head(self, ids):
+    return {i: _pct(*self._record(i, ids)) for i in ids}
+
+  def _step_sweep(self, ids):
+    D = Dominance()
+    n = len(self.names)
+    for i in ids:
+      D.intern(self.names[i])
+    for a, i in enumerate(ids):
+      for b, j in enumerate(ids[a + 1:], a + 1):
+        if self.games[i * n + j]:
+          D.add_pair(a, b, self.wins[i * n + j] - self.wins[j * n + i])
+    hth = hth_sweep.hth(D)
+    return {i: -hth[self.names[i]] for i in ids}
+
+  def _step_common(self, ids, minimum=0):
+    common = self._common(ids)
+    records = {i: self._record(i, common) for i in ids}
+    if any(record[0] < minimum for record in records.values()):
+      return None
+    return {i: _pct(*record) for i, record in records.items()}
+
+  def _step_common4(self, ids):
+    return self._step_common(ids, minimum=4)
+
+  def _step_common_net(self, ids):
+    common = self._common(ids)
+    return {i: self._net(i, common) for i in ids}
+
+  def _table_step(self, name, ids, sign=1):
+    table = self.tables()[name]
+    return {i: sign * table[i] for i in ids}
+
+  def _steps(self, procedure, ids):
+    steps = (DIVISION_STEPS if procedure == 'division' else WILD_CARD_STEPS)
+    for name in steps:
+      if name == 'head_to_head' and procedure == 'wild_card' and (
+          2 < len(ids)
+      ):
+        name = 'sweep'
+      method = getattr(self, f'_step_{name}', None)
+      if method is not None:
+        yield method(ids)
+      elif name.endswith('ranking'):
+        yield self._table_step(name, ids, sign=-1)  # lower is better
+      else:
+        yield self._table_step(name, ids)
+
+  def _winner(self, ids, procedure):
+    """
+    Return the team id which wins the tie of the team ids.
+    """
+    if len(ids) == 1:
+      return ids[0]
+    key = (procedure, ids)
+    winner = self._winners.get(key)
+    if winner is not None:
+      return winner
+    if procedure == 'wild_card':
+      # only the highest ranked club of each division proceeds
+      best = {}
+      for i in ids:
+        division = self.divisions[i]
+        rank = self._division_ranking(division).index(i)
+        if division not in best or rank < best[division][0]:
+          best[division] = (rank, i)
+      if len(best) < len(ids):
+        winner = self._winner(
+            tuple(sorted(i for _, i in best.values())), procedure
+        )
+        self._winners[key] = winner
+        return winner
+    for values in self._steps(procedure, ids):
+      if values is None:
+        continue
+      top = max(values.values())
+      tied = tuple(i for i in ids if values[i] == top)
+      if len(tied) < len(ids):
+        # the others are eliminated and the rest start over
+        winner = self._winner(tied, procedure)
+        break
+    else:
+      if self.coin is None:
+        winner = ids[0]
+      else:
+        winner = self.index[self.coin([self.names[i] for i in ids])]
+    self._winners[key] = winner
+    return winner
+
+  def _order(self, ids, procedure):
+    pct = self.tables()['pct']
+    ordered = []
+    for level in sorted({pct[i] for i in ids}, reverse=True):
+      tied = [i for i in ids if pct[i] == level]
+      while tied:
+        # once a club wins, the others revert to the first step
+        winner = self._winner(tuple(tied), procedure)
+        ordered.append(winner)
+        tied.remove(winner)
+    return ordered
+
+  def _division_ranking(self, division):
+    ranking = self._rankings.get(division)
+    if ranking is None:
+      ids = [i for i, d in enumerate(self.divisions) if d == division]
+      ranking = self._rankings[division] = self._order(ids, 'division')
+    return ranking
+
+  def record(self, name):
+    """
+    Return the Record of the team.
+    """
+    return self.tables()['record'][self.index[name]]
+
+  def rank(self, names, procedure='division'):
+    """
+    Orders the teams by their won-lost-tied percentages and breaks
+    the ties.
+
+    procedure attribute is optional and should be either
+    "division" for clubs of the same division, or "wild_card".
+
+    Return the list of the names from the best to the worst.
+    """
+    if procedure not in ('division', 'wild_card'):
+      raise ValueError(f'unknown procedure: {procedure!r}')
+    ids = sorted({self.index[name] for name in names})
+    return [self.names[i] for i in self._order(ids, procedure)]
+
+  def division_ranking(self, conference, division):
+    """
+    Return the list of the names of the division from the best
+    to the worst.
+    """
+    ranking = self._division_ranking((conference, division))
+    return [self.names[i] for i in ranking]
+
+  def seeds(self, conference, wild_cards=3):
+    """
+    Seeds the playoff clubs of the conference.
+
+    The division winners are seeded first, then the wild card
+    clubs, the ties broken by the wild card procedure.
+
+    Return the list of the names of the seeds.
+    """
+    divisions = sorted(
+        {d for d in self.divisions if d[0] == conference}, key=str
+    )
+    winners = [self._division_ranking(d)[0] for d in divisions]
+    others = [
+        i for i, c in enumerate(self.conferences)
+        if c == conference and i not in winners
+    ]
+    seeds = self._order(sorted(winners), 'wild_card')
+    seeds += self._order(others, 'wild_card')[:wild_cards]
+    return [self.names[i] for i in seeds]
+
+
+def hth(results, teams, players=None, procedure='division'):
+  """
+  Does the NFL tie-breaking of the tied clubs.
+
+  results attribute should be an iterable of dictionaries of the
+  games of the whole season, not only those of the tied clubs,
+  and teams attribute should be the same as for Season.
+
+  players attribute is optional and should be an iterable of the
+  tied team names; defaults to all teams. procedure attribute is
+  the same as for Season.rank().
+
+  Return a dictionary with names/players as keys, and their
+  positions as values.
+  """
+  season = Season(teams, results)
+  if players is None:
+    players = teams
+  return {
+      name: k
+      for k, name in enumerate(season.rank(players, procedure), 1)
+  }
+
+
+calculate = hth
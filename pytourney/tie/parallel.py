@@ -0,0 +1,217 @@
+import array
+import collections
+import concurrent.futures
+import importlib
+import itertools
+import os
+
+from .dominance import Dominance
+
+
+METHODS = ('quilici', 'sweep')
+
+_PATH_TYPES = (str, bytes, os.PathLike)
+
+ENCODE_MIN = 1000
+    # number of results from which a league is encoded for transfer
+
+
+Encoded = collections.namedtuple('Encoded', 'names sizes players ranks')
+
+
+def encode(results):
+  """
+  Encodes results into a compact form for interprocess transfer.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores as values.
+
+  Names are interned and scores are replaced by their dense rank
+  within their result as the tie-breakers only compare the
+  scores of a single result.
+
+  Return an Encoded named tuple of the names, the number of
+  entries of every result, and the name indices and score ranks
+  of all entries where the last three are flat integer arrays of
+  the smallest sufficient item size.
+  """
+  index = {}
+  setdefault = index.setdefault
+  sizes = []
+  players = []
+  ranks = []
+  for result in results:
+    size = len(result)
+    sizes.append(size)
+    if size == 2:  # fast path of the most common case
+      ((name1, v1), (name2, v2)) = result.items()
+      players.append(setdefault(name1, len(index)))
+      players.append(setdefault(name2, len(index)))
+      ranks.append(v2 < v1)
+      ranks.append(v1 < v2)
+      continue
+    rank = {v: r for r, v in enumerate(sorted(set(result.values())))}
+    for name, score in result.items():
+      players.append(setdefault(name, len(index)))
+      ranks.append(rank[score])
+  return Encoded(
+      tuple(index),
+      _compact_array(sizes),
+      _compact_array(players),
+      _compact_array(ranks),
+  )
+
+
+def _compact_array(values):
+  top = max(values, default=0)
+  for typecode in ('B', 'H', 'I', 'L'):
+    if top < 2 ** (8 * array.array(typecode).itemsize):
+      return array.array(typecode, values)
+  return array.array('Q', values)
+
+
+def decode(encoded):
+  """
+  Decodes the result of encode().
+
+  Yield result dictionaries with the score ranks as scores.
+  """
+  names, sizes, players, ranks = encoded
+  pos = 0
+  for size in sizes:
+    end = pos + size
+    yield {
+        names[i]: r
+        for i, r in zip(players[pos:end], ranks[pos:end])
+    }
+    pos = end
+
+
+def dominance(encoded):
+  """
+  Creates the Dominance object of encoded results.
+
+  The pairs of two player results are added directly from the
+  arrays without creating any dictionaries.
+  """
+  names, sizes, players, ranks = encoded
+  D = Dominance()
+  for name in names:
+    D.intern(name)  # ids of the Dominance equal the name indices
+  add_pair = D.add_pair
+  pos = 0
+  for size in sizes:
+    if size == 2:
+      i, j = players[pos], players[pos + 1]
+      delta = ranks[pos] - ranks[pos + 1]  # -1, 0 or 1
+      if j < i:
+        i, j, delta = j, i, -delta
+      add_pair(i, j, delta)
+    elif 2 < size:
+      end = pos + size
+      D.add({
+          names[i]: r
+          for i, r in zip(players[pos:end], ranks[pos:end])
+      })
+    pos += size
+  return D
+
+
+def _read(path):
+  from .. import results  # only workers of path jobs need it
+  if os.fspath(path).lower().endswith('.csv'):
+    return results.read_csv(path)
+  return results.read_jsonl(path)
+
+
+def _results(results):
+  if isinstance(results, _PATH_TYPES):
+    return _read(results)
+  elif isinstance(results, Encoded):
+    return dominance(results)
+  return results
+
+
+def _calculate_chunk(method, chunk):
+  module = importlib.import_module(f'.hth_{method}', __package__)
+  return [
+      (league_id, module.hth(_results(results)))
+      for league_id, results in chunk
+  ]
+
+
+def _prepare(results, encode_min):
+  if isinstance(results, _PATH_TYPES + (Encoded,)):
+    return results
+  elif not isinstance(results, (list, tuple)):
+    results = list(results)  # iterators of results are not picklable
+  if encode_min is not None and encode_min <= len(results):
+    try:
+      return encode(results)
+    except (AttributeError, TypeError):
+      pass  # not dictionaries of comparable scores, sent as they are
+  return results
+
+
+def calculate_many(jobs, method='quilici', processes=None,
+    chunksize=16, encode_min=ENCODE_MIN):
+  """
+  Does the head-to-head ordering of many independent leagues.
+
+  jobs attribute should be an iterable of (league_id, results)
+  pairs where results are in the same format as for the
+  calculate() function of the tie-breaker module. results may
+  also be the path of a CSV (.csv suffix) or JSON Lines file
+  which is then read by the worker with pytourney.results, or
+  the Encoded results of encode().
+
+  method attribute is optional and should be either "quilici"
+  or "sweep" to select the tie-breaker module.
+
+  processes attribute is optional and sets the number of worker
+  processes; defaults to the number of CPUs.
+
+  chunksize attribute is optional and sets the number of
+  leagues sent to a worker at once.
+
+  encode_min attribute is optional and sets the number of
+  results from which a league is encoded with encode() before
+  it is sent; None sends all results as they are.
+
+  The jobs are consumed lazily and submitted in chunks while
+  only a bounded number of chunks are in flight. Large leagues
+  are encoded by the calling process, which halves the bytes to
+  transfer and the work of the worker. Small leagues are sent as
+  they are since pickling them costs the calling process less
+  than encoding them, and so are paths, results which are
+  encoded already and results which cannot be encoded.
+
+  Yield (league_id, hth) pairs in the order of completion.
+  """
+  if method not in METHODS:
+    raise ValueError(f'unknown method: {method!r}')
+  if processes is None:
+    processes = os.cpu_count() or 1
+  jobs = iter(jobs)
+  max_pending = 2 * processes
+      # keeps every worker busy while the next chunk is prepared
+  with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+    pending = set()
+    while True:
+      while len(pending) < max_pending:
+        chunk = [
+            (league_id, _prepare(results, encode_min))
+            for league_id, results in itertools.islice(jobs, chunksize)
+        ]
+        if not chunk:
+          break
+        pending.add(
+            executor.submit(_calculate_chunk, method, chunk)
+        )
+      if not pending:
+        break
+      done, pending = concurrent.futures.wait(
+          pending, return_when=concurrent.futures.FIRST_COMPLETED
+      )
+      for future in done:
+        yield from future.result()
@@ -0,0 +1,277 @@
+class Reachability:
+  """
+  Reachability of a directed graph.
+
+  graph attribute should be a mapping-like object whose
+  iteration yields the nodes and whose item of a node is an
+  iterable of its successors. Both a networkx directed graph
+  and a dictionary of sets fulfill this.
+
+  The strongly connected components are computed once, then
+  the transitive closure of the condensation is stored as a
+  bitset for every component. A node reaches another node if
+  they share a component of multiple nodes or if the component
+  of the latter is in the closure of the component of the
+  former. Paths themselves are never stored.
+
+  Nodes and edges can be added afterwards. The closure is then
+  updated only for the affected components; components on a
+  newly formed cycle get merged. Removing an edge rebuilds
+  everything unless the closure is unaffected.
+  """
+
+  def __init__(self, graph):
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    successors = [
+        [index[node2] for node2 in graph[node1]]
+        for node1 in nodes
+    ]
+    self._build(nodes, index, successors)
+
+  @classmethod
+  def from_adjacency(cls, nodes, successors):
+    """
+    Creates the reachability of an already interned graph.
+
+    nodes attribute should be a sequence of the nodes and
+    successors attribute should be a sequence of iterables of
+    node indices; the item at position i stores the successors
+    of nodes[i].
+    """
+    self = cls.__new__(cls)
+    nodes = list(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    self._build(nodes, index, [list(s) for s in successors])
+    return self
+
+  @classmethod
+  def from_closure(cls, nodes, successors, component, reach,
+      ordered=True):
+    """
+    Restores a reachability from its state without computing
+    the components or the closure again.
+
+    nodes and successors attributes are the same as for
+    from_adjacency(), component attribute should be a sequence
+    which maps every node index to its component index, reach
+    attribute should be a sequence of the closure bitsets of
+    the components and ordered attribute should be True if the
+    component indices are in reverse topological order. These
+    are the nodes, successors, component, reach and ordered
+    attributes of a Reachability object.
+    """
+    self = cls.__new__(cls)
+    self.nodes = list(nodes)
+    self.index = {node: i for i, node in enumerate(self.nodes)}
+    self.successors = [list(s) for s in successors]
+    self.component = list(component)
+    self.members = [[] for _ in reach]
+    for i, c in enumerate(self.component):
+      self.members[c].append(i)
+    self.reach = list(reach)
+    self.ordered = ordered
+    return self
+
+  def _build(self, nodes, index, successors):
+    self.nodes = nodes
+    self.index = index
+    self.successors = successors
+    self.component, self.members = strongly_connected_components(
+        successors
+    )
+    # Tarjan's algorithm emits a component only after every
+    # component reachable from it, so a single pass in emission
+    # order closes over the condensation
+    component = self.component
+    reach = []
+    for c, group in enumerate(self.members):
+      bits = 0
+      for i in group:
+        for j in successors[i]:
+          d = component[j]
+          if d != c:
+            bits |= (1 << d) | reach[d]
+      reach.append(bits)
+    self.reach = reach
+    self.ordered = True
+        # True while the component indices are in reverse
+        # topological order; incremental changes break that
+
+  def __contains__(self, pair):
+    name1, name2 = pair
+    return self.from1to2(name1, name2)
+
+  def from1to2(self, name1, name2):
+    """
+    Return True if name2 is reachable from name1.
+
+    A node is never considered to be reachable from itself.
+    """
+    i, j = self.index[name1], self.index[name2]
+    if i == j:
+      return False
+    c, d = self.component[i], self.component[j]
+    return c == d or bool((self.reach[c] >> d) & 1)
+
+  def topological_order(self):
+    """
+    Return the component indices in topological order.
+
+    Components emptied by merges are left out.
+    """
+    if self.ordered:
+      return list(reversed(range(len(self.members))))
+    # a component has strictly more reachable components than
+    # any of the components it reaches
+    reach = self.reach
+    order = [c for c, group in enumerate(self.members) if group]
+    order.sort(key=lambda c: bin(reach[c]).count('1'), reverse=True)
+    return order
+
+  def add_node(self, name):
+    """
+    Adds a new node without edges.
+    """
+    i = self.index[name] = len(self.nodes)
+    self.nodes.append(name)
+    self.successors.append([])
+    self.component.append(len(self.members))
+    self.members.append([i])
+    self.reach.append(0)
+        # an isolated component fits anywhere in the order
+
+  def add_edge(self, name1, name2):
+    """
+    Adds a new edge from name1 to name2.
+
+    Return True if the closure has changed.
+    """
+    i, j = self.index[name1], self.index[name2]
+    self.successors[i].append(j)
+    component, members, reach = self.component, self.members, self.reach
+    c, d = component[i], component[j]
+    if c == d or (reach[c] >> d) & 1:
+      return False
+    self.ordered = False
+    if (reach[d] >> c) & 1:
+        # a cycle is formed; every component on the paths from
+        # d to c gets merged into c
+      merged = [
+          x for x, group in enumerate(members)
+          if group and (
+              x == c or x == d
+              or ((reach[d] >> x) & 1 and (reach[x] >> c) & 1)
+          )
+      ]
+      mask = 0
+      bits = 0
+      for x in merged:
+        mask |= (1 << x)
+        bits |= reach[x]
+      bits &= ~mask
+      for x in merged:
+        if x != c:
+          for k in members[x]:
+            component[k] = c
+          members[c].extend(members[x])
+          members[x] = []
+          reach[x] = 0
+      reach[c] = bits
+      for x, group in enumerate(members):
+        if group and x != c and reach[x] & mask:
+          reach[x] = (reach[x] & ~mask) | (1 << c) | bits
+    else:
+      bits = (1 << d) | reach[d]
+      for x, group in enumerate(members):
+        if group and (x == c or (reach[x] >> c) & 1):
+          reach[x] |= bits
+    return True
+
+  def remove_edge(self, name1, name2):
+    """
+    Removes the edge from name1 to name2.
+
+    Return True if the closure had to be rebuilt.
+    """
+    i, j = self.index[name1], self.index[name2]
+    self.successors[i].remove(j)
+    component, reach = self.component, self.reach
+    c, d = component[i], component[j]
+    if c != d:
+      for k in self.members[c]:
+          # another edge leaving the component may still lead to
+          # the component of name2
+        for x in self.successors[k]:
+          e = component[x]
+          if e != c and (e == d or (reach[e] >> d) & 1):
+            return False
+    self._build(self.nodes, self.index, self.successors)
+    return True
+
+
+def strongly_connected_components(successors):
+  """
+  Finds the strongly connected components of an interned graph.
+
+  successors attribute should be a sequence of sequences of
+  node indices.
+
+  Return a pair of a list which maps every node index to its
+  component index and a list of the node index lists of the
+  components. Components are indexed in reverse topological
+  order, that is, every component is reachable only from
+  components with greater indices.
+  """
+  # Technical note:
+  # This is Tarjan's algorithm with an explicit stack of
+  # (node, next successor position) items instead of recursion
+  # as large leagues would exceed the recursion limit.
+  n = len(successors)
+  order = [-1] * n
+  low = [0] * n
+  onstack = [False] * n
+  stack = []
+  component = [-1] * n
+  members = []
+  counter = 0
+  for root in range(n):
+    if order[root] != -1:
+      continue
+    order[root] = low[root] = counter
+    counter += 1
+    stack.append(root)
+    onstack[root] = True
+    work = [(root, 0)]
+    while work:
+      v, pos = work[-1]
+      succ = successors[v]
+      if pos < len(succ):
+        work[-1] = (v, pos + 1)
+        w = succ[pos]
+        if order[w] == -1:
+          order[w] = low[w] = counter
+          counter += 1
+          stack.append(w)
+          onstack[w] = True
+          work.append((w, 0))
+        elif onstack[w] and order[w] < low[v]:
+          low[v] = order[w]
+        continue
+      work.pop()
+      if work:
+        u = work[-1][0]
+        if low[v] < low[u]:
+          low[u] = low[v]
+      if low[v] == order[v]:
+        c = len(members)
+        group = []
+        while True:
+          w = stack.pop()
+          onstack[w] = False
+          component[w] = c
+          group.append(w)
+          if w == v:
+            break
+        members.append(group)
+  return component, members
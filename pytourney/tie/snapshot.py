@@ -0,0 +1,302 @@
+"""
+Binary snapshots of the head-to-head state of a league.
+
+A snapshot stores the interned names, the net wins of the pairs,
+the strongly connected components, the closure bitsets of the
+components and the HTH values of an IncrementalHTH object, so an
+unchanged league can be ranked again without reading its results
+or rebuilding anything, and a changed one can be updated from
+where it was left.
+
+  H = hth_quilici.IncrementalHTH(results)
+  snapshot.save(path, H, fingerprint=cache.fingerprint(results))
+  ...
+  with snapshot.load(path) as snap:
+    if snap.fingerprint == known_fingerprint:
+      hth = snap.hth()
+    else:
+      H = snap.incremental()
+      H.update(new_results)
+
+Layout (all integers little-endian): the header of MAGIC, the
+format version, flags, the number of names, pairs and components
+and the (offset, length) pairs of the sections, then the 8 byte
+aligned sections: fingerprint (UTF-8), name offsets (uint32),
+names (UTF-8), first and second players of the pairs (uint32),
+net wins (int64), components of the players (uint32), closure
+offsets (uint64), closures (little-endian bitsets) and HTH values
+(int32).
+"""
+
+import array
+import mmap
+import struct
+import sys
+
+from .dominance import Dominance
+from .hth_quilici import IncrementalHTH
+from .reachability import Reachability
+
+
+MAGIC = b'PYTSNAP\x00'
+VERSION = 1
+
+_ORDERED = 1
+    # flag of component indices in reverse topological order
+
+_SECTIONS = (
+    ('fingerprint', 'B'),
+    ('name_offsets', 'I'),
+    ('names', 'B'),
+    ('first', 'I'),
+    ('second', 'I'),
+    ('net', 'q'),
+    ('component', 'I'),
+    ('reach_offsets', 'Q'),
+    ('reach', 'B'),
+    ('hth', 'i'),
+)
+
+_HEADER = struct.Struct(f'<8sHHIII{2 * len(_SECTIONS)}Q')
+
+
+def _typed(typecode, values):
+  a = array.array(typecode, values)
+  if sys.byteorder != 'little':
+    a.byteswap()
+  return a.tobytes()
+
+
+def dumps(incremental, fingerprint=''):
+  """
+  Creates the snapshot of an IncrementalHTH object.
+
+  fingerprint attribute is optional and should be a string
+  which identifies the results, like the one returned by
+  pytourney.tie.cache.fingerprint(), to tell later whether the
+  snapshot is still up to date.
+
+  Names should be strings. Return a bytes object.
+  """
+  D = incremental.dominance
+  R = incremental.reachability
+  hth = incremental.hth()
+  names = []
+  name_offsets = [0]
+  for name in D.names:
+    if not isinstance(name, str):
+      raise TypeError(f'snapshot names should be strings: {name!r}')
+    names.append(name.encode('utf-8'))
+    name_offsets.append(name_offsets[-1] + len(names[-1]))
+  reach = []
+  reach_offsets = [0]
+  for bits in R.reach:
+    reach.append(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'))
+    reach_offsets.append(reach_offsets[-1] + len(reach[-1]))
+  # the pair slots, the node indices and the component indices
+  # are stored as they are so the restored objects are identical
+  sections = [
+      fingerprint.encode('utf-8'),
+      _typed('I', name_offsets),
+      b''.join(names),
+      _typed('I', D.first),
+      _typed('I', D.second),
+      _typed('q', D.net),
+      _typed('I', R.component),
+      _typed('Q', reach_offsets),
+      b''.join(reach),
+      _typed('i', (hth[name] for name in D.names)),
+  ]
+  table = []
+  pos = _HEADER.size
+  for data in sections:
+    pos += -pos % 8
+    table.extend((pos, len(data)))
+    pos += len(data)
+  chunks = [_HEADER.pack(
+      MAGIC,
+      VERSION,
+      (_ORDERED if R.ordered else 0),
+      len(D.names),
+      len(D.net),
+      len(R.reach),
+      *table,
+  )]
+  pos = _HEADER.size
+  for (offset, _), data in zip(zip(table[::2], table[1::2]), sections):
+    chunks.append(b'\x00' * (offset - pos))
+    chunks.append(data)
+    pos = offset + len(data)
+  return b''.join(chunks)
+
+
+def save(path, incremental, fingerprint=''):
+  """
+  Writes the snapshot of an IncrementalHTH object to a file.
+
+  Attributes are the same as for dumps().
+  """
+  data = dumps(incremental, fingerprint=fingerprint)
+  with open(path, 'wb') as f:
+    f.write(data)
+
+
+def load(path):
+  """
+  Memory-maps a snapshot file.
+
+  Return a Snapshot object which should be closed when it is no
+  longer needed.
+  """
+  with open(path, 'rb') as f:
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  try:
+    return Snapshot(mm)
+  except Exception:
+    mm.close()
+    raise
+
+
+class Snapshot:
+  """
+  Read-only view of a snapshot.
+
+  buffer attribute should be a bytes-like object of a snapshot,
+  like the result of dumps() or a memory map of a file.
+
+  Only the header is read initially; the sections are read on
+  demand directly from the buffer.
+  """
+
+  def __init__(self, buffer):
+    self._buffer = buffer
+    self._view = memoryview(buffer)
+    self._views = {}
+        # section views by section names
+    if len(self._view) < _HEADER.size:
+      raise ValueError('not a snapshot')
+    magic, version, flags, *counts_table = _HEADER.unpack_from(self._view)
+    if magic != MAGIC:
+      raise ValueError('not a snapshot')
+    if version != VERSION:
+      raise ValueError(f'unsupported snapshot version: {version}')
+    self.ordered = bool(flags & _ORDERED)
+    self.size, self.pairs, self.components = counts_table[:3]
+    table = counts_table[3:]
+    self._sections = {}
+    for k, (name, typecode) in enumerate(_SECTIONS):
+      offset, length = table[2 * k], table[2 * k + 1]
+      if len(self._view) < offset + length:
+        raise ValueError('truncated snapshot')
+      self._sections[name] = (offset, length, typecode)
+    self._names = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+  def __len__(self):
+    return self.size
+
+  def close(self):
+    """
+    Releases the buffer; closes it if it is a memory map.
+    """
+    for view in self._views.values():
+      if isinstance(view, memoryview):
+        view.release()
+    self._views = {}
+    self._view.release()
+    if isinstance(self._buffer, mmap.mmap):
+      self._buffer.close()
+
+  def section(self, name):
+    """
+    Return the section as a sequence of integers.
+
+    Typed sections are zero-copy memoryviews on little-endian
+    machines; they are valid until the snapshot is closed.
+    """
+    view = self._views.get(name)
+    if view is not None:
+      return view
+    offset, length, typecode = self._sections[name]
+    view = self._view[offset:offset + length]
+    if typecode != 'B':
+      if sys.byteorder == 'little':
+        view = view.cast(typecode)
+      else:
+        a = array.array(typecode, view.tobytes())
+        a.byteswap()
+        view.release()
+        view = a
+    self._views[name] = view
+    return view
+
+  @property
+  def fingerprint(self):
+    return bytes(self.section('fingerprint')).decode('utf-8')
+
+  @property
+  def names(self):
+    """
+    Return the list of the player names by their integer ids.
+    """
+    if self._names is None:
+      data = self.section('names')
+      offsets = self.section('name_offsets')
+      self._names = [
+          str(data[offsets[i]:offsets[i + 1]], 'utf-8')
+          for i in range(self.size)
+      ]
+    return self._names
+
+  def hth(self):
+    """
+    Return the stored HTH dictionary.
+    """
+    return dict(zip(self.names, self.section('hth')))
+
+  def dominance(self):
+    """
+    Return the restored Dominance object.
+    """
+    D = Dominance()
+    for name in self.names:
+      D.intern(name)
+    add_pair = D.add_pair
+    for i, j, v in zip(
+        self.section('first'), self.section('second'), self.section('net')
+    ):
+      add_pair(i, j, v)
+    return D
+
+  def reachability(self, dominance=None):
+    """
+    Return the restored Reachability object.
+
+    dominance attribute is optional and should be the restored
+    Dominance object if already available.
+    """
+    D = (self.dominance() if dominance is None else dominance)
+    data = self.section('reach')
+    offsets = self.section('reach_offsets')
+    reach = [
+        int.from_bytes(data[offsets[c]:offsets[c + 1]], 'little')
+        for c in range(self.components)
+    ]
+    return Reachability.from_closure(
+        D.names, D.successors(), self.section('component'), reach,
+        ordered=self.ordered,
+    )
+
+  def incremental(self):
+    """
+    Return the restored IncrementalHTH object to continue with.
+    """
+    D = self.dominance()
+    return IncrementalHTH.from_state(
+        D, self.reachability(dominance=D), hth=self.hth()
+    )
@@ -0,0 +1,64 @@
+import importlib
+
+from .dominance import Dominance
+
+
+METHODS = ('quilici', 'sweep')
+
+
+def tie_groups(points):
+  """
+  Finds the tie groups of a standings table.
+
+  points attribute should be a mapping of names/players as keys
+  and points (or any other primary ranking key) as values.
+
+  Return a dictionary with the shared values as keys and the
+  sets of tied names/players as values. Values which are not
+  shared by multiple players are omitted.
+  """
+  groups = {}
+  for name, value in points.items():
+    groups.setdefault(value, set()).add(name)
+  return {
+      value: group
+      for value, group in groups.items()
+      if 1 < len(group)
+  }
+
+
+def hth(results, points, method='quilici'):
+  """
+  Does the head-to-head ordering of all tie groups.
+
+  results attribute should be an iterable of dictionaries of
+  names/players as keys and scores as values of the *whole*
+  tournament. They are indexed only once and every tie group is
+  ordered from the part of that index which is induced by the
+  players of the group.
+
+  points attribute should be a mapping of names/players as keys
+  and points (or any other primary ranking key) as values.
+
+  method attribute is optional and should be either "quilici"
+  or "sweep" to select the tie-breaker module.
+
+  The ordering of a tie group is identical to calling the
+  calculate() function of the tie-breaker module with the
+  results restricted to the players of the group (results
+  without any of them dropped).
+
+  Return a dictionary with the shared values as keys, and the
+  HTH dictionaries of the groups as values.
+  """
+  if method not in METHODS:
+    raise ValueError(f'unknown method: {method!r}')
+  module = importlib.import_module(f'.hth_{method}', __package__)
+  D = Dominance(results)
+  return {
+      value: module.hth(D.subset(group))
+      for value, group in tie_groups(points).items()
+  }
+
+
+calculate = hth
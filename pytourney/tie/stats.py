@@ -0,0 +1,96 @@
+import time
+
+
+class Stats:
+  """
+  Instrumentation of the tie-breakers.
+
+  Pass an object as the stats attribute of the hth() function of
+  a tie-breaker module to record the wall time of its phases and
+  its counters like the number of nodes and edges. The records
+  of multiple calls are summed up, and the number of calls is
+  counted as "calls".
+  """
+
+  enabled = True
+
+  def __init__(self):
+    self.phases = {}
+        # seconds by phase names in the order of their first run
+    self.counts = {}
+        # counter values by names
+
+  def phase(self, name):
+    """
+    Return a context manager which adds its wall time to the
+    phase.
+    """
+    return _Timer(self.phases, name)
+
+  def count(self, name, value=1):
+    """
+    Adds value to the counter.
+    """
+    self.counts[name] = self.counts.get(name, 0) + value
+
+  def reset(self):
+    """
+    Removes all records.
+    """
+    self.phases.clear()
+    self.counts.clear()
+
+  def as_dict(self):
+    """
+    Return a dictionary of the records with "phases" and "counts"
+    keys, each a dictionary of names as keys and seconds or
+    counter values as values.
+    """
+    return {'phases': dict(self.phases), 'counts': dict(self.counts)}
+
+
+class _Timer:
+
+  __slots__ = ('phases', 'name', 'start')
+
+  def __init__(self, phases, name):
+    self.phases = phases
+    self.name = name
+
+  def __enter__(self):
+    self.start = time.perf_counter()
+
+  def __exit__(self, *exc_info):
+    elapsed = time.perf_counter() - self.start
+    self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
+
+
+class _NullTimer:
+
+  __slots__ = ()
+
+  def __enter__(self):
+    pass
+
+  def __exit__(self, *exc_info):
+    pass
+
+
+class _NullStats:
+  """
+  Stats object which records nothing; used when instrumentation
+  is off.
+  """
+
+  enabled = False
+
+  _timer = _NullTimer()
+
+  def phase(self, name):
+    return self._timer
+
+  def count(self, name, value=1):
+    pass
+
+
+NULL = _NullStats()
@@ -46,7 +46,7 @@ setup(
       'Programming Language :: Python :: 3.7',
       ],
   keywords=['game', 'tournament', 'sport',],
-  packages=find_packages(exclude=['test*']),
+  packages=find_packages(exclude=['test*', 'bench*']),
   package_dir={'pytourney': './pytourney'},
   include_package_data=True,
   install_requires=[
@@ -54,6 +54,10 @@ setup(
       ],
   extras_require={
       #'docs': ['sphinx'],
+      'numpy': ['numpy'],
+      },
+  entry_points={
+      'console_scripts': ['pytourney = pytourney.cli:main'],
       },
   scripts=[
       ]
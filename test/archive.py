@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+
+from helpers import random_results
+import pytourney
+
+
+def random_season(rnd):
+  return random_results(
+      rnd, "ABCDEFGHIJKL", 40, sizes=(1, 2, 2, 2, 3), scores=range(4)
+  )
+
+
+def filtered(seasons, labels, players):
+  results = [
+      {k: v for k, v in result.items() if k in players}
+      for label in labels
+      for result in seasons[label]
+  ]
+  return [result for result in results if result]
+
+
+class TestArchive(unittest.TestCase):
+
+  def setUp(self):
+    self.dirname = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.dirname.name, "league.arch")
+    rnd = random.Random(2018)
+    self.seasons = {
+        str(year): random_season(rnd) for year in range(2004, 2019)
+    }
+    with pytourney.archive.write(self.path, self.seasons.items()):
+      pass
+
+  def tearDown(self):
+    self.dirname.cleanup()
+
+  def test_results(self):
+    with pytourney.archive.Archive(self.path) as a:
+      self.assertEqual(a.labels, list(self.seasons))
+      self.assertEqual(a.seasons, 15)
+      self.assertEqual(
+          list(a.results()),
+          [r for results in self.seasons.values() for r in results],
+      )
+      self.assertEqual(
+          list(a.results(seasons=["2010"])), self.seasons["2010"]
+      )
+
+  def test_hth(self):
+    rnd = random.Random(2019)
+    labels = list(self.seasons)
+    with pytourney.archive.Archive(self.path) as a:
+      for _ in range(100):
+        players = set(rnd.sample("ABCDEFGHIJKLM", rnd.randint(1, 6)))
+        seasons = rnd.sample(labels, rnd.randint(1, 4))
+        expected = filtered(self.seasons, seasons, players)
+        for method in ("quilici", "sweep"):
+          module = getattr(pytourney.tie, f"hth_{method}")
+          self.assertEqual(
+              a.hth(players, seasons=seasons, method=method),
+              module.calculate(expected),
+          )
+        self.assertEqual(
+            a.hth(players), pytourney.tie.hth_quilici.calculate(
+                filtered(self.seasons, labels, players)
+            ),
+        )
+
+  def test_match_indices(self):
+    with pytourney.archive.Archive(self.path) as a:
+      indices, present = a.match_indices({"A", "B"}, seasons=["2004"])
+      results = list(a.results(seasons=["2004"]))
+      self.assertEqual(
+          indices,
+          [k for k, r in enumerate(results) if {"A", "B"} <= set(r)],
+      )
+      self.assertEqual(
+          present,
+          {name for r in results for name in r if name in {"A", "B"}},
+      )
+
+  def test_errors(self):
+    with self.assertRaises(ValueError):
+      pytourney.archive.write(self.path, [("x", []), ("x", [])])
+    with pytourney.archive.Archive(self.path) as a:
+      with self.assertRaises(KeyError):
+        a.hth({"A", "B"}, seasons=["1999"])
+      with self.assertRaises(ValueError):
+        a.hth({"A", "B"}, method="coin")
+    with open(self.path, "wb") as f:
+      f.write(b"\x00" * 1000)
+    with self.assertRaises(ValueError):
+      pytourney.archive.Archive(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
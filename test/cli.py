@@ -0,0 +1,104 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pytourney.cli
+
+
+class TestWorker(unittest.TestCase):
+
+  def work(self, text):
+    outfile = io.StringIO()
+    failed = pytourney.cli.worker(io.StringIO(text), outfile)
+    return failed, [json.loads(line) for line in outfile.getvalue().splitlines()]
+
+  def test_jobs(self):
+    failed, answers = self.work(
+        '{"id": 1, "results": [{"A": 1, "B": 0}]}\n'
+        '\n'
+        '{"id": 2, "method": "sweep", "results": [{"A": 1, "B": 2}]}\n'
+        '{"results": [{"A": 1, "B": 0}], "options": {"engine": "paths"}}\n'
+    )
+    self.assertEqual(failed, 0)
+    self.assertEqual(answers, [
+        {"id": 1, "hth": {"A": 1, "B": 2}},
+        {"id": 2, "hth": {"A": 2, "B": 1}},
+        {"hth": {"A": 1, "B": 2}},
+    ])
+
+  def test_stats(self):
+    _, (answer,) = self.work(
+        '{"results": [{"A": 1, "B": 0}], "stats": true}\n'
+    )
+    self.assertEqual(answer["stats"]["counts"]["nodes"], 2)
+
+  def test_errors(self):
+    failed, answers = self.work(
+        'not json\n'
+        '[1, 2]\n'
+        '{"id": 3, "method": "coin", "results": []}\n'
+        '{"id": 4}\n'
+        '{"id": 5, "results": [{"A": 0}]}\n'
+    )
+    self.assertEqual(failed, 4)
+    self.assertEqual(
+        [(a.get("line"), a.get("id")) for a in answers],
+        [(1, None), (2, None), (None, 3), (None, 4), (None, 5)],
+    )
+    self.assertTrue(all("error" in a for a in answers[:4]))
+    self.assertEqual(answers[4]["hth"], {"A": -1})
+
+  def test_process(self):
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'pytourney', 'worker'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+      for k in range(3):
+        # every answer arrives before the next job is sent
+        proc.stdin.write(json.dumps({"id": k, "results": [{"A": k}]}) + '\n')
+        proc.stdin.flush()
+        self.assertEqual(
+            json.loads(proc.stdout.readline()), {"id": k, "hth": {"A": -1}}
+        )
+    finally:
+      proc.stdin.close()
+      proc.wait()
+    self.assertEqual(proc.returncode, 0)
+
+  def test_process_failed(self):
+    proc = subprocess.run(
+        [sys.executable, '-m', 'pytourney', 'worker'],
+        input='{"id": 1, "results": [{"A": 1}]}\n{"id": 2}\n',
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    self.assertEqual(proc.returncode, 1)
+    self.assertEqual(len(proc.stdout.splitlines()), 2)
+
+
+class TestRank(unittest.TestCase):
+
+  def test_csv(self):
+    with tempfile.TemporaryDirectory() as dirname:
+      path = os.path.join(dirname, 'results.csv')
+      with open(path, 'w', encoding='utf-8') as f:
+        f.write('A,1,B,0\nB,2,C,1\n')
+      stdout = io.StringIO()
+      with contextlib.redirect_stdout(stdout):
+        code = pytourney.cli.main(['rank', path])
+    self.assertEqual(code, 0)
+    self.assertEqual(json.loads(stdout.getvalue()), {"A": 1, "B": 2, "C": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Technical note: the test directories are no packages and the name
+# test is taken by the standard library, so I put this directory on
+# the path for the test modules of every directory to import helpers.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,15 @@
+def random_results(rnd, players, count, sizes=(2,), scores=range(3)):
+  """
+  Return a list of count results of random players with random
+  scores.
+
+  rnd attribute should be a random.Random object. Every result
+  has a random choice of sizes players of the players sequence
+  but at most all of them, and random choices of scores as
+  scores.
+  """
+  results = []
+  for _ in range(count):
+    names = rnd.sample(players, min(rnd.choice(sizes), len(players)))
+    results.append({name: rnd.choice(scores) for name in names})
+  return results
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import unittest
+
+
+def imported_modules(code):
+  proc = subprocess.run(
+      [sys.executable, '-c', code + '\nimport sys\nprint(*sys.modules)'],
+      stdout=subprocess.PIPE,
+      universal_newlines=True,
+      check=True,
+  )
+  return set(proc.stdout.split())
+
+
+class TestLazyImport(unittest.TestCase):
+
+  def test_import_pytourney(self):
+    modules = imported_modules('import pytourney')
+    self.assertNotIn('pytourney.tie', modules)
+    self.assertNotIn('networkx', modules)
+
+  def test_import_hth_sweep(self):
+    modules = imported_modules('import pytourney.tie.hth_sweep')
+    self.assertNotIn('pytourney.tie.hth_quilici', modules)
+    self.assertNotIn('networkx', modules)
+
+  def test_hth_quilici_scc_engine(self):
+    modules = imported_modules(
+        'import pytourney\n'
+        'pytourney.tie.hth_quilici.calculate([{"A": 1, "B": 0}])'
+    )
+    self.assertNotIn('networkx', modules)
+
+  def test_hth_quilici_paths_engine(self):
+    modules = imported_modules(
+        'import pytourney\n'
+        'pytourney.tie.hth_quilici.calculate('
+        '[{"A": 1, "B": 0}], engine="paths")'
+    )
+    self.assertIn('networkx', modules)
+
+  def test_attribute_access(self):
+    import pytourney
+    self.assertIs(
+        pytourney.tie.hth_sweep,
+        sys.modules['pytourney.tie.hth_sweep'],
+    )
+    self.assertIn('hth_quilici', dir(pytourney.tie))
+    with self.assertRaises(AttributeError):
+      pytourney.tie.nonexistent
+
+
+if __name__ == '__main__':
+    unittest.main()
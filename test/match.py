@@ -0,0 +1,160 @@
+import random
+import unittest
+
+from helpers import random_results
+import pytourney
+from pytourney.match import Match, MatchIndex, MatchTable, Registry
+
+
+class TestRegistry(unittest.TestCase):
+
+  def test_intern(self):
+    registry = Registry(["A", "B"])
+    self.assertEqual(registry.intern("C"), 2)
+    self.assertEqual(registry.intern("A"), 0)
+    self.assertEqual(registry.names, ["A", "B", "C"])
+    self.assertIn("B", registry)
+    self.assertEqual(len(registry), 3)
+
+
+class TestMatch(unittest.TestCase):
+
+  def test_mapping(self):
+    match = Match.from_result(Registry(), {"A": 3, "B": 1})
+    self.assertEqual(match.entries, (0, 3, 1, 1))
+    self.assertEqual(len(match), 2)
+    self.assertEqual(list(match), ["A", "B"])
+    self.assertEqual(match["B"], 1)
+    self.assertEqual(match, {"A": 3, "B": 1})
+    self.assertEqual(dict(match.items()), {"A": 3, "B": 1})
+    self.assertEqual(match.values(), [3, 1])
+    with self.assertRaises(KeyError):
+      match["C"]
+
+  def test_slots(self):
+    match = Match.from_result(Registry(), {"A": 3})
+    with self.assertRaises(AttributeError):
+      match.other = 1
+
+
+class TestMatchTable(unittest.TestCase):
+
+  def test_sequence(self):
+    results = [{"A": 3, "B": 1}, {"C": 2}, {"A": 1, "B": 2, "C": 0}]
+    table = MatchTable(results)
+    self.assertEqual(len(table), 3)
+    self.assertEqual(list(table), results)
+    self.assertEqual(table[-1], results[-1])
+    self.assertEqual(table[:2], results[:2])
+    with self.assertRaises(IndexError):
+      table[3]
+
+  def test_shared_registry(self):
+    registry = Registry()
+    table = MatchTable(registry=registry)
+    table.append(Match.from_result(registry, {"A": 1, "B": 0}))
+    self.assertEqual(list(table.ids), [0, 1])
+
+
+class TestTieBreakers(unittest.TestCase):
+
+  def test_hth_quilici(self):
+    rnd = random.Random(2018)
+    for _ in range(100):
+      results = random_results(
+          rnd, "ABCDEFGH", rnd.randint(1, 20), sizes=(1, 2, 2, 3)
+      )
+      registry = Registry()
+      matches = [Match.from_result(registry, r) for r in results]
+      expected = pytourney.tie.hth_quilici.calculate(results)
+      for engine in ("scc", "paths"):
+        self.assertEqual(
+            pytourney.tie.hth_quilici.calculate(matches, engine=engine),
+            expected,
+        )
+        self.assertEqual(
+            pytourney.tie.hth_quilici.calculate(
+                MatchTable(results), engine=engine
+            ),
+            expected,
+        )
+
+  def test_hth_sweep(self):
+    rnd = random.Random(2018)
+    for _ in range(100):
+      results = random_results(
+          rnd, "ABCDEFGH", rnd.randint(1, 20), sizes=(1, 2, 2)
+      )
+      registry = Registry()
+      matches = [Match.from_result(registry, r) for r in results]
+      expected = pytourney.tie.hth_sweep.calculate(results)
+      self.assertEqual(pytourney.tie.hth_sweep.calculate(matches), expected)
+      self.assertEqual(
+          pytourney.tie.hth_sweep.calculate(MatchTable(results)), expected
+      )
+    results = [{"A": 3, "B": 2, "C": 1}, {"A": 1, "B": 0}]
+    self.assertEqual(
+        pytourney.tie.hth_sweep.calculate(MatchTable(results)),
+        {"A": 1, "B": 2, "C": 3},
+    )
+
+
+class TestMatchIndex(unittest.TestCase):
+
+  def setUp(self):
+    rnd = random.Random(2018)
+    players = "ABCDEFGHIJKL"
+    self.results = random_results(
+        rnd, players, 200, sizes=(1, 2, 2, 2, 3)
+    )
+    self.index = MatchIndex(self.results)
+
+  def filtered(self, players):
+    results = [
+        {k: v for k, v in result.items() if k in players}
+        for result in self.results
+    ]
+    return [result for result in results if result]
+
+  def test_induced(self):
+    rnd = random.Random(2019)
+    for _ in range(50):
+      players = set(rnd.sample("ABCDEFGHIJKLM", rnd.randint(1, 6)))
+      induced = self.index.induced(players)
+      self.assertIs(induced.registry, self.index.registry)
+      self.assertEqual(
+          [dict(match.items()) for match in induced], self.filtered(players)
+      )
+
+  def test_matches(self):
+    self.assertEqual(
+        list(self.index.matches("A")),
+        [k for k, r in enumerate(self.results) if "A" in r],
+    )
+    self.assertEqual(
+        list(self.index.pair_matches("B", "A")),
+        [k for k, r in enumerate(self.results) if {"A", "B"} <= set(r)],
+    )
+    self.assertEqual(list(self.index.matches("Z")), [])
+    self.assertEqual(list(self.index.pair_matches("A", "Z")), [])
+    self.index.append({"A": 1, "B": 0})
+    self.assertEqual(self.index.pair_matches("A", "B")[-1], 200)
+
+  def test_hth_players(self):
+    rnd = random.Random(2020)
+    D = pytourney.tie.dominance.Dominance(self.results)
+    for _ in range(50):
+      players = set(rnd.sample("ABCDEFGHIJKL", rnd.randint(1, 6)))
+      for method in ("quilici", "sweep"):
+        module = getattr(pytourney.tie, f'hth_{method}')
+        expected = module.calculate(self.filtered(players))
+        self.assertEqual(
+            module.calculate(self.index, players=players), expected
+        )
+        self.assertEqual(module.calculate(D, players=players), expected)
+    with self.assertRaises(TypeError):
+      pytourney.tie.hth_quilici.calculate(self.results, players={"A"})
+
+
+if __name__ == '__main__':
+    unittest.main()
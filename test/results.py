@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+
+import pytourney
+
+
+class TestReadJSONL(unittest.TestCase):
+
+  def test_read(self):
+    f = io.StringIO('{"A": 3, "B": 1}\n\n{"C": 2}\n')
+    results = pytourney.results.read_jsonl(f)
+    self.assertEqual(next(results), {"A": 3, "B": 1})
+    self.assertEqual(list(results), [{"C": 2}])
+
+  def test_not_an_object(self):
+    with self.assertRaises(ValueError):
+      list(pytourney.results.read_jsonl(io.StringIO('[1, 2]\n')))
+
+  def test_path(self):
+    with tempfile.TemporaryDirectory() as d:
+      path = os.path.join(d, 'results.jsonl')
+      with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"A": 3, "B": 1}\n{"B": 1, "C": 0}\n')
+      self.assertEqual(
+          pytourney.tie.hth_quilici.calculate(
+              pytourney.results.read_jsonl(path)
+          ),
+          {"A": 1, "B": 2, "C": 3},
+      )
+
+
+class TestReadCSV(unittest.TestCase):
+
+  def test_read(self):
+    f = io.StringIO(
+        'name1,score1,name2,score2,name3,score3\n'
+        'A,3,B,1,,\n'
+        '\n'
+        'C,2.5,,,,\n'
+        'A,1,B,2,C,0\n'
+    )
+    self.assertEqual(
+        list(pytourney.results.read_csv(f, header=True)),
+        [{"A": 3, "B": 1}, {"C": 2.5}, {"A": 1, "B": 2, "C": 0}],
+    )
+
+  def test_odd_cells(self):
+    with self.assertRaises(ValueError):
+      list(pytourney.results.read_csv(io.StringIO('A,3,B\n')))
+
+
+class TestOneShotIterators(unittest.TestCase):
+
+  results = [{"A": 1, "B": 0}, {"A": 3, "C": 2}, {"B": 2, "C": 1}]
+
+  def test_hth_quilici(self):
+    for engine in ("scc", "paths"):
+      self.assertEqual(
+          pytourney.tie.hth_quilici.calculate(
+              iter(self.results), engine=engine
+          ),
+          {"A": 1, "B": 2, "C": 3},
+      )
+
+  def test_hth_sweep(self):
+    self.assertEqual(
+        pytourney.tie.hth_sweep.calculate(iter(self.results)),
+        {"A": 1, "B": 2, "C": 3},
+    )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import itertools
+import unittest
+
+import pytourney
+from pytourney.schedule import roundrobin
+
+
+def breaks(schedule):
+  homes = {name: [] for name in schedule.players}
+  for fixtures in schedule:
+    for fixture in fixtures:
+      home, away = fixture
+      homes[home].append(True)
+      homes[away].append(False)
+  return sum(
+      sum(1 for a, b in zip(seq, seq[1:]) if a == b)
+      for seq in homes.values()
+  )
+
+
+class TestRoundRobin(unittest.TestCase):
+
+  def test_four(self):
+    schedule = roundrobin.RoundRobin("abcd")
+    self.assertEqual(len(schedule), 3)
+    self.assertEqual(list(schedule), [
+        [{"a": None, "d": None}, {"b": None, "c": None}],
+        [{"d": None, "b": None}, {"c": None, "a": None}],
+        [{"c": None, "d": None}, {"a": None, "b": None}],
+    ])
+
+  def test_every_pair_once(self):
+    for n in range(1, 14):
+      players = list(range(n))
+      schedule = roundrobin.RoundRobin(players)
+      self.assertEqual(len(schedule), n - 1 + n % 2 if n else 0)
+      pairs = [frozenset(f) for f in schedule.fixtures()]
+      self.assertEqual(len(pairs), n * (n - 1) // 2)
+      self.assertEqual(set(pairs), {
+          frozenset(pair) for pair in itertools.combinations(players, 2)
+      })
+      for fixtures in schedule:
+        names = [name for fixture in fixtures for name in fixture]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(len(names), n - n % 2)
+
+  def test_breaks(self):
+    for n in (4, 6, 10, 20):
+      self.assertEqual(breaks(roundrobin.RoundRobin(range(n))), n - 2)
+
+  def test_double(self):
+    players = list(range(8))
+    schedule = roundrobin.RoundRobin(players, legs=2)
+    self.assertEqual(len(schedule), 14)
+    homes = {name: 0 for name in players}
+    for k in range(7):
+      self.assertEqual(
+          [list(f)[::-1] for f in schedule[k]],
+          [list(f) for f in schedule[k + 7]],
+      )
+    for home, away in schedule.fixtures():
+      homes[home] += 1
+    self.assertEqual(set(homes.values()), {7})
+
+  def test_random_access(self):
+    schedule = roundrobin.RoundRobin(range(1001), legs=3)
+    for k in (0, 1, 500, 999, 1000, 1999, 2999, -1):
+      fixtures = schedule[k]
+      self.assertEqual(fixtures, schedule[len(schedule) + k if k < 0 else k])
+      for fixture in fixtures:
+        for name in fixture:
+          self.assertEqual(schedule.fixture(k, name), fixture)
+      bye = set(range(1001)) - {n for f in fixtures for n in f}
+      self.assertEqual(len(bye), 1)
+      self.assertIsNone(schedule.fixture(k, bye.pop()))
+    with self.assertRaises(IndexError):
+      schedule[len(schedule)]
+
+  def test_hth(self):
+    results = []
+    for fixture in roundrobin.fixtures("abcde"):
+      home, away = fixture
+      # the earlier seed wins
+      fixture[home], fixture[away] = ((1, 0) if home < away else (0, 1))
+      results.append(fixture)
+    self.assertEqual(
+        pytourney.tie.hth_quilici.calculate(results),
+        {"a": 1, "b": 2, "c": 3, "d": 4, "e": 5},
+    )
+
+  def test_unique(self):
+    with self.assertRaises(ValueError):
+      roundrobin.RoundRobin("aba")
+
+
+if __name__ == '__main__':
+    unittest.main()
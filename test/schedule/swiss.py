@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from pytourney.schedule import swiss
+
+
+def play(pairs, rnd, strength):
+  results = []
+  for white, black in pairs:
+    if black is None:
+      results.append({white: 1})
+      continue
+    x = rnd.random() + (strength[white] - strength[black])
+    if x < 0.35:
+      results.append({white: 0, black: 1})
+    elif x < 0.65:
+      results.append({white: 0.5, black: 0.5})
+    else:
+      results.append({white: 1, black: 0})
+  return results
+
+
+class TestSwiss(unittest.TestCase):
+
+  def test_first_round(self):
+    players = list("abcdefgh")
+    self.assertEqual(
+        swiss.pair(players),
+        [("a", "e"), ("f", "b"), ("c", "g"), ("h", "d")],
+    )
+
+  def test_score_groups(self):
+    S = swiss.Swiss("abcd", [{"a": 1, "c": 0}, {"d": 0.5, "b": 0.5}])
+    self.assertEqual(S.standings(), ["a", "b", "d", "c"])
+    self.assertEqual(S.groups, {1: {"a"}, 0.5: {"b", "d"}, 0: {"c"}})
+    S.add({"a": 0, "b": 1})
+    self.assertEqual(S.groups, {1.5: {"b"}, 1: {"a"}, 0.5: {"d"}, 0: {"c"}})
+    S.withdraw("c")
+    self.assertEqual(S.standings(), ["b", "a", "d"])
+
+  def test_bye(self):
+    S = swiss.Swiss("abcde")
+    pairs = S.pair()
+    self.assertEqual(pairs[-1], ("e", None))
+    S.update(play(pairs, random.Random(0), {n: 0 for n in "abcde"}))
+    self.assertEqual(S.byes, {"e"})
+    self.assertNotEqual(S.pair()[-1], ("e", None))
+
+  def test_preference(self):
+    S = swiss.Swiss("abcd")
+    self.assertEqual(S.preference("a"), 0)
+    S.add({"a": 1, "b": 0})
+    self.assertEqual(S.preference("a"), -2)
+    self.assertEqual(S.preference("b"), 2)
+    S.add({"b": 1, "a": 0})
+    self.assertEqual(S.preference("a"), 1)
+    S.add({"b": 1, "a": 0})
+    self.assertEqual(S.preference("a"), 3)
+    self.assertEqual(S.preference("b"), -3)
+    S.add({"c": 1, "d": 0})
+    S.add({"c": 1, "d": 0})
+    self.assertFalse(S.compatible("a", "d"))  # both must be white
+    self.assertFalse(S.compatible("a", "b"))  # rematch
+    self.assertTrue(S.compatible("a", "c"))
+    self.assertEqual(S.allocate("c", "a"), ("a", "c"))
+
+  def test_multi_entry_result(self):
+    with self.assertRaises(ValueError):
+      swiss.Swiss(results=[{"a": 1, "b": 0, "c": 0}])
+
+  def test_tournament(self):
+    rnd = random.Random(1)
+    players = [f"P{i:03}" for i in range(301)]
+    strength = {name: -i / 600 for i, name in enumerate(players)}
+    S = swiss.Swiss(players)
+    met = set()
+    for _ in range(9):
+      pairs = S.pair()
+      names = [name for pair in pairs for name in pair if name is not None]
+      self.assertEqual(sorted(names), players)
+      self.assertEqual(pairs[-1][1], None)
+      for white, black in pairs[:-1]:
+        self.assertNotIn(frozenset((white, black)), met)
+        met.add(frozenset((white, black)))
+      S.update(play(pairs, rnd, strength))
+      for colours in S.colours.values():
+        self.assertLessEqual(abs(sum(colours)), 2)
+    self.assertEqual(len(S.byes), 9)
+
+  def test_exhausted(self):
+    # five rounds of four players leave no new opponents
+    rnd = random.Random(2)
+    S = swiss.Swiss("abcd")
+    for _ in range(5):
+      pairs = S.pair()
+      self.assertEqual(sorted(n for pair in pairs for n in pair), list("abcd"))
+      S.update(play(pairs, rnd, {n: 0 for n in "abcd"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
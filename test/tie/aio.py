@@ -0,0 +1,135 @@
+import asyncio
+import concurrent.futures
+import random
+import unittest
+
+from helpers import random_results
+import pytourney
+
+
+def league(rnd, count=20):
+  return random_results(rnd, "ABCDEFGH", count)
+
+
+class TestAsyncHTH(unittest.TestCase):
+
+  def setUp(self):
+    self.loop = asyncio.new_event_loop()
+    self.executor = concurrent.futures.ThreadPoolExecutor(2)
+
+  def tearDown(self):
+    self.loop.close()
+    self.executor.shutdown()
+
+  def run_gather(self, *coroutines):
+    async def gather():
+      return await asyncio.gather(*coroutines, return_exceptions=True)
+    return self.loop.run_until_complete(gather())
+
+  def test_calculate(self):
+    rnd = random.Random(2018)
+    aio = pytourney.tie.aio.AsyncHTH(self.executor)
+    cases = [league(rnd) for _ in range(20)]
+    for method in pytourney.tie.cache.METHODS:
+      module = getattr(pytourney.tie, f'hth_{method}')
+      self.assertEqual(
+          self.run_gather(*(aio.calculate(r, method) for r in cases)),
+          [module.calculate(r) for r in cases],
+      )
+
+  def test_coalescing(self):
+    results = league(random.Random(2018))
+    aio = pytourney.tie.aio.AsyncHTH(self.executor)
+    hths = self.run_gather(
+        *(aio.calculate(results) for _ in range(5)),
+        *(aio.calculate(reversed(results)) for _ in range(5)),
+    )
+    expected = pytourney.tie.hth_quilici.calculate(results)
+    self.assertEqual(hths, [expected] * 10)
+    self.assertIsNot(hths[0], hths[1])
+    self.assertEqual(
+        aio.stats(),
+        {"requests": 10, "coalesced": 9, "batches": 1, "pending": 0},
+    )
+
+  def test_players(self):
+    index = pytourney.match.MatchIndex(league(random.Random(2018)))
+    aio = pytourney.tie.aio.AsyncHTH(self.executor)
+    hths = self.run_gather(
+        aio.calculate(index, players=["A", "B", "C"]),
+        aio.calculate(index, players=("C", "B", "A")),
+    )
+    expected = pytourney.tie.hth_quilici.calculate(
+        index, players=["A", "B", "C"]
+    )
+    self.assertEqual(hths, [expected] * 2)
+    self.assertEqual(aio.coalesced, 1)
+
+  def test_large_requests(self):
+    results = league(random.Random(2018), count=40)
+    aio = pytourney.tie.aio.AsyncHTH(self.executor, small=10)
+    hths = self.run_gather(
+        aio.calculate(results),
+        aio.calculate(results),  # the same object
+        aio.calculate(list(results)),  # equal but not the same
+        aio.calculate(iter(results)),  # no len()
+    )
+    self.assertEqual(
+        hths, [pytourney.tie.hth_quilici.calculate(results)] * 4
+    )
+    self.assertEqual(
+        aio.stats(),
+        {"requests": 4, "coalesced": 1, "batches": 3, "pending": 0},
+    )
+
+  def test_batching(self):
+    rnd = random.Random(2018)
+    aio = pytourney.tie.aio.AsyncHTH(self.executor, batch_size=8, small=30)
+    cases = [league(rnd) for _ in range(20)]
+    cases.append(league(rnd, count=40))  # not small
+    self.run_gather(*(aio.calculate(r) for r in cases))
+    self.assertEqual(aio.stats()["batches"], 1 + 3)
+
+  def test_errors(self):
+    aio = pytourney.tie.aio.AsyncHTH(self.executor)
+    results = [{"A": 1, "B": 0}]
+    good, bad = self.run_gather(
+        aio.calculate(results),
+        aio.calculate(results, engine="coin"),
+    )
+    self.assertEqual(good, {"A": 1, "B": 2})
+    self.assertIsInstance(bad, ValueError)
+    with self.assertRaises(ValueError):
+      self.loop.run_until_complete(aio.calculate(results, method="coin"))
+
+  def test_cancelled_executor_future(self):
+
+    class CancellingExecutor(concurrent.futures.Executor):
+
+      def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        future.cancel()
+        return future
+
+    results = league(random.Random(2018))
+    aio = pytourney.tie.aio.AsyncHTH(CancellingExecutor())
+    answers = self.run_gather(*(
+        asyncio.wait_for(aio.calculate(results), 5) for _ in range(3)
+    ))
+    self.assertEqual(len(answers), 3)
+    for answer in answers:
+      self.assertIsInstance(answer, asyncio.CancelledError)
+    self.assertEqual(aio.stats()["pending"], 0)
+
+  def test_module_calculate(self):
+    results = [{"A": 1, "B": 0}, {"B": 1, "C": 0}]
+    self.assertEqual(
+        self.loop.run_until_complete(
+            pytourney.tie.aio.calculate(results, "sweep")
+        ),
+        pytourney.tie.hth_sweep.calculate(results),
+    )
+
+
+if __name__ == '__main__':
+    unittest.main()
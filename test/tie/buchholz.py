@@ -0,0 +1,95 @@
+import random
+import sys
+import unittest
+import unittest.mock
+
+import pytourney
+from pytourney.match import MatchTable, Registry
+
+
+RESULTS = [
+    {"A": 1, "B": 0},
+    {"C": 0.5, "D": 0.5},
+    {"A": 1, "C": 0},
+    {"D": 1, "B": 0},
+    {"D": 0.5, "A": 0.5},
+    {"B": 1, "C": 0},
+]
+
+SCORES = {
+    #     points  buchholz  cut1  median  SB    progressive
+    "A": (2.5,    3.5,      3.0,  1.0,    2.5,  5.5),
+    "B": (1.0,    5.0,      4.5,  2.0,    0.5,  1.0),
+    "C": (0.5,    5.5,      4.5,  2.0,    1.0,  1.5),
+    "D": (2.0,    4.0,      3.5,  1.0,    2.5,  4.0),
+}
+
+
+def random_event(rnd, players, rounds):
+  results = []
+  for _ in range(rounds):
+    names = list(range(players))
+    rnd.shuffle(names)
+    if players % 2:
+      results.append({names.pop(): 1})
+    for k in range(0, len(names), 2):
+      score = rnd.choice([(1, 0), (0.5, 0.5), (0, 1)])
+      results.append(dict(zip(names[k:k + 2], score)))
+  return results
+
+
+class TestBuchholz(unittest.TestCase):
+
+  def test_scores(self):
+    scores = pytourney.tie.buchholz.calculate(RESULTS)
+    self.assertEqual({name: tuple(s) for name, s in scores.items()}, SCORES)
+    self.assertEqual(scores["A"].sonneborn_berger, 2.5)
+
+  def test_bye(self):
+    scores = pytourney.tie.buchholz.calculate(
+        [{"A": 1, "B": 0}, {"C": 1}, {"C": 0, "A": 1}, {"B": 1}]
+    )
+    self.assertEqual(tuple(scores["C"]), (1, 2, 0, 0, 0, 2))
+    self.assertEqual(tuple(scores["B"]), (1, 2, 0, 0, 0, 1))
+
+  def test_points(self):
+    scores = pytourney.tie.buchholz.calculate(
+        RESULTS[:2], points=(3, 1, 0), bye_points=3
+    )
+    self.assertEqual(scores["A"].points, 3)
+    self.assertEqual(scores["C"].sonneborn_berger, 1)
+
+  def test_order(self):
+    scores = pytourney.tie.buchholz.calculate(RESULTS)
+    order = pytourney.tie.buchholz.order
+    self.assertEqual(order(scores), ["A", "D", "B", "C"])
+    self.assertEqual(order(scores, ["buchholz", "points"]), list("CBDA"))
+    with self.assertRaises(ValueError):
+      order(scores, ["rating"])
+
+  def test_heat(self):
+    with self.assertRaises(ValueError):
+      pytourney.tie.buchholz.calculate([{"A": 1, "B": 0, "C": 0}])
+    with self.assertRaises(ValueError):
+      pytourney.tie.buchholz.calculate(MatchTable([{"A": 1, "B": 0, "C": 0}]))
+
+  def test_match_table(self):
+    results = random_event(random.Random(2019), 301, 9)
+    expected = pytourney.tie.buchholz.calculate(results)
+    registry = Registry(["X", "Y"])  # shared with absent players
+    table = MatchTable(results, registry=registry)
+    self.assertEqual(pytourney.tie.buchholz.calculate(table), expected)
+
+  def test_without_numpy(self):
+    results = random_event(random.Random(2020), 51, 7)
+    expected = pytourney.tie.buchholz.calculate(results)
+    with unittest.mock.patch.dict(sys.modules, {"numpy": None}):
+      scores = pytourney.tie.buchholz.calculate(results)
+    self.assertEqual(list(scores), list(expected))
+    for name in expected:
+      for a, b in zip(scores[name], expected[name]):
+        self.assertAlmostEqual(a, b)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+import pytourney
+from pytourney.tie.cache import HTHCache, fingerprint
+
+
+class TestFingerprint(unittest.TestCase):
+
+  def test_order_insensitive(self):
+    self.assertEqual(
+        fingerprint([{"A": 1, "B": 0}, {"C": 2, "B": 2}]),
+        fingerprint([{"B": 2, "C": 2}, {"B": 0, "A": 1}]),
+    )
+
+  def test_multiplicity(self):
+    self.assertNotEqual(
+        fingerprint([{"A": 1, "B": 0}]),
+        fingerprint([{"A": 1, "B": 0}, {"A": 1, "B": 0}]),
+    )
+
+  def test_scores(self):
+    self.assertNotEqual(
+        fingerprint([{"A": 1, "B": 0}]),
+        fingerprint([{"A": 0, "B": 1}]),
+    )
+
+
+class TestHTHCache(unittest.TestCase):
+
+  results = [{"A": 1, "B": 0}, {"A": 3, "C": 2}, {"B": 2, "C": 2}]
+
+  def test_hits_and_misses(self):
+    cache = HTHCache()
+    hth = cache.calculate(self.results)
+    self.assertEqual(hth, {"A": 1, "B": 2, "C": 2})
+    self.assertEqual(cache.calculate(reversed(self.results)), hth)
+    self.assertEqual(
+        cache.calculate(self.results, method="sweep"),
+        pytourney.tie.hth_sweep.calculate(self.results),
+    )
+    self.assertEqual(
+        cache.stats(),
+        {"hits": 1, "misses": 2, "size": 2, "maxsize": 128},
+    )
+
+  def test_returned_dictionary_is_a_copy(self):
+    cache = HTHCache()
+    cache.calculate(self.results)["A"] = 99
+    self.assertEqual(cache.calculate(self.results)["A"], 1)
+
+  def test_lru_eviction(self):
+    cache = HTHCache(maxsize=2)
+    r1, r2, r3 = [{"A": 1}], [{"B": 1}], [{"C": 1}]
+    cache.calculate(r1)
+    cache.calculate(r2)
+    cache.calculate(r1)  # r2 becomes the least recently used
+    cache.calculate(r3)
+    self.assertEqual(len(cache), 2)
+    cache.calculate(r1)
+    self.assertEqual(cache.hits, 2)
+    cache.calculate(r2)
+    self.assertEqual(cache.misses, 4)
+
+  def test_players(self):
+    cache = HTHCache()
+    index = pytourney.match.MatchIndex(self.results + [{"D": 1, "A": 0}])
+    expected = pytourney.tie.hth_quilici.calculate(
+        index, players=["A", "B", "C"]
+    )
+    self.assertEqual(expected, {"A": 1, "B": 2, "C": 2})
+    self.assertEqual(
+        cache.calculate(index, players=["A", "B", "C"]), expected
+    )
+    self.assertEqual(
+        cache.calculate(index, players=["C", "B", "A"]), expected
+    )
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(
+        cache.calculate(index, method="sweep", players=["A", "B"]),
+        pytourney.tie.hth_sweep.calculate(self.results[:1]),
+    )
+    index.append({"C": 1, "A": 0})
+    self.assertEqual(
+        cache.calculate(index, players=["A", "B", "C"]),
+        {"A": 1, "B": 1, "C": 1},  # a cycle now
+    )
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.invalidate(index), 3)
+
+  def test_dominance(self):
+    cache = HTHCache()
+    D = pytourney.tie.dominance.Dominance(self.results)
+    expected = pytourney.tie.hth_quilici.calculate(self.results)
+    self.assertEqual(cache.calculate(D), expected)
+    self.assertEqual(
+        cache.calculate(pytourney.tie.dominance.Dominance(self.results)),
+        expected,
+    )
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(
+        cache.calculate(D, players=["B", "C"]),
+        pytourney.tie.hth_quilici.calculate(self.results[2:]),
+    )
+
+  def test_players_requires_an_index(self):
+    with self.assertRaises(TypeError):
+      HTHCache().calculate(self.results, players=["A", "B"])
+
+  def test_invalidate(self):
+    cache = HTHCache()
+    cache.calculate(self.results)
+    cache.calculate(self.results, method="sweep")
+    cache.calculate([{"D": 0}])
+    self.assertEqual(cache.invalidate(self.results), 2)
+    self.assertEqual(len(cache), 1)
+    self.assertEqual(cache.invalidate(), 1)
+    self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import random
+import unittest
+
+from helpers import random_results
+import pytourney
+
+
+def naive_groups(results, players):
+  # points, goal difference and goals scored of the mini-league of
+  # the players, then the same again for every remaining sub-tie
+  results = [
+      {k: v for k, v in result.items() if k in players}
+      for result in results
+  ]
+  results = [result for result in results if 2 <= len(result)]
+  for key in ("points", "goal_difference", "goals_for"):
+    values = dict.fromkeys(players, 0)
+    for result in results:
+      (p1, v1), (p2, v2) = result.items()
+      if key == "points":
+        values[p1] += 3 * (v2 < v1) + (v1 == v2)
+        values[p2] += 3 * (v1 < v2) + (v1 == v2)
+      elif key == "goal_difference":
+        values[p1] += v1 - v2
+        values[p2] += v2 - v1
+      else:
+        values[p1] += v1
+        values[p2] += v2
+    levels = sorted(set(values.values()), reverse=True)
+    if 1 < len(levels):
+      groups = []
+      for level in levels:
+        subgroup = {p for p in players if values[p] == level}
+        if len(subgroup) == 1:
+          groups.append(subgroup)
+        else:
+          groups.extend(naive_groups(results, subgroup))
+      return groups
+  return [set(players)]
+
+
+def naive_hth(results, players):
+  if len(players) == 1:
+    return {p: -1 for p in players}
+  groups = naive_groups(results, players)
+  if len(groups) == 1:
+    return {p: 0 for p in players}
+  return {p: value for value, group in enumerate(groups, 1) for p in group}
+
+
+class TestChain(unittest.TestCase):
+
+  def test_mini_league(self):
+    # everyone has 3 points; B has the best goal difference while
+    # A and C are level, so their own match decides
+    results = [
+        {"A": 1, "B": 0},
+        {"B": 3, "C": 0},
+        {"C": 2, "A": 0},
+    ]
+    self.assertEqual(
+        pytourney.tie.chain.calculate(results),
+        {"B": 1, "C": 2, "A": 3},
+    )
+
+  def test_sub_tie_restarts_the_chain(self):
+    results = [
+        {"A": 3, "B": 0},
+        {"B": 1, "C": 0},
+        {"C": 2, "A": 0},
+        {"A": 1, "D": 0},
+        {"B": 1, "D": 0},
+        {"C": 1, "D": 0},
+    ]
+    # A, B and C have 6 points, D has 0; among A, B and C everyone
+    # has 3 points, A and C have the best goal difference and A
+    # scored more goals, but the chain restarts for A and C and C
+    # has more points in their own match
+    self.assertEqual(
+        pytourney.tie.chain.calculate(results),
+        {"C": 1, "A": 2, "B": 3, "D": 4},
+    )
+
+  def test_unbroken(self):
+    self.assertEqual(
+        pytourney.tie.chain.calculate([{"A": 1, "B": 1}]),
+        {"A": 0, "B": 0},
+    )
+    self.assertEqual(pytourney.tie.chain.calculate([{"A": 0}]), {"A": -1})
+    self.assertEqual(pytourney.tie.chain.calculate([]), {})
+
+  def test_random(self):
+    rnd = random.Random(2018)
+    players = "ABCDEFG"
+    for _ in range(300):
+      results = random_results(
+          rnd, players, rnd.randint(1, 25), scores=range(4)
+      )
+      names = {name for result in results for name in result}
+      self.assertEqual(
+          pytourney.tie.chain.calculate(results),
+          naive_hth(results, names),
+      )
+
+  def test_players(self):
+    rnd = random.Random(2019)
+    players = "ABCDEFGHIJ"
+    for _ in range(100):
+      results = random_results(rnd, players, 40, scores=range(4))
+      chain = pytourney.tie.chain.Chain(results)
+      for _ in range(5):
+        group = set(rnd.sample(players, rnd.randint(1, 6)))
+        self.assertEqual(chain.hth(group), naive_hth(results, group))
+
+  def test_unknown_players(self):
+    chain = pytourney.tie.chain.Chain([{"A": 1, "B": 0}])
+    self.assertEqual(chain.hth(["A", "Z"]), {"A": -1, "Z": None})
+    self.assertEqual(chain.hth(), {"A": 1, "B": 2})
+    self.assertEqual(chain.aggregates.names, ["A", "B"])
+
+  def test_criteria(self):
+    results = [{"A": 3, "B": 0}, {"B": 2, "A": 0}, {"A": 1, "B": 0}]
+    self.assertEqual(
+        pytourney.tie.chain.calculate(results, criteria=["wins"]),
+        {"A": 1, "B": 2},
+    )
+    self.assertEqual(
+        pytourney.tie.chain.calculate(
+            results, criteria=[lambda aggregates, ids: {i: -i for i in ids}]
+        ),
+        {"A": 1, "B": 2},
+    )
+    for method in ("quilici", "sweep"):
+      self.assertEqual(
+          pytourney.tie.chain.calculate(results, criteria=[method]),
+          {"A": 1, "B": 2},
+      )
+    with self.assertRaises(ValueError):
+      pytourney.tie.chain.Chain(results, criteria=["coin"])
+
+  def test_sub_tie_cache(self):
+    results = [
+        {"A": 1, "B": 1},
+        {"C": 1, "D": 1},
+        {"A": 1, "C": 0},
+        {"A": 1, "D": 0},
+        {"B": 1, "C": 0},
+        {"B": 1, "D": 0},
+    ]
+    calls = []
+
+    def criterion(aggregates, ids):
+      calls.append(ids)
+      return {i: 0 for i in ids}
+
+    chain = pytourney.tie.chain.Chain(results, criteria=["points", criterion])
+    self.assertEqual(chain.hth(), {"A": 1, "B": 1, "C": 2, "D": 2})
+    self.assertEqual(len(calls), 2)  # one for each sub-tie
+    chain.hth("ABCD")
+    chain.hth("AB")
+    self.assertEqual(len(calls), 2)
+    chain.add({"A": 2, "B": 0})
+    self.assertEqual(chain.hth(), {"A": 1, "B": 2, "C": 3, "D": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from helpers import random_results
+import pytourney
+from pytourney.tie.dominance import Dominance
+
+
+class TestDominance(unittest.TestCase):
+
+  def test_interning(self):
+    D = Dominance([{"A": 1, "B": 0}, {"C": 2}, {"B": 1, "C": 1}])
+    self.assertEqual(D.names, ["A", "B", "C"])
+    self.assertEqual(D.index, {"A": 0, "B": 1, "C": 2})
+    self.assertEqual(D.successors(), [[1], [2], [1]])
+
+  def test_net_wins(self):
+    D = Dominance([
+        {"A": 1, "B": 0},
+        {"A": 1, "B": 0},
+        {"B": 1, "A": 0},
+        {"B": 2, "A": 2},
+    ])
+    self.assertEqual(list(D.net), [1])
+    self.assertEqual(D.successors(), [[1], []])
+
+  def test_subset(self):
+    D = Dominance([
+        {"A": 1, "B": 0},
+        {"C": 1, "A": 1},
+        {"B": 0, "C": 2},
+        {"D": 0},
+    ])
+    S = D.subset(["C", "B", "D", "X"])
+    self.assertEqual(S.names, ["B", "C", "D"])
+    self.assertEqual(S.successors(), [[], [0], []])
+
+  def test_random_results_match_simplified_hth_graph(self):
+    rnd = random.Random(2018)
+    for _ in range(200):
+      players = "ABCDEFGH"[:rnd.randint(1, 8)]
+      results = random_results(
+          rnd, players, rnd.randint(1, 20), sizes=(1, 2, 2, 2, 3)
+      )
+      H = pytourney.tie.hth_quilici.simplified_hth_graph(
+          pytourney.tie.hth_quilici.hth_graph(results)
+      )
+      D = Dominance(results).to_networkx()
+      self.assertEqual(set(H.nodes), set(D.nodes), results)
+      self.assertEqual(
+          {e[:2] for e in H.edges}, set(D.edges), results
+      )
+
+
+if __name__ == '__main__':
+    unittest.main()
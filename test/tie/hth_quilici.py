@@ -1,5 +1,7 @@
+import random
 import unittest
 
+from helpers import random_results
 import pytourney
 
 class TestQuiliciHTHQuilici(unittest.TestCase):
@@ -302,6 +304,19 @@ for _n, _d in TestQuiliciHTHQuilici.test_cases.items():
   )
 del _n, _d, _test_method
 
+for _n, _d in TestQuiliciHTHQuilici.test_cases.items():
+  _test_method = lambda self, _d=_d: self.assertEqual(
+      pytourney.tie.hth_quilici.calculate(_d["results"], engine="paths"),
+      _d["hth"],
+  )
+  _test_method.__name__ = f'test_quilici_paths_{_n:0>2}'
+  setattr(
+      TestQuiliciHTHQuilici,
+      _test_method.__name__,
+      _test_method,
+  )
+del _n, _d, _test_method
+
 
 class TestQuiliciHTHSzieberthAdam(unittest.TestCase):
   test_cases = {
@@ -338,6 +353,16 @@ class TestQuiliciHTHSzieberthAdam(unittest.TestCase):
         ],
         "hth": {"A": 1, "B": 1, "C": 1},
       },
+      5: {
+        "results": [
+            {"A": 1, "B": 0},
+            {"A": 1, "B": 0},
+            {"A": 1, "B": 0},
+            {"A": 0, "B": 1},
+            {"A": 0, "B": 1},
+        ],
+        "hth": {"A": 1, "B": 2},
+      },
   }
 
 for _n, _d in TestQuiliciHTHSzieberthAdam.test_cases.items():
@@ -355,5 +380,102 @@ del _n, _d, _test_method
 
 
 
+class TestHTHQuiliciEngines(unittest.TestCase):
+
+  def test_random_results(self):
+    rnd = random.Random(2018)
+    for _ in range(300):
+      players = "ABCDEFGHIJ"[:rnd.randint(2, 10)]
+      results = random_results(
+          rnd, players, rnd.randint(1, 15), sizes=(1, 2, 2, 2, 3)
+      )
+      self.assertEqual(
+          pytourney.tie.hth_quilici.calculate(results, engine="scc"),
+          pytourney.tie.hth_quilici.calculate(results, engine="paths"),
+          results,
+      )
+
+
+class TestHTHQuiliciRankChains(unittest.TestCase):
+
+  def test_rank_chain(self):
+    self.assertEqual(
+        pytourney.tie.hth_quilici.rank_chain(
+            {"A": 1, "B": 3, "C": 1, "D": 2}
+        ),
+        [["B"], ["D"], ["A", "C"]],
+    )
+
+  def test_shared_pairs(self):
+    # A and B meet in both heats and in a match, so only their
+    # pairs get expanded and the rest stays chained
+    results = [
+        {"A": 3, "B": 2, "C": 1, "D": 0},
+        {"B": 3, "A": 2, "E": 1, "F": 0},
+        {"B": 1, "A": 0},
+    ]
+    C = pytourney.tie.hth_quilici.RankChains(results)
+    names = C.dominance.names
+    self.assertEqual(
+        [[[names[i] for i in block] for block in chain]
+            for chain in C.chains],
+        [[["C"], ["D"]], [["E"], ["F"]]],
+    )
+    self.assertEqual(
+        pytourney.tie.hth_quilici.calculate(results, chains=True),
+        pytourney.tie.hth_quilici.calculate(results),
+    )
+
+  def test_quilici_cases(self):
+    for d in TestQuiliciHTHQuilici.test_cases.values():
+      self.assertEqual(
+          pytourney.tie.hth_quilici.calculate(d["results"], chains=True),
+          d["hth"],
+      )
+
+  def test_random_results(self):
+    rnd = random.Random(2018)
+    for _ in range(300):
+      players = "ABCDEFGHIJKLMNOPQRST"[:rnd.randint(2, 20)]
+      results = random_results(
+          rnd, players, rnd.randint(1, 10), sizes=(1, 2, 2, 3, 5, 8),
+          scores=range(4),
+      )
+      self.assertEqual(
+          pytourney.tie.hth_quilici.calculate(results, chains=True),
+          pytourney.tie.hth_quilici.calculate(results),
+          results,
+      )
+
+  def test_paths_engine(self):
+    with self.assertRaises(ValueError):
+      pytourney.tie.hth_quilici.calculate([], engine="paths", chains=True)
+
+
+class TestIncrementalHTH(unittest.TestCase):
+
+  def test_quilici_cases(self):
+    for d in TestQuiliciHTHQuilici.test_cases.values():
+      I = pytourney.tie.hth_quilici.IncrementalHTH()
+      I.update(d["results"])
+      self.assertEqual(I.hth(), d["hth"])
+
+  def test_random_results(self):
+    rnd = random.Random(2018)
+    for _ in range(100):
+      players = "ABCDEFGHIJ"[:rnd.randint(2, 10)]
+      results = random_results(
+          rnd, players, rnd.randint(1, 30), sizes=(1, 2, 2, 2, 2, 3)
+      )
+      I = pytourney.tie.hth_quilici.IncrementalHTH()
+      for k, result in enumerate(results, 1):
+        I.add_result(result)
+        self.assertEqual(
+            I.hth(),
+            pytourney.tie.hth_quilici.calculate(results[:k]),
+            results,
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,10 @@
+import itertools
+import random
+import sys
 import unittest
+import unittest.mock
 
+from helpers import random_results
 import pytourney
 
 class TestQuiliciHTHSweep(unittest.TestCase):
@@ -354,6 +359,85 @@ for _n, _d in TestSzieberthAdamHTHSweep.test_cases.items():
 del _n, _d, _test_method
 
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestHTHSweepMany(unittest.TestCase):
+
+  def test_test_cases(self):
+    cases = [
+        *TestQuiliciHTHSweep.test_cases.values(),
+        *TestSzieberthAdamHTHSweep.test_cases.values(),
+    ]
+    self.assertEqual(
+        pytourney.tie.hth_sweep.hth_many(d["results"] for d in cases),
+        [d["hth"] for d in cases],
+    )
+
+  def test_random_groups(self):
+    rnd = random.Random(2018)
+    groups = [[]]
+    for _ in range(500):
+      players = "ABCDEF"[:rnd.randint(1, 6)]
+      groups.append(random_results(
+          rnd, players, rnd.randint(1, 12), sizes=(1, 2, 2, 4)
+      ))
+    self.assertEqual(
+        pytourney.tie.hth_sweep.hth_many(groups),
+        [pytourney.tie.hth_sweep.hth(results) for results in groups],
+    )
+
+
+def random_heats(rnd, count):
+  for _ in range(count):
+    players = "ABCDEFGH"[:rnd.randint(1, 8)]
+    yield random_results(
+        rnd, players, rnd.randint(1, 10), sizes=(1, 2, 3, 5, 8),
+        scores=range(4),
+    )
+
+
+def pairwise(results):
+  return [
+      dict(pair)
+      for result in results
+      for pair in itertools.combinations(result.items(), 2)
+  ] + [{name: 0} for result in results for name in result]
+
+
+class TestHTHSweepHeats(unittest.TestCase):
+
+  def test_race(self):
+    results = [
+        {"A": 10, "B": 8, "C": 6, "D": 4},
+        {"A": 9, "C": 7, "B": 5, "D": 5},
+    ]
+    self.assertEqual(
+        pytourney.tie.hth_sweep.calculate(results),
+        {"A": 1, "B": 2, "C": 2, "D": 3},
+    )
+
+  def test_pairwise(self):
+    for results in random_heats(random.Random(2018), 300):
+      self.assertEqual(
+          pytourney.tie.hth_sweep.calculate(results),
+          pytourney.tie.hth_sweep.calculate(pairwise(results)),
+      )
+
+  def test_without_numpy(self):
+    cases = list(random_heats(random.Random(2019), 50))
+    expected = [pytourney.tie.hth_sweep.calculate(r) for r in cases]
+    with unittest.mock.patch.dict(sys.modules, {"numpy": None}):
+      self.assertEqual(
+          [pytourney.tie.hth_sweep.calculate(r) for r in cases],
+          expected,
+      )
+
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,170 @@
+import itertools
+import random
+import unittest
+
+import pytourney
+
+
+TEAMS = {
+    f"{division}{k}": (conference, division)
+    for conference, divisions in (("AFC", "ABE"), ("NFC", "CDF"))
+    for division in divisions
+    for k in range(1, 5)
+}
+
+
+def game(winner, loser):
+  return {winner: 20, loser: 10}
+
+
+def random_season(rnd):
+  # every team plays its division twice and four others of its
+  # conference once
+  results = []
+  for conference in ("AFC", "NFC"):
+    names = [name for name, (c, _) in TEAMS.items() if c == conference]
+    for name1, name2 in itertools.combinations(names, 2):
+      if TEAMS[name1] == TEAMS[name2]:
+        games = 2
+      else:
+        games = int(rnd.random() < 0.5)
+      for _ in range(games):
+        results.append({name1: rnd.randrange(5), name2: rnd.randrange(5)})
+  return results
+
+
+class TestNFL(unittest.TestCase):
+
+  def test_division_head_to_head(self):
+    season = pytourney.tie.nfl.Season(TEAMS, [
+        game("A1", "A2"),
+        game("A3", "A1"),
+        game("A2", "A4"),
+    ])
+    self.assertEqual(season.record("A1"), (1, 1, 0))
+    self.assertEqual(
+        season.division_ranking("AFC", "A"), ["A3", "A1", "A2", "A4"]
+    )
+
+  def test_division_common_games(self):
+    results = [
+        # the three are 1-1 in the division and 3-2 overall
+        game("A1", "A2"),
+        game("A2", "A3"),
+        game("A3", "A1"),
+        # common opponents B1 and B2: A1 is 2-0, the others 1-1
+        game("A1", "B1"),
+        game("A1", "B2"),
+        game("A2", "B1"),
+        game("B2", "A2"),
+        game("B1", "A3"),
+        game("A3", "B2"),
+        # games against other opponents
+        game("E3", "A1"),
+        game("A2", "E1"),
+        game("A3", "E2"),
+    ]
+    season = pytourney.tie.nfl.Season(TEAMS, results)
+    self.assertEqual(
+        {season.record(name) for name in ("A1", "A2", "A3")}, {(3, 2, 0)}
+    )
+    # A1 wins on common games, then A2 beats A3 head-to-head
+    self.assertEqual(season.rank(["A3", "A2", "A1"]), ["A1", "A2", "A3"])
+    self.assertEqual(
+        pytourney.tie.nfl.calculate(results, TEAMS, ["A1", "A2", "A3"]),
+        {"A1": 1, "A2": 2, "A3": 3},
+    )
+
+  def test_wild_card_sweep(self):
+    results = [
+        game("A1", "B1"),
+        game("A1", "E1"),
+        game("A2", "A1"),
+        game("A3", "A1"),
+        game("B1", "E1"),
+        game("B1", "B2"),
+        game("B3", "B1"),
+        game("E1", "E2"),
+        game("E1", "E3"),
+    ]
+    season = pytourney.tie.nfl.Season(TEAMS, results)
+    self.assertEqual(
+        season.rank(["E1", "B1", "A1"], "wild_card"), ["A1", "B1", "E1"]
+    )
+
+  def test_wild_card_same_division(self):
+    # all three are 1-1 and none sweeps, but only A2 proceeds from
+    # its division as it beat A1; then B1 beats A2 head-to-head
+    results = [
+        game("A2", "A1"),
+        game("A1", "B1"),
+        game("B1", "A2"),
+    ]
+    season = pytourney.tie.nfl.Season(TEAMS, results)
+    self.assertEqual(
+        season.rank(["A1", "A2", "B1"], "wild_card"), ["B1", "A2", "A1"]
+    )
+
+  def test_strength_of_victory(self):
+    # B1 and E1 are 1-1 in different divisions and never met;
+    # they have no common games and B1 beat the better team
+    results = [
+        game("B1", "A1"),
+        game("A1", "A2"),
+        game("E1", "A3"),
+        game("A4", "B1"),
+        game("A4", "E1"),
+    ]
+    season = pytourney.tie.nfl.Season(TEAMS, results)
+    tables = season.tables()
+    i, j = season.index["B1"], season.index["E1"]
+    self.assertEqual(tables["victory"][i], 0.5)
+    self.assertEqual(tables["victory"][j], 0.0)
+    self.assertEqual(season.rank(["E1", "B1"], "wild_card"), ["B1", "E1"])
+
+  def test_coin_toss(self):
+    calls = []
+
+    def coin(names):
+      calls.append(names)
+      return names[-1]
+
+    season = pytourney.tie.nfl.Season(TEAMS, coin=coin)
+    self.assertEqual(season.rank(["C1", "C2"]), ["C2", "C1"])
+    self.assertEqual(calls, [["C1", "C2"]])
+
+  def test_cache_follows_results(self):
+    season = pytourney.tie.nfl.Season(TEAMS)
+    self.assertEqual(season.division_ranking("NFC", "C")[0], "C1")
+    season.add(game("C4", "C1"))
+    self.assertEqual(season.division_ranking("NFC", "C")[0], "C4")
+
+  def test_seeds(self):
+    rnd = random.Random(2019)
+    for _ in range(20):
+      season = pytourney.tie.nfl.Season(TEAMS, random_season(rnd))
+      for conference, divisions in (("AFC", "ABE"), ("NFC", "CDF")):
+        seeds = season.seeds(conference, wild_cards=2)
+        self.assertEqual(len(seeds), 5)
+        winners = {
+            season.division_ranking(conference, d)[0] for d in divisions
+        }
+        self.assertEqual(set(seeds[:3]), winners)
+        pct = season.tables()["pct"]
+        values = [pct[season.index[name]] for name in seeds[:3]]
+        self.assertEqual(values, sorted(values, reverse=True))
+        others = [
+            name for name, (c, _) in TEAMS.items()
+            if c == conference and name not in winners
+        ]
+        ranked = season.rank(others, "wild_card")
+        self.assertEqual(seeds[3:], ranked[:2])
+        self.assertEqual(sorted(ranked), sorted(others))
+
+  def test_unknown_procedure(self):
+    with self.assertRaises(ValueError):
+      pytourney.tie.nfl.Season(TEAMS).rank(["A1"], "conference")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from helpers import random_results
+import pytourney
+
+
+def leagues(n, seed=2018):
+  rnd = random.Random(seed)
+  for league_id in range(n):
+    players = "ABCDEFGH"[:rnd.randint(1, 8)]
+    results = random_results(
+        rnd, players, rnd.randint(0, 20), sizes=(1, 2, 2),
+        scores=(0, 0.5, 1, 1.5),
+    )
+    yield league_id, results
+
+
+class TestEncoding(unittest.TestCase):
+
+  def test_roundtrip(self):
+    results = [{"A": 3.5, "B": 1}, {"C": 7}, {"A": 2, "B": 2, "D": -1}]
+    encoded = pytourney.tie.parallel.encode(results)
+    self.assertEqual(encoded[0], ("A", "B", "C", "D"))
+    self.assertEqual(
+        list(pytourney.tie.parallel.decode(encoded)),
+        [{"A": 1, "B": 0}, {"C": 0}, {"A": 1, "B": 1, "D": 0}],
+    )
+
+
+class TestCalculateMany(unittest.TestCase):
+
+  def test_matches_calculate(self):
+    for method in pytourney.tie.parallel.METHODS:
+      module = getattr(pytourney.tie, f'hth_{method}')
+      expected = {
+          league_id: module.calculate(results)
+          for league_id, results in leagues(60)
+      }
+      got = dict(pytourney.tie.parallel.calculate_many(
+          leagues(60), method=method, processes=2, chunksize=7,
+      ))
+      self.assertEqual(got, expected)
+
+  def test_encode_min(self):
+    expected = {
+        league_id: pytourney.tie.hth_quilici.calculate(results)
+        for league_id, results in leagues(30)
+    }
+    for encode_min in (None, 0, 10):
+      jobs = (
+          (league_id, iter(results)) for league_id, results in leagues(30)
+      )
+      got = dict(pytourney.tie.parallel.calculate_many(
+          jobs, processes=2, encode_min=encode_min,
+      ))
+      self.assertEqual(got, expected)
+
+  def test_prepare(self):
+    prepare = pytourney.tie.parallel._prepare
+    results = [{"A": 1, "B": 0}, {"A": 2, "C": 2}]
+    self.assertIs(prepare(results, None), results)
+    self.assertIs(prepare(results, 3), results)
+    self.assertIsInstance(
+        prepare(iter(results), 2), pytourney.tie.parallel.Encoded
+    )
+    self.assertEqual(prepare(iter(results), 3), results)
+    D = pytourney.tie.dominance.Dominance(results)
+    self.assertIs(prepare((D,), 0)[0], D)
+
+  def test_paths(self):
+    with tempfile.TemporaryDirectory() as d:
+      jobs = []
+      expected = {}
+      for league_id, results in leagues(10):
+        path = os.path.join(d, f'{league_id}.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+          f.writelines(json.dumps(result) + '\n' for result in results)
+        jobs.append((league_id, path))
+        expected[league_id] = pytourney.tie.hth_quilici.calculate(results)
+      got = dict(pytourney.tie.parallel.calculate_many(jobs, processes=2))
+      self.assertEqual(got, expected)
+
+  def test_encoded(self):
+    jobs = [
+        (league_id, pytourney.tie.parallel.encode(results))
+        for league_id, results in leagues(20)
+    ]
+    expected = {
+        league_id: pytourney.tie.hth_quilici.calculate(results)
+        for league_id, results in leagues(20)
+    }
+    got = dict(pytourney.tie.parallel.calculate_many(jobs, processes=2))
+    self.assertEqual(got, expected)
+
+  def test_dominance(self):
+    for _, results in leagues(30):
+      D = pytourney.tie.parallel.dominance(
+          pytourney.tie.parallel.encode(results)
+      )
+      self.assertEqual(
+          D.successors(),
+          pytourney.tie.dominance.Dominance(results).successors(),
+      )
+
+  def test_unknown_method(self):
+    with self.assertRaises(ValueError):
+      list(pytourney.tie.parallel.calculate_many([], method="coin"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+
+import networkx as nx
+
+import pytourney
+from pytourney.tie.reachability import Reachability
+
+
+class TestReachability(unittest.TestCase):
+
+  def test_self_is_not_reachable(self):
+    R = Reachability({"A": {"B"}, "B": {"A"}, "C": set()})
+    self.assertFalse(R.from1to2("A", "A"))
+    self.assertFalse(R.from1to2("C", "C"))
+    self.assertTrue(R.from1to2("A", "B"))
+    self.assertTrue(R.from1to2("B", "A"))
+
+  def test_condensation_closure(self):
+    R = Reachability({
+        "A": {"B"}, "B": {"C"}, "C": {"B", "D"}, "D": set(),
+        "E": set(),
+    })
+    self.assertIn(("A", "D"), R)
+    self.assertIn(("C", "B"), R)
+    self.assertNotIn(("D", "A"), R)
+    self.assertNotIn(("A", "E"), R)
+
+  def test_random_graphs_match_paths(self):
+    rnd = random.Random(20180101)
+    for _ in range(50):
+      n = rnd.randint(1, 25)
+      G = nx.gnp_random_graph(n, rnd.random() / 4, seed=rnd.randrange(2**32),
+          directed=True)
+      G.remove_edges_from(nx.selfloop_edges(G))
+      paths_G = pytourney.tie.hth_quilici.paths(G)
+      R = Reachability(G)
+      for name1 in G:
+        for name2 in G:
+          self.assertEqual(
+              R.from1to2(name1, name2),
+              (name1, name2) in paths_G,
+          )
+
+  def test_incremental_edges_match_rebuild(self):
+    rnd = random.Random(2019)
+    for _ in range(50):
+      n = rnd.randint(1, 15)
+      graph = {i: set() for i in range(n)}
+      R = Reachability(graph)
+      for _ in range(40):
+        name1, name2 = rnd.randrange(n), rnd.randrange(n)
+        if name1 == name2:
+          continue
+        if name2 in graph[name1]:
+          graph[name1].remove(name2)
+          R.remove_edge(name1, name2)
+        else:
+          graph[name1].add(name2)
+          R.add_edge(name1, name2)
+        S = Reachability(graph)
+        for name1 in graph:
+          for name2 in graph:
+            self.assertEqual(
+                R.from1to2(name1, name2),
+                S.from1to2(name1, name2),
+            )
+        order = R.topological_order()
+        position = {c: k for k, c in enumerate(order)}
+        for c in order:
+          for d in order:
+            if (R.reach[c] >> d) & 1:
+              self.assertLess(position[c], position[d])
+
+
+if __name__ == '__main__':
+    unittest.main()
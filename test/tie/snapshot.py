@@ -0,0 +1,93 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from helpers import random_results
+import pytourney
+
+
+def season(rnd, count=30):
+  return random_results(rnd, "ABCDEFGHIJ", count, sizes=(1, 2, 2, 3))
+
+
+class TestSnapshot(unittest.TestCase):
+
+  def test_roundtrip(self):
+    rnd = random.Random(2018)
+    for _ in range(50):
+      results = season(rnd)
+      H = pytourney.tie.hth_quilici.IncrementalHTH(results)
+      fingerprint = pytourney.tie.cache.fingerprint(results)
+      data = pytourney.tie.snapshot.dumps(H, fingerprint=fingerprint)
+      with pytourney.tie.snapshot.Snapshot(data) as snap:
+        self.assertEqual(snap.fingerprint, fingerprint)
+        self.assertEqual(snap.names, H.dominance.names)
+        self.assertEqual(
+            snap.hth(), pytourney.tie.hth_quilici.calculate(results)
+        )
+        D = snap.dominance()
+        self.assertEqual(D.pairs, H.dominance.pairs)
+        self.assertEqual(list(D.net), list(H.dominance.net))
+        R = snap.reachability()
+        self.assertEqual(R.component, H.reachability.component)
+        self.assertEqual(
+            [sorted(m) for m in R.members],
+            [sorted(m) for m in H.reachability.members],
+        )
+        self.assertEqual(R.reach, H.reachability.reach)
+
+  def test_incremental(self):
+    rnd = random.Random(2019)
+    for _ in range(50):
+      results = season(rnd)
+      more = season(rnd, count=10)
+      H = pytourney.tie.hth_quilici.IncrementalHTH(results)
+      H.update(more[:5])  # unordered components are stored too
+      data = pytourney.tie.snapshot.dumps(H)
+      with pytourney.tie.snapshot.Snapshot(data) as snap:
+        H2 = snap.incremental()
+      H2.update(more[5:])
+      self.assertEqual(
+          H2.hth(), pytourney.tie.hth_quilici.calculate(results + more)
+      )
+
+  def test_file(self):
+    results = [{"Á": 1, "B": 0}, {"B": 2, "C": 1}, {"C": 1, "Á": 0}]
+    H = pytourney.tie.hth_quilici.IncrementalHTH(results)
+    with tempfile.TemporaryDirectory() as dirname:
+      path = os.path.join(dirname, "league.snap")
+      pytourney.tie.snapshot.save(path, H, fingerprint="x")
+      with pytourney.tie.snapshot.load(path) as snap:
+        self.assertEqual(len(snap), 3)
+        self.assertEqual(snap.fingerprint, "x")
+        self.assertEqual(snap.hth(), {"Á": 1, "B": 1, "C": 1})
+      with self.assertRaises(ValueError):
+        snap.hth()  # closed
+
+  def test_empty(self):
+    H = pytourney.tie.hth_quilici.IncrementalHTH()
+    snap = pytourney.tie.snapshot.Snapshot(pytourney.tie.snapshot.dumps(H))
+    self.assertEqual(snap.hth(), {})
+    self.assertEqual(snap.incremental().hth(), {})
+
+  def test_invalid(self):
+    H = pytourney.tie.hth_quilici.IncrementalHTH([{"A": 1, "B": 0}])
+    data = pytourney.tie.snapshot.dumps(H)
+    with self.assertRaises(ValueError):
+      pytourney.tie.snapshot.Snapshot(b"not a snapshot" * 100)
+    with self.assertRaises(ValueError):
+      pytourney.tie.snapshot.Snapshot(data[:len(data) - 8])
+    with self.assertRaises(ValueError):
+      pytourney.tie.snapshot.Snapshot(
+          data[:8] + struct.pack("<H", 99) + data[10:]
+      )
+    with self.assertRaises(TypeError):
+      pytourney.tie.snapshot.dumps(
+          pytourney.tie.hth_quilici.IncrementalHTH([{1: 1, 2: 0}])
+      )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+
+from helpers import random_results
+import pytourney
+
+
+class TestStandings(unittest.TestCase):
+
+  def test_tie_groups(self):
+    points = {"A": 3, "B": 1, "C": 3, "D": 0, "E": 1, "F": 2}
+    self.assertEqual(
+        pytourney.tie.standings.tie_groups(points),
+        {3: {"A", "C"}, 1: {"B", "E"}},
+    )
+
+  def test_matches_filtered_calculate(self):
+    rnd = random.Random(2018)
+    players = "ABCDEFGHIJKL"
+    for method in pytourney.tie.standings.METHODS:
+      module = getattr(pytourney.tie, f'hth_{method}')
+      for _ in range(100):
+        results = random_results(
+            rnd, players, rnd.randint(1, 40), sizes=(1, 2, 2, 2, 2)
+        )
+        points = {name: rnd.randint(0, 3) for name in players}
+        hths = pytourney.tie.standings.calculate(
+            results, points, method=method
+        )
+        groups = pytourney.tie.standings.tie_groups(points)
+        self.assertEqual(set(hths), set(groups))
+        for value, group in groups.items():
+          filtered = [
+              {k: v for k, v in result.items() if k in group}
+              for result in results
+          ]
+          filtered = [result for result in filtered if result]
+          self.assertEqual(hths[value], module.calculate(filtered))
+
+  def test_unknown_method(self):
+    with self.assertRaises(ValueError):
+      pytourney.tie.standings.calculate([], {}, method="coin")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import pytourney
+
+
+RESULTS = [
+    {"A": 1, "B": 0},
+    {"B": 1, "C": 0},
+    {"C": 1, "A": 0},
+    {"A": 1, "D": 0},
+    {"D": 2, "E": 0},
+]
+
+
+class TestStats(unittest.TestCase):
+
+  def test_hth_quilici(self):
+    stats = pytourney.tie.stats.Stats()
+    hth = pytourney.tie.hth_quilici.calculate(RESULTS, stats=stats)
+    self.assertEqual(hth, pytourney.tie.hth_quilici.calculate(RESULTS))
+    d = stats.as_dict()
+    self.assertEqual(
+        list(d["phases"]), ["dominance", "reachability", "grouping"]
+    )
+    self.assertTrue(all(0 <= v for v in d["phases"].values()))
+    self.assertEqual(d["counts"], {
+        "calls": 1,
+        "nodes": 5,
+        "edges": 5,
+        "components": 3,
+        "closure": 3,  # {A, B, C} reaches D and E, D reaches E
+        "groups": 3,
+    })
+
+  def test_hth_quilici_paths(self):
+    stats = pytourney.tie.stats.Stats()
+    pytourney.tie.hth_quilici.calculate(RESULTS, engine="paths", stats=stats)
+    d = stats.as_dict()
+    self.assertEqual(
+        list(d["phases"]), ["graph", "simplify", "paths", "grouping"]
+    )
+    counts = d["counts"]
+    self.assertEqual(counts["nodes"], 5)
+    self.assertEqual(counts["edges"], 5)
+    self.assertEqual(counts["paths"], 6 + 3 * 2 + 1)
+    self.assertEqual(counts["groups"], 3)
+    self.assertLessEqual(1, counts["passes"])
+    self.assertLessEqual(1, counts["merges"])
+    self.assertIn("transpositions", counts)
+
+  def test_hth_sweep(self):
+    stats = pytourney.tie.stats.Stats()
+    pytourney.tie.hth_sweep.calculate(RESULTS, stats=stats)
+    pytourney.tie.hth_sweep.calculate(
+        [{"A": 3, "B": 2, "C": 1}], stats=stats
+    )
+    d = stats.as_dict()
+    self.assertEqual(list(d["phases"]), ["dominance", "sweep", "heats"])
+    self.assertEqual(
+        d["counts"], {"calls": 2, "players": 8, "pairs": 5, "heats": 1}
+    )
+
+  def test_accumulate_and_reset(self):
+    stats = pytourney.tie.stats.Stats()
+    for _ in range(3):
+      pytourney.tie.hth_quilici.calculate(RESULTS, stats=stats)
+    self.assertEqual(stats.counts["calls"], 3)
+    self.assertEqual(stats.counts["nodes"], 15)
+    stats.reset()
+    self.assertEqual(stats.as_dict(), {"phases": {}, "counts": {}})
+
+
+if __name__ == '__main__':
+    unittest.main()